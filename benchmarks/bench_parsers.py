@@ -0,0 +1,164 @@
+"""
+Parser benchmark over the recorded, anonymized listing pages in
+``benchmarks/fixtures``.
+
+    python -m benchmarks.bench_parsers --iterations 200
+    python -m benchmarks.bench_parsers --compare benchmarks/results/parsers-<commit>.json
+
+For each portal it times the same path as a live crawl (HTML bytes ->
+BeautifulSoup(lxml) -> ``parse_listings``) and reports pages/s, cards/s,
+the tracemalloc peak and the number of allocated blocks per page. Results
+are saved as JSON under ``benchmarks/results`` keyed by the current git
+commit so runs can be compared.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from playwright_simple import parse_computrabajo_page
+from scrapers.computrabajo_scraper import ComputrabajoScraper
+from scrapers.linkedin_scraper import LinkedInScraper
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RESULTS_DIR = Path(__file__).parent / "results"
+ROUNDS = 5
+
+COMPUTRABAJO_URL = "https://co.computrabajo.com/empleos-de-medellin-antioquia"
+LINKEDIN_URL = "https://www.linkedin.com/jobs/search/?keywords=python&location=medellin"
+
+
+def _parsers():
+    computrabajo = ComputrabajoScraper()
+    linkedin = LinkedInScraper()
+    # nombre -> (fixture, cards esperadas, función html -> jobs)
+    return {
+        "computrabajo": (
+            "computrabajo_listing.html", 20,
+            lambda html: computrabajo.parse_listings(BeautifulSoup(html, "lxml"), COMPUTRABAJO_URL),
+        ),
+        "linkedin": (
+            "linkedin_listing.html", 25,
+            lambda html: linkedin.parse_listings(BeautifulSoup(html, "lxml"), LINKEDIN_URL),
+        ),
+        "playwright_computrabajo": (
+            "computrabajo_listing.html", 20,
+            lambda html: parse_computrabajo_page(BeautifulSoup(html, "lxml"), "Medellín"),
+        ),
+    }
+
+
+def bench_parser(parse, html: bytes, expected: int, iterations: int) -> dict:
+    jobs = parse(html)
+    if len(jobs) != expected:
+        raise AssertionError(f"expected {expected} cards, parsed {len(jobs)}")
+
+    for _ in range(min(10, iterations)):
+        parse(html)
+    # Mediana de varias rondas: menos sensible a ruido puntual de la máquina
+    per_round = max(iterations // ROUNDS, 1)
+    round_times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(per_round):
+            parse(html)
+        round_times.append((time.perf_counter() - start) / per_round)
+    per_page = statistics.median(round_times)
+
+    # Con el GC apagado los árboles de BeautifulSoup (con ciclos) no se
+    # liberan, así que los bloques vivos al final cuentan lo que se asignó
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        parse(html)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return {
+        "cards_per_page": len(jobs),
+        "page_bytes": len(html),
+        "ms_per_page": round(per_page * 1000, 3),
+        "pages_per_s": round(1 / per_page, 1),
+        "cards_per_s": round(len(jobs) / per_page, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "alloc_blocks_per_page": blocks,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline_path: Path):
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    print(f"\nvs {baseline_path.name} ({baseline.get('commit')}):")
+    for name, result in current["parsers"].items():
+        old = baseline["parsers"].get(name)
+        if not old:
+            continue
+        for metric in ("ms_per_page", "peak_kb", "alloc_blocks_per_page"):
+            delta = (result[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+            print(f"  {name:24s} {metric:22s} {old[metric]:>10} -> {result[metric]:>10}  ({delta:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing parser benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", nargs="+", default=None, help="Parsers to run")
+    parser.add_argument("--output", type=str, default=None, help="Results JSON path")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline results JSON")
+    args = parser.parse_args()
+
+    # Los parsers registran cada página a nivel INFO
+    logging.disable(logging.INFO)
+
+    results = {
+        "commit": _git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "parsers": {},
+    }
+    for name, (fixture, expected, parse) in _parsers().items():
+        if args.only and name not in args.only:
+            continue
+        html = (FIXTURES_DIR / fixture).read_bytes()
+        result = bench_parser(parse, html, expected, args.iterations)
+        results["parsers"][name] = result
+        print(f"{name:24s} {result['pages_per_s']:8.1f} pages/s  {result['cards_per_s']:9.1f} cards/s  "
+              f"peak {result['peak_kb']:8.1f} KB  {result['alloc_blocks_per_page']:6d} blocks/page")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"parsers-{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        compare(results, Path(args.compare))
+
+
+if __name__ == "__main__":
+    main()
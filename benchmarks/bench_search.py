@@ -0,0 +1,113 @@
+"""
+Benchmark of full-text query latency over the FTS5 search index.
+
+    python -m benchmarks.bench_search --offers 1000000
+
+Builds an index of synthetic offers in a temporary directory (or reuses
+``--db``) and reports p50/p95/max latency per query type.
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from utils.search import SearchIndex
+
+
+TITLES = [
+    "Desarrollador Python", "Desarrollador Java", "Ingeniero de Software", "Analista de Datos",
+    "Ingeniero DevOps", "Analista QA", "Soporte Técnico", "Científico de Datos", "Arquitecto Cloud",
+    "Desarrollador Frontend React", "Desarrollador Backend Node", "Administrador de Bases de Datos",
+    "Especialista en Ciberseguridad", "Técnico de Redes", "Líder Técnico", "Diseñador UX/UI",
+]
+LEVELS = ["Junior", "Semi-senior", "Senior", ""]
+CITIES = ["Medellín", "Envigado", "Itagüí", "Bello", "Sabaneta", "Rionegro"]
+MODALITIES = ["Presencial", "Remoto", "Híbrido"]
+AREAS = ["Desarrollo", "Ciencia de Datos", "DevOps", "QA", "Seguridad", "Redes", "IT"]
+SKILLS = ["Python", "Django", "SQL", "AWS", "Docker", "Kubernetes", "React", "Angular", "Java",
+          "Spring", "Excel", "Power BI", "Linux", "Git", "Scrum", "Terraform"]
+
+QUERIES = {
+    "un_termino": [{"text": "python"}, {"text": "datos"}, {"text": "tecnico"}],
+    "frase_prefijo": [{"text": "desarrolla back"}, {"text": "ingeniero softw"}, {"text": "cientif dat"}],
+    "texto_y_facetas": [
+        {"text": "python", "ciudad": "Medellín", "cargo_modalidad": "Remoto"},
+        {"text": "analista", "cargo_area": "Ciencia de Datos"},
+    ],
+    "solo_facetas": [{"ciudad": "Envigado", "cargo_modalidad": "Híbrido"}],
+}
+
+
+def make_offer(i: int, rng: random.Random) -> dict:
+    title = f"{rng.choice(TITLES)} {rng.choice(LEVELS)}".strip()
+    skills = rng.sample(SKILLS, 4)
+    return {
+        "id_oferta_plataforma": str(i),
+        "plataforma_origen": rng.choice(["Computrabajo", "LinkedIn", "Elempleo"]),
+        "cargo_titulo": title,
+        "empresa_nombre": f"Empresa {i % 5003}",
+        "descripcion": f"Buscamos {title.lower()} con experiencia en {', '.join(skills)}. "
+                       f"Ofrecemos contrato a término indefinido y capacitación.",
+        "empresa_ubicacion_exacta": f"{rng.choice(CITIES)}, Antioquia",
+        "cargo_modalidad": rng.choice(MODALITIES),
+        "cargo_area": rng.choice(AREAS),
+        "cargo_nivel": rng.choice(LEVELS) or "No especificado",
+        "fecha_publicacion": f"2026-{rng.randint(1, 10):02d}-{rng.randint(1, 28):02d}",
+        "url_oferta": f"https://example.com/oferta/{i}",
+    }
+
+
+def build(index: SearchIndex, offers: int, batch: int = 50_000):
+    rng = random.Random(42)
+    start = time.perf_counter()
+    for base in range(0, offers, batch):
+        index.add(make_offer(i, rng) for i in range(base, min(base + batch, offers)))
+    index.optimize()
+    return time.perf_counter() - start
+
+
+def measure(index: SearchIndex, repeat: int) -> dict:
+    results = {}
+    for name, queries in QUERIES.items():
+        latencies = []
+        for _ in range(repeat):
+            for query in queries:
+                query = dict(query)
+                text = query.pop("text", None)
+                start = time.perf_counter()
+                index.search(text, limit=20, **query)
+                latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        results[name] = {
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search latency benchmark")
+    parser.add_argument("--offers", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", type=str, default=None, help="Reuse an existing index instead of building one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.db) if args.db else Path(tmp) / "busqueda.db"
+        with SearchIndex(path) as index:
+            if not args.db:
+                seconds = build(index, args.offers)
+                print(f"Indexed {args.offers:,} offers in {seconds:.1f}s "
+                      f"({path.stat().st_size / 1e6:,.0f} MB)")
+            print(f"Documents: {index.count():,}")
+            for name, stats in measure(index, args.repeat).items():
+                print(f"{name:16s}  p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+                      f"max {stats['max_ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of JSONL load/dump time for each available JSON backend.
+
+    python -m benchmarks.bench_serialization --lines 500000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from utils import serialization
+
+
+def make_record(i: int) -> dict:
+    return {
+        "empresa_nombre": f"Empresa {i % 977}",
+        "empresa_ubicacion_exacta": "Medellín, Antioquia",
+        "cargo_titulo": f"Desarrollador Python Semi-senior {i}",
+        "cargo_modalidad": ("Presencial", "Remoto", "Híbrido")[i % 3],
+        "salario_min": 3_000_000.0 + (i % 50) * 100_000,
+        "salario_max": 5_000_000.0 + (i % 50) * 100_000,
+        "salario_texto_original": "$ 3.000.000 a $ 5.000.000 (Mensual)",
+        "habilidades_tecnicas": ["Python", "Django", "SQL"],
+        "beneficios": [],
+        "plataforma_origen": "Computrabajo",
+        "fecha_publicacion": "2026-10-16",
+        "fecha_scraping": "2026-10-19",
+        "url_oferta": f"https://co.computrabajo.com/ofertas-de-trabajo/oferta-{i}",
+        "id_oferta_plataforma": str(i),
+        "estado_oferta": "Activa",
+    }
+
+
+def bench(name: str, records: list, path: Path) -> dict:
+    serialization.backend = serialization.get_backend(name)
+
+    start = time.perf_counter()
+    serialization.dump_jsonl(records, path)
+    dump_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = serialization.load_jsonl(path)
+    load_s = time.perf_counter() - start
+
+    assert len(loaded) == len(records)
+    return {"backend": name, "dump_s": round(dump_s, 3), "load_s": round(load_s, 3),
+            "mb": round(path.stat().st_size / 1e6, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL serialization benchmark")
+    parser.add_argument("--lines", type=int, default=500_000)
+    args = parser.parse_args()
+
+    records = [make_record(i) for i in range(args.lines)]
+    backends = ["json"]
+    if serialization.ORJSON_AVAILABLE:
+        backends.append("orjson")
+    if serialization.MSGSPEC_AVAILABLE:
+        backends.append("msgspec")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in backends:
+            result = bench(name, records, Path(tmp) / f"{name}.jsonl")
+            print(f"{result['backend']:8s}  dump {result['dump_s']:7.3f}s  "
+                  f"load {result['load_s']:7.3f}s  ({result['mb']} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+CLI startup benchmark: ``python -X importtime main.py --help`` against a budget.
+
+    python -m benchmarks.bench_startup [--budget-ratio 2.5] [--budget-ms N] [--runs 5] [--top 15]
+
+Runs the command several times and takes the best run. It reports wall
+time, the interpreter's own baseline (``python -c pass``), the import time
+of the modules main.py pulls in, and the slowest imports.
+
+The budget covers only the self time of non-stdlib modules (the project's
+own and third-party ones); stdlib imports such as logging, argparse or
+dataclasses are reported but not budgeted. So that the check does not
+depend on how fast the host is, the budget is a multiple
+(``--budget-ratio``) of a reference measured on the same machine, the
+import time of ``python -c "import logging, argparse"``. ``--budget-ms``
+sets an absolute budget instead. It exits non-zero when the budget is
+exceeded or when a heavy dependency (pandas, pyarrow, requests, bs4,
+Selenium, Playwright...) is imported just to print the help.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Self time of non-stdlib imports in main.py --help, as a multiple of REFERENCE_IMPORT
+IMPORT_BUDGET_RATIO = 2.5
+REFERENCE_IMPORT = "import logging, argparse"
+
+# Nada de esto debería cargarse para mostrar la ayuda
+HEAVY_MODULES = (
+    "pandas", "pyarrow", "numpy", "requests", "bs4", "lxml", "selenium", "playwright",
+    "sqlite3", "zstandard", "scrapers.linkedin_scraper", "scrapers.computrabajo_scraper",
+)
+
+
+def parse_importtime(stderr: str):
+    """``-X importtime`` -> [(módulo, self_us, cumulative_us, profundidad)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        rows.append((raw_name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def is_stdlib(module: str) -> bool:
+    top = module.split(".")[0]
+    # _sysconfigdata_*, encodings.*, etc. también son del intérprete
+    return top in sys.stdlib_module_names or top.startswith("_sysconfigdata")
+
+
+def run_once(command):
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr[-2000:]}")
+    return wall, result.stderr
+
+
+def _after_site(rows):
+    # Lo que importa el comando: módulos cargados después de "site"
+    names = [row[0] for row in rows]
+    return rows[names.index("site") + 1:] if "site" in names else rows
+
+
+def _top_level_us(rows) -> int:
+    return sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+
+
+def measure_reference(runs: int) -> float:
+    """Mejor tiempo de importación (ms) de ``REFERENCE_IMPORT`` en esta máquina."""
+    return min(
+        _top_level_us(_after_site(parse_importtime(
+            run_once([sys.executable, "-X", "importtime", "-c", REFERENCE_IMPORT])[1],
+        )))
+        for _ in range(runs)
+    ) / 1000
+
+
+def measure(runs: int, args=("--help",)):
+    baseline = min(run_once([sys.executable, "-c", "pass"])[0] for _ in range(runs))
+    best = None
+    for _ in range(runs):
+        wall, stderr = run_once([sys.executable, "-X", "importtime", "main.py", *args])
+        after_site = _after_site(parse_importtime(stderr))
+        own_us = sum(self_us for name, self_us, _, _ in after_site if not is_stdlib(name))
+        # La corrida con menos tiempo propio: la menos afectada por ruido del sistema
+        if best is None or own_us < best[0]:
+            best = (own_us, wall, after_site)
+    own_us, wall, after_site = best
+    total_us = _top_level_us(after_site)
+    return {
+        "wall_ms": wall * 1000,
+        "baseline_ms": baseline * 1000,
+        "import_ms": own_us / 1000,
+        "total_import_ms": total_us / 1000,
+        "modules": {row[0] for row in after_site},
+        "rows": after_site,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup budget check")
+    parser.add_argument("--budget-ratio", type=float, default=IMPORT_BUDGET_RATIO,
+                        help=f"Budget for non-stdlib imports, as a multiple of '{REFERENCE_IMPORT}' on this host")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Absolute budget in ms for non-stdlib imports (overrides --budget-ratio)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    if args.budget_ms is not None:
+        budget = args.budget_ms
+        budget_note = "absolute"
+    else:
+        reference = measure_reference(args.runs)
+        budget = reference * args.budget_ratio
+        budget_note = f"{args.budget_ratio:g} x '{REFERENCE_IMPORT}' = {args.budget_ratio:g} x {reference:.1f} ms"
+    print(f"main.py --help: {result['wall_ms']:.1f} ms wall "
+          f"(interpreter baseline {result['baseline_ms']:.1f} ms), "
+          f"imports {result['total_import_ms']:.1f} ms, of which non-stdlib "
+          f"{result['import_ms']:.1f} ms (budget {budget:.1f} ms, {budget_note})")
+
+    print("\nSlowest imports (cumulative):")
+    for name, self_us, cumulative_us, depth in sorted(result["rows"], key=lambda row: -row[2])[:args.top]:
+        print(f"  {cumulative_us / 1000:7.2f} ms  {self_us / 1000:6.2f} ms self  {'  ' * depth}{name}")
+
+    heavy = sorted(module for module in HEAVY_MODULES if module in result["modules"])
+    failed = False
+    if heavy:
+        print(f"\nFAIL: heavy modules imported for --help: {', '.join(heavy)}")
+        failed = True
+    if result["import_ms"] > budget:
+        print(f"\nFAIL: non-stdlib imports take {result['import_ms']:.1f} ms, over the {budget:.1f} ms budget")
+        failed = True
+    if not failed:
+        print("\nOK: within budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
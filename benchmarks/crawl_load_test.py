@@ -0,0 +1,187 @@
+"""
+End-to-end crawl load test against the bundled mock portal.
+
+    python -m benchmarks.crawl_load_test --workers 8 --pages 10 --rate-429 0.05 --rate-503 0.02
+
+Starts ``benchmarks.mock_portal`` in a background thread and points real
+``BaseScraper`` subclasses (``ComputrabajoScraper``, ``LinkedInScraper``) at
+it through their ``base_url``. Each worker thread runs its own scraper over
+a slice of the listing URLs via ``BaseScraper.run``, so pagination, retries
+and ``Retry-After`` handling are the production code paths; only the polite
+delay is lowered (``--delay``). Reports pages/s, jobs/s, injected failures,
+retries and pages lost after exhausting retries.
+"""
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlencode
+
+from benchmarks.mock_portal import MockPortal, add_portal_arguments, config_from_args
+from scrapers.base_scraper import BaseScraper
+from scrapers.computrabajo_scraper import ComputrabajoScraper, _LOCATIONS
+from scrapers.linkedin_scraper import LinkedInScraper
+from utils.metrics import registry as metrics
+
+
+class _Instrumented:
+    """Cuenta páginas pedidas, perdidas y reintentos de ``fetch``."""
+
+    def _init_counters(self, urls, polite_delay, retry_attempts):
+        self.urls = urls
+        self.polite_delay = polite_delay
+        self.retry_attempts = retry_attempts
+        self.pages = 0
+        self.lost = 0
+        self.retries = 0
+        self.details = 0
+
+    def get_urls(self):
+        return self.urls
+
+    def fetch(self, url, **kwargs):
+        self.pages += 1
+        soup = super().fetch(url, **kwargs)
+        if soup is None:
+            self.lost += 1
+        return soup
+
+    def _retry_wait(self, exc, attempt):
+        # fetch también pide la espera tras el último intento, que no se reintenta
+        if attempt < self.retry_attempts - 1:
+            self.retries += 1
+        return super()._retry_wait(exc, attempt)
+
+
+class CrawlComputrabajo(_Instrumented, ComputrabajoScraper):
+    def __init__(self, base_url, urls, polite_delay, retry_attempts):
+        super().__init__(base_url)
+        self._init_counters(urls, polite_delay, retry_attempts)
+
+
+class CrawlLinkedIn(_Instrumented, LinkedInScraper):
+    def __init__(self, base_url, urls, polite_delay, retry_attempts):
+        super().__init__(base_url + "/jobs/search/")
+        self._init_counters(urls, polite_delay, retry_attempts)
+
+
+def computrabajo_urls(base_url: str, pages: int):
+    """Una secuencia de páginas por ciudad, como ``ComputrabajoScraper.get_urls``."""
+    return [
+        [f"{base_url}/empleos-de-{slug}" + (f"?p={page}" if page > 1 else "") for page in range(1, pages + 1)]
+        for slug, _ in _LOCATIONS
+    ]
+
+
+def linkedin_urls(base_url: str, pages: int):
+    return [
+        [f"{base_url}/jobs/search/?" + urlencode({"keywords": "python", "location": f"{city}, Antioquia",
+                                                  "pageNum": page}) for page in range(pages)]
+        for _, city in _LOCATIONS
+    ]
+
+
+def _worker(scraper, fetch_details: bool, results: list):
+    # LinkedInScraper.run abre un navegador con Selenium; aquí interesa el camino HTTP común
+    jobs = BaseScraper.run(scraper)
+    if fetch_details:
+        for job in jobs:
+            if scraper.fetch(job.url) is not None:
+                scraper.details += 1
+    results.append((scraper, len(jobs)))
+
+
+def run_crawl(portal: MockPortal, workers: int, crawl_pages: int, delay: float,
+              retry_attempts: int, fetch_details: bool = False) -> dict:
+    """Reparte las secuencias de páginas entre ``workers`` hilos y las recorre."""
+    base = portal.base_url
+    sequences = ([(CrawlComputrabajo, urls) for urls in computrabajo_urls(base, crawl_pages)]
+                 + [(CrawlLinkedIn, urls) for urls in linkedin_urls(base, crawl_pages)])
+
+    # Cada hilo toma una secuencia entera: la paginación se corta igual que en producción
+    assignments = [sequences[i::workers] for i in range(workers)]
+    results = []
+
+    def _thread(assigned):
+        for cls, urls in assigned:
+            _worker(cls(base, urls, delay, retry_attempts), fetch_details, results)
+
+    metrics.reset()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_thread, args=(assigned,)) for assigned in assignments if assigned]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    totals = {"pages": 0, "lost": 0, "retries": 0, "details": 0, "jobs": 0}
+    by_portal = {}
+    for scraper, jobs in results:
+        portal_totals = by_portal.setdefault(scraper.name, {"pages": 0, "lost": 0, "retries": 0, "jobs": 0})
+        for key, value in (("pages", scraper.pages), ("lost", scraper.lost),
+                           ("retries", scraper.retries), ("jobs", jobs)):
+            portal_totals[key] += value
+            totals[key] += value
+        totals["details"] += scraper.details
+
+    latency = [entry["valor"] for entry in metrics.to_dict()["metricas"]
+               .get("http_request_seconds", {}).get("series", [])]
+    injected = sum(count for status, count in portal.stats.by_status.items() if status in (429, 503))
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "pages_per_s": round(totals["pages"] / elapsed, 1),
+        "jobs_per_s": round(totals["jobs"] / elapsed, 1),
+        **totals,
+        "injected_failures": injected,
+        # Fallos inyectados que un reintento posterior logró recuperar
+        "recovered": injected - totals["lost"] * retry_attempts if injected else 0,
+        "mb_downloaded": round(metrics.value("http_response_bytes_total") / 1e6, 2),
+        "request_p95_ms": round(max(entry["p95"] for entry in latency) * 1000, 1) if latency else None,
+        "by_portal": by_portal,
+        "server": portal.stats.to_dict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end crawl load test against the mock portal")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent scraper threads")
+    parser.add_argument("--crawl-pages", type=int, default=None,
+                        help="Listing pages requested per search (default: --pages + 1, to hit the empty page)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Polite delay between pages")
+    parser.add_argument("--retries", type=int, default=4, help="Fetch attempts per page")
+    parser.add_argument("--details", action="store_true", help="Also fetch every offer's detail page")
+    add_portal_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="Show scraper retry warnings")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR, format="%(message)s")
+
+    portal = MockPortal(config_from_args(args))
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(portal.start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    print(f"Mock portal on {portal.base_url}")
+
+    try:
+        result = run_crawl(portal, args.workers, args.crawl_pages or args.pages + 1,
+                           args.delay, args.retries, args.details)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    print(f"{result['pages']:,} pages and {result['jobs']:,} jobs in {result['elapsed_s']} s "
+          f"({result['pages_per_s']} pages/s, {result['jobs_per_s']} jobs/s)")
+    if args.details:
+        print(f"{result['details']:,} detail pages fetched")
+    print(f"Injected failures {result['injected_failures']}, retries {result['retries']}, "
+          f"lost pages {result['lost']}, recovered {result['recovered']}")
+    print(f"Downloaded {result['mb_downloaded']} MB, request p95 {result['request_p95_ms']} ms")
+    for name, totals in result["by_portal"].items():
+        print(f"  {name:<14} {totals}")
+    print(f"Server: {result['server']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Load test for the local query API (``python main.py serve``).
+
+    python -m benchmarks.load_test_api --url http://127.0.0.1:8000 --concurrency 16 --seconds 20
+
+With ``--seed N`` it instead starts an in-process server over a temporary
+store filled with N synthetic offers, so it can run without a prior crawl.
+Each worker keeps one HTTP/1.1 connection open and cycles through a mix of
+list, filter, sort, paging, facet and conditional (If-None-Match) requests.
+"""
+
+import argparse
+import asyncio
+import http.client
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.bench_search import make_offer
+
+
+PATHS = [
+    "/ofertas",
+    "/ofertas?" + urlencode({"ciudad": "Medellín"}),
+    "/ofertas?" + urlencode({"modalidad": "Remoto", "orden": "salario_max"}),
+    "/ofertas?" + urlencode({"area": "DevOps", "pagina": 3, "por_pagina": 20}),
+    "/ofertas?" + urlencode({"ciudad": "Envigado", "modalidad": "Híbrido", "orden": "first_seen"}),
+    "/facetas",
+    "/facetas?" + urlencode({"ciudad": "Bello"}),
+    "/health",
+]
+
+
+def worker(host: str, port: int, deadline: float, results: list, use_etag: bool, seed: int):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    latencies, statuses, transferred = [], {}, 0
+    while time.perf_counter() < deadline:
+        path = rng.choice(PATHS)
+        headers = {"Accept-Encoding": "gzip"}
+        if use_etag and path in etags and rng.random() < 0.5:
+            headers["If-None-Match"] = etags[path]
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (ConnectionError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            statuses["error"] = statuses.get("error", 0) + 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        transferred += len(body)
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+    conn.close()
+    results.append((latencies, statuses, transferred))
+
+
+def run_load(host: str, port: int, concurrency: int, seconds: float, use_etag: bool = True) -> dict:
+    deadline = time.perf_counter() + seconds
+    results = []
+    threads = [
+        threading.Thread(target=worker, args=(host, port, deadline, results, use_etag, i))
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(value for result in results for value in result[0])
+    statuses = {}
+    for _, worker_statuses, _ in results:
+        for status, count in worker_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    if not latencies:
+        return {"requests": 0, "statuses": statuses}
+
+    def percentile(q):
+        return round(latencies[min(int(len(latencies) * q), len(latencies) - 1)], 2)
+
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(latencies[-1], 2),
+        "mb_transferred": round(sum(result[2] for result in results) / 1e6, 2),
+        "statuses": statuses,
+    }
+
+
+def seeded_server(offers: int, tmp: Path):
+    """Arranca la API en un hilo sobre un store temporal con ofertas sintéticas."""
+    from utils.api_server import QueryApi
+    from utils.http_server import HttpServer
+    from utils.store import JobStore
+
+    rng = random.Random(7)
+    with JobStore(tmp / "ofertas.db") as store:
+        store.upsert(make_offer(i, rng) for i in range(offers))
+
+    api = QueryApi(tmp / "ofertas.db")
+    server = HttpServer(api.handle, "127.0.0.1", 0)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return api, server, loop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query API load test")
+    parser.add_argument("--url", type=str, default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--no-etag", action="store_true", help="Never send If-None-Match")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Start an in-process server with this many synthetic offers")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.seed:
+            api, server, loop = seeded_server(args.seed, Path(tmp))
+            host, port = "127.0.0.1", server.port
+            print(f"Seeded {args.seed:,} offers; server on port {port}")
+        else:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+
+        result = run_load(host, port, args.concurrency, args.seconds, use_etag=not args.no_etag)
+        print(f"{result['requests']:,} requests, {result.get('rps', 0):,} req/s, "
+              f"p50 {result.get('p50_ms')} ms, p95 {result.get('p95_ms')} ms, "
+              f"p99 {result.get('p99_ms')} ms, max {result.get('max_ms')} ms")
+        print(f"Transferred {result.get('mb_transferred', 0)} MB, statuses {result['statuses']}")
+
+        if args.seed:
+            conn = http.client.HTTPConnection(host, port)
+            conn.request("GET", "/metrics", headers={"Connection": "close"})
+            print(conn.getresponse().read().decode("utf-8"))
+            conn.close()
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            api.close()
+
+
+if __name__ == "__main__":
+    main()
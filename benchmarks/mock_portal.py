@@ -0,0 +1,237 @@
+"""
+Stand-in job portal for end-to-end crawl tests.
+
+    python -m benchmarks.mock_portal --port 8900 --pages 10 --latency-ms 80 --rate-429 0.05
+
+Serves Computrabajo-shaped (``/empleos-de-<ciudad>?p=N``,
+``/ofertas-de-trabajo/...``) and LinkedIn-shaped (``/jobs/search/?pageNum=N``,
+``/jobs/view/<id>``) listing and detail pages from templates. Pages past
+``--pages`` come back with no cards, like the real portals. Latency follows
+a lognormal distribution around ``--latency-ms``. A configurable fraction
+of requests fail with 429/503 (with ``Retry-After``), respond slowly, or
+carry a large padding payload.
+"""
+
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Dict
+from urllib.parse import quote
+
+from utils.http_server import HttpServer, Request, Response
+
+
+TITLES = [
+    "Desarrollador Python Senior", "Analista de Datos Junior", "Ingeniero DevOps (Remoto)",
+    "Auxiliar de Soporte Técnico", "Desarrollador Full Stack Java / Angular", "Analista QA Semi-senior",
+    "Técnico en Redes y Telecomunicaciones", "Ingeniero de Software - Híbrido",
+    "Administrador de Bases de Datos SQL", "Practicante de Desarrollo Web", "Líder Técnico .NET",
+]
+CITIES = ["Medellín", "Envigado", "Itagüí", "Bello", "Rionegro", "Sabaneta"]
+DATES = ["Hace 1 hora", "Ayer", "Hace 2 días", "Hace 5 días"]
+SALARIES = ["$ 2.500.000 a $ 3.500.000 (Mensual)", "$ 4.000.000 (Mensual)", "A convenir", ""]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{title}</title></head>
+<body><header><nav>{nav}</nav></header>
+<main>{content}</main>
+{padding}
+</body></html>"""
+
+NAV = "".join(f'<a href="/categoria-{k}">Categoría {k}</a>' for k in range(40))
+
+COMPUTRABAJO_CARD = """
+<article class="box_offer" data-id="{oid}">
+  <h2 class="fs18 fwB"><a class="js-o-link fc_base" href="/ofertas-de-trabajo/oferta-de-trabajo-de-{slug}-{oid}">{title}</a></h2>
+  <p class="fs16 fc_base mt5"><a class="fc_base t_ellipsis enterprise" href="/empresas/empresa-{company}">Empresa {company} S.A.S.</a></p>
+  <p class="fs16 fc_base mt5"><span class="mr10 location">{city}, Antioquia</span></p>
+  <div class="fs13 mt15"><span class="salary">{salary}</span></div>
+  <p class="fs13 fc_aux mt15 date">{date}</p>
+</article>"""
+
+LINKEDIN_CARD = """
+<li><div class="base-card base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{oid}">
+  <a class="base-card__full-link" href="{base}/jobs/view/{oid}"><span class="sr-only">{title}</span></a>
+  <div class="base-search-card__info">
+    <h3 class="base-search-card__title">{title}</h3>
+    <h4 class="base-search-card__subtitle"><a class="hidden-nested-link" href="{base}/company/empresa-{company}">Empresa {company}</a></h4>
+    <div class="base-search-card__metadata">
+      <span class="job-search-card__location">{city}, Antioquia, Colombia</span>
+      <time class="job-search-card__listdate">{date}</time>
+    </div>
+  </div>
+</div></li>"""
+
+DETAIL_TEMPLATE = """<section class="box_detail"><h1>{title}</h1>
+<p class="empresa">Empresa {company}</p><p class="ciudad">{city}, Antioquia</p>
+<div class="descripcion">{description}</div></section>"""
+
+
+@dataclass
+class PortalConfig:
+    pages: int = 10
+    cards_per_page: int = 20
+    latency_ms: float = 50.0
+    latency_sigma: float = 0.5
+    rate_429: float = 0.0
+    rate_503: float = 0.0
+    retry_after: float = 1.0
+    slow_rate: float = 0.0
+    slow_ms: float = 2000.0
+    large_rate: float = 0.0
+    large_kb: int = 512
+    seed: int = 42
+
+
+@dataclass
+class PortalStats:
+    requests: int = 0
+    by_status: Dict[int, int] = field(default_factory=dict)
+    slow: int = 0
+    large: int = 0
+
+    def to_dict(self) -> dict:
+        return {"requests": self.requests, "by_status": dict(sorted(self.by_status.items())),
+                "slow": self.slow, "large": self.large}
+
+
+class MockPortal:
+    def __init__(self, config: PortalConfig = None):
+        self.config = config or PortalConfig()
+        self.stats = PortalStats()
+        self.rng = random.Random(self.config.seed)
+        self.base_url = ""
+
+    def _record(self, status: int) -> None:
+        self.stats.requests += 1
+        self.stats.by_status[status] = self.stats.by_status.get(status, 0) + 1
+
+    def _offer(self, portal: str, page: int, index: int) -> dict:
+        # Determinista por posición: la misma página siempre trae las mismas ofertas
+        rng = random.Random(f"{portal}:{page}:{index}")
+        title = rng.choice(TITLES)
+        return {
+            "oid": f"{rng.getrandbits(64):016X}" if portal == "computrabajo" else str(rng.randint(10**9, 2 * 10**9)),
+            "title": title,
+            "slug": quote(title.lower().replace(" ", "-"), safe=""),
+            "company": rng.randint(1, 500),
+            "city": rng.choice(CITIES),
+            "salary": rng.choice(SALARIES),
+            "date": rng.choice(DATES),
+        }
+
+    def _listing(self, portal: str, page: int) -> str:
+        if page > self.config.pages:
+            return ""
+        template = COMPUTRABAJO_CARD if portal == "computrabajo" else LINKEDIN_CARD
+        cards = (template.format(base=self.base_url, **self._offer(portal, page, i))
+                 for i in range(self.config.cards_per_page))
+        if portal == "computrabajo":
+            return f'<section id="offersGridOfferContainer">{"".join(cards)}</section>'
+        return f'<ul class="jobs-search__results-list">{"".join(cards)}</ul>'
+
+    def _detail(self, key: str) -> str:
+        rng = random.Random(key)
+        return DETAIL_TEMPLATE.format(
+            title=rng.choice(TITLES), company=rng.randint(1, 500), city=rng.choice(CITIES),
+            description=" ".join("Responsabilidades y requisitos del cargo." for _ in range(40)),
+        )
+
+    def _route(self, request: Request):
+        path = request.path
+        if path.startswith("/empleos-de-"):
+            return "Listado", self._listing("computrabajo", int(request.query.get("p", 1)))
+        if path.startswith("/ofertas-de-trabajo/"):
+            return "Oferta", self._detail(path)
+        if path.rstrip("/") == "/jobs/search":
+            return "Empleos", self._listing("linkedin", int(request.query.get("pageNum", 0)) + 1)
+        if path.startswith("/jobs/view/"):
+            return "Empleo", self._detail(path)
+        return None
+
+    async def handle(self, request: Request) -> Response:
+        config = self.config
+        delay = self.rng.lognormvariate(0, config.latency_sigma) * config.latency_ms / 1000
+        roll = self.rng.random()
+
+        if roll < config.rate_429 + config.rate_503:
+            await asyncio.sleep(delay / 4)
+            status = 429 if roll < config.rate_429 else 503
+            self._record(status)
+            return Response(status, b"", content_type="text/html",
+                            headers={"Retry-After": f"{config.retry_after:g}"})
+
+        if self.rng.random() < config.slow_rate:
+            delay += config.slow_ms / 1000
+            self.stats.slow += 1
+        await asyncio.sleep(delay)
+
+        routed = self._route(request)
+        if routed is None:
+            self._record(404)
+            return Response(404, b"<h1>404</h1>", content_type="text/html")
+
+        padding = ""
+        if self.rng.random() < config.large_rate:
+            padding = f"<!-- {'x' * (config.large_kb * 1024)} -->"
+            self.stats.large += 1
+
+        title, content = routed
+        body = PAGE_TEMPLATE.format(title=title, nav=NAV, content=content, padding=padding)
+        self._record(200)
+        return Response(200, body.encode("utf-8"), content_type="text/html; charset=utf-8")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> HttpServer:
+        server = HttpServer(self.handle, host, port)
+        await server.start()
+        self.base_url = f"http://{host}:{server.port}"
+        return server
+
+
+def config_from_args(args) -> PortalConfig:
+    return PortalConfig(
+        pages=args.pages, cards_per_page=args.cards, latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma, rate_429=args.rate_429, rate_503=args.rate_503,
+        retry_after=args.retry_after, slow_rate=args.slow_rate, slow_ms=args.slow_ms,
+        large_rate=args.large_rate, large_kb=args.large_kb, seed=args.seed,
+    )
+
+
+def add_portal_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--pages", type=int, default=10, help="Listing pages with results per search")
+    parser.add_argument("--cards", type=int, default=20, help="Cards per listing page")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal sigma of latency")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-503", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429/503")
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=2000.0)
+    parser.add_argument("--large-rate", type=float, default=0.0)
+    parser.add_argument("--large-kb", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock job portal")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_portal_arguments(parser)
+    args = parser.parse_args()
+
+    portal = MockPortal(config_from_args(args))
+
+    async def run():
+        server = await portal.start(args.host, args.port)
+        print(f"Mock portal on {portal.base_url}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(portal.stats.to_dict())
+
+
+if __name__ == "__main__":
+    main()
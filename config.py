@@ -1,15 +1,6 @@
 """Configuration for the Antioquia job scraper."""
 
-# ── Request Settings ──────────────────────────────────────────────
-REQUEST_TIMEOUT = 15
-RETRY_ATTEMPTS = 2
-POLITE_DELAY = 1.5  # seconds between requests
-
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
-)
+# Request settings (timeout, retries, delay, User-Agent) live in config.settings.Settings
 
 # ── Antioquia Municipalities ─────────────────────────────────────────
 ANTIOQUIA_MUNICIPALITIES = {
@@ -99,4 +99,7 @@ SELECTORS_MAP = {
 
 
 def get_selectors(platform: str) -> dict:
-    return SELECTORS_MAP.get(platform, {})
+    # Los de Settings.selectors (archivo o SCRAPER_SELECTORS) pisan a los de aquí
+    from config.settings import get_settings
+
+    return {**SELECTORS_MAP.get(platform, {}), **get_settings().selectors.get(platform, {})}
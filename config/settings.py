@@ -1,13 +1,161 @@
+"""
+Configuración del scraper.
+
+Las listas de dominio (ciudades, plataformas, categorías...) son constantes
+del módulo. Lo que se ajusta por despliegue (carpetas, tiempos de espera,
+reintentos, User-Agent, selectores) vive en ``Settings``: un objeto
+inmutable que ``get_settings()`` construye una sola vez, al primer uso, a
+partir de los valores por defecto, un archivo (JSON o TOML, en
+``SCRAPER_CONFIG``), variables de entorno ``SCRAPER_<CAMPO>`` y, por
+último, lo que pase la CLI con ``configure``. Importar este módulo no toca
+el disco; ``ensure_dirs`` crea las carpetas cuando hacen falta.
+
+``settings.DATA_DIR``, ``settings.LOG_FILE``, etc. siguen funcionando: se
+resuelven contra ``get_settings()`` en cada acceso.
+"""
+
+import json
 import os
-from datetime import datetime
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+ENV_PREFIX = "SCRAPER_"
+CONFIG_ENV = "SCRAPER_CONFIG"
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+@dataclass(frozen=True)
+class Settings:
+    base_dir: Path = Path(__file__).parent.parent
+    data_dir: Optional[Path] = None
+    logs_dir: Optional[Path] = None
+    log_file: Optional[Path] = None
+    request_timeout: float = 15
+    retry_attempts: int = 2
+    retry_backoff: float = 2
+    polite_delay: float = 1.5
+    max_retry_after: float = 60
+    user_agent: str = DEFAULT_USER_AGENT
+    accept_language: str = "es-CO,es;q=0.9,en;q=0.8"
+    # {"computrabajo": {"job_card": ".box_of"}, ...} sobre config.selectors
+    selectors: Dict[str, Dict[str, str]] = field(default_factory=dict, hash=False)
+
+    def __post_init__(self):
+        # Las rutas derivadas siguen a base_dir salvo que se fijen explícitamente
+        set_ = object.__setattr__
+        set_(self, "base_dir", Path(self.base_dir))
+        set_(self, "data_dir", Path(self.data_dir) if self.data_dir else self.base_dir / "data")
+        set_(self, "logs_dir", Path(self.logs_dir) if self.logs_dir else self.base_dir / "logs")
+        # Archivo fijo: utils.logs lo rota (y comprime) en lugar de abrir uno por corrida
+        set_(self, "log_file", Path(self.log_file) if self.log_file else self.logs_dir / "scraper.log")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {**HEADERS, "User-Agent": self.user_agent, "Accept-Language": self.accept_language}
+
+
+_FIELD_TYPES = {f.name: f.type for f in fields(Settings)}
+_file: Optional[str] = None
+_overrides: Dict[str, Any] = {}
+
+
+def _coerce(name: str, value: Any) -> Any:
+    if name not in _FIELD_TYPES:
+        raise ValueError(f"Configuración desconocida: {name}")
+    kind = _FIELD_TYPES[name]
+    if not isinstance(value, str) or kind is str:
+        return value
+    if kind in (int, float):
+        return kind(value)
+    if name == "selectors":
+        return json.loads(value)
+    return Path(value)
+
+
+def load_file(path) -> Dict[str, Any]:
+    """Valores de un archivo ``.toml`` o ``.json`` (claves = campos de ``Settings``)."""
+    path = Path(path)
+    if path.suffix == ".toml":
+        import tomllib
+        with open(path, "rb") as fp:
+            return tomllib.load(fp)
+    return json.loads(path.read_text(encoding="utf-8"))
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
-LOGS_DIR = BASE_DIR / "logs"
 
-for dir_path in [DATA_DIR, DATA_DIR / "raw", DATA_DIR / "processed", DATA_DIR / "exports", LOGS_DIR]:
-    dir_path.mkdir(parents=True, exist_ok=True)
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """La configuración del proceso: se construye al primer uso y se comparte."""
+    values: Dict[str, Any] = {}
+    config_file = _file or os.environ.get(CONFIG_ENV)
+    if config_file:
+        values.update(load_file(config_file))
+    for name in _FIELD_TYPES:
+        env = os.environ.get(ENV_PREFIX + name.upper())
+        if env is not None:
+            values[name] = env
+    values.update(_overrides)
+    return Settings(**{name: _coerce(name, value) for name, value in values.items()})
+
+
+def configure(config_file=None, **overrides) -> Settings:
+    """Aplica un archivo y/o valores de la CLI; llamar antes de que algo use la configuración.
+
+    Los valores también se exportan al entorno (``SCRAPER_CONFIG``,
+    ``SCRAPER_<CAMPO>``) para que los procesos hijos, p. ej. un pool de
+    workers, arranquen con la misma configuración sin volver a pasarla.
+    """
+    global _file
+    for name, value in overrides.items():
+        _coerce(name, value)
+    if config_file:
+        _file = str(config_file)
+        os.environ[CONFIG_ENV] = _file
+    _overrides.update(overrides)
+    for name, value in overrides.items():
+        os.environ[ENV_PREFIX + name.upper()] = json.dumps(value) if isinstance(value, dict) else str(value)
+    get_settings.cache_clear()
+    return get_settings()
+
+
+def override(settings: Settings, **changes) -> Settings:
+    """Copia de ``settings`` con ``changes`` (el objeto es inmutable)."""
+    return replace(settings, **changes)
+
+
+def ensure_dirs(settings: Settings = None) -> Settings:
+    settings = settings or get_settings()
+    for dir_path in [settings.data_dir, settings.data_dir / "raw", settings.data_dir / "processed",
+                     settings.data_dir / "exports", settings.logs_dir]:
+        dir_path.mkdir(parents=True, exist_ok=True)
+    return settings
+
+
+# Nombres de antes -> campo de Settings
+_LEGACY = {
+    "BASE_DIR": "base_dir",
+    "DATA_DIR": "data_dir",
+    "LOGS_DIR": "logs_dir",
+    "LOG_FILE": "log_file",
+    "REQUEST_TIMEOUT": "request_timeout",
+    "MAX_RETRIES": "retry_attempts",
+    "RETRY_BACKOFF": "retry_backoff",
+    "RATE_LIMIT_DELAY": "polite_delay",
+    "USER_AGENT": "user_agent",
+}
+
+
+def __getattr__(name: str):
+    if name in _LEGACY:
+        return getattr(get_settings(), _LEGACY[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 CITIES_ANTIOQUIA = [
     "Medellín",
@@ -129,18 +277,10 @@ JORNADAS = ["Tiempo completo", "Medio tiempo", "Freelance", "Por horas"]
 
 EDUCACION_NIVELES = ["Bachillerato", "Técnico", "Tecnólogo", "Pregrado", "Posgrado", "Doctorado"]
 
+# Cabeceras base; User-Agent y Accept-Language salen de Settings (ver Settings.headers)
 HEADERS = {
-    "User-Agent": "DataCollector Antioquia - Scraper Educational - Contacto: researcher@local",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "es-CO,es;q=0.9,en;q=0.8",
     "Accept-Encoding": "gzip, deflate, br",
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
 }
-
-REQUEST_TIMEOUT = 30
-RATE_LIMIT_DELAY = 1.0
-MAX_RETRIES = 3
-RETRY_BACKOFF = 2
-
-LOG_FILE = LOGS_DIR / f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
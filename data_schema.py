@@ -1,9 +1,201 @@
-"""Data schema for job postings."""
+"""Data schema for job postings.
 
+The canonical record is the Spanish-keyed dict described by ``JOB_FIELDS``
+(the shape used by ``main.py``, ``utils.validator`` and ``utils.exporter``).
+``JobPosting`` is the lightweight shape produced by the portal scrapers;
+``JobPosting.to_record`` and ``PostingView`` convert between the two without
+copying field values.
+"""
+
+import logging
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 
+from utils.dates import resolve_date
+
+logger = logging.getLogger(__name__)
+
+# ── Canonical record ──────────────────────────────────────────────
+# (name, arrow type, default). Callable defaults are factories.
+JOB_FIELDS: Tuple[Tuple[str, str, Any], ...] = (
+    ("empresa_nombre", "string", ""),
+    ("empresa_sector", "string", ""),
+    ("empresa_tamaño", "string", ""),
+    ("empresa_ubicacion_exacta", "string", ""),
+    ("empresa_verificada", "bool", False),
+    ("cargo_titulo", "string", ""),
+    ("cargo_nivel", "string", ""),
+    ("cargo_area", "string", ""),
+    ("cargo_modalidad", "string", ""),
+    ("cargo_tipo_contrato", "string", ""),
+    ("cargo_jornada", "string", ""),
+    ("salario_min", "float64", None),
+    ("salario_max", "float64", None),
+    ("salario_texto_original", "string", ""),
+    ("salario_tipo", "string", "Mensual"),
+    ("beneficios", "list<string>", list),
+    ("experiencia_requerida_anos", "int64", None),
+    ("educacion_minima", "string", ""),
+    ("habilidades_tecnicas", "list<string>", list),
+    ("habilidades_blandas", "list<string>", list),
+    ("idiomas_requeridos", "list<string>", list),
+    ("plataforma_origen", "string", ""),
+    ("fecha_publicacion", "string", ""),
+    ("fecha_scraping", "string", ""),
+    ("url_oferta", "string", ""),
+    ("id_oferta_plataforma", "string", ""),
+    ("estado_oferta", "string", "Activa"),
+    ("descripcion", "string", ""),
+    ("zona", "string", ""),
+    ("puntaje_relevancia", "float64", 0.0),
+)
+
+JOB_FIELD_NAMES = tuple(name for name, _, _ in JOB_FIELDS)
+
+# English (JobPosting) name -> canonical name
+LEGACY_FIELDS = {
+    "title": "cargo_titulo",
+    "company": "empresa_nombre",
+    "location": "empresa_ubicacion_exacta",
+    "salary_raw": "salario_texto_original",
+    "url": "url_oferta",
+    "source": "plataforma_origen",
+    "date_posted": "fecha_publicacion",
+    "scraped_at": "fecha_scraping",
+    "salary_min": "salario_min",
+    "salary_max": "salario_max",
+    "salary_type": "salario_tipo",
+    "contract_type": "cargo_tipo_contrato",
+    "benefits": "beneficios",
+    "zone": "zona",
+    "relevance_score": "puntaje_relevancia",
+    "description": "descripcion",
+}
+
+
+def new_job_record(data: dict, platform: str) -> dict:
+    """Build a canonical record from ``data``, filling defaults for missing fields."""
+    record = {}
+    for name, _, default in JOB_FIELDS:
+        value = data.get(name, default)
+        record[name] = default() if value is default and callable(default) else value
+    record["plataforma_origen"] = platform
+    record["fecha_scraping"] = datetime.now().strftime("%Y-%m-%d")
+    return record
+
+
+@lru_cache(maxsize=1)
+def arrow_schema():
+    """Arrow schema of the canonical record (pyarrow is imported on first use)."""
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "float64": pa.float64(),
+        "int64": pa.int64(),
+        "list<string>": pa.list_(pa.string()),
+    }
+    return pa.schema([pa.field(name, types[kind]) for name, kind, _ in JOB_FIELDS])
+
+
+def _coerce_value(value, arrow_type):
+    import pyarrow as pa
+
+    if value is None:
+        return None
+    if pa.types.is_list(arrow_type):
+        items = value if isinstance(value, (list, tuple)) else [value]
+        return [str(item) for item in items if item is not None]
+    if pa.types.is_string(arrow_type):
+        return value if isinstance(value, str) else str(value)
+    if pa.types.is_boolean(arrow_type):
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "1", "si", "sí", "yes")
+        return bool(value)
+    if pa.types.is_integer(arrow_type):
+        return int(float(value))
+    if pa.types.is_floating(arrow_type):
+        return float(value)
+    return value
+
+
+def coerce_record(record: dict, schema=None) -> Tuple[dict, list]:
+    """Copia de ``record`` con cada campo convertido al tipo de ``schema``.
+
+    Devuelve el registro y los campos que no se pudieron convertir (quedan
+    en ``None``), p. ej. ``salario_min="3.000.000 COP"``.
+    """
+    schema = schema or arrow_schema()
+    coerced, failed = dict(record), []
+    for arrow_field in schema:
+        if arrow_field.name not in record:
+            continue
+        try:
+            coerced[arrow_field.name] = _coerce_value(record[arrow_field.name], arrow_field.type)
+        except (TypeError, ValueError):
+            coerced[arrow_field.name] = None
+            failed.append(arrow_field.name)
+    return coerced, failed
+
+
+def conform_records(records, schema=None) -> Tuple[Any, list]:
+    """Tabla Arrow de ``records`` con ``schema`` (por defecto el canónico) y los registros que la forman.
+
+    ``Table.from_pylist`` es estricto con los tipos: un solo
+    ``salario_min="3000000"`` tumba la conversión entera (y con ella todas
+    las exportaciones). Si falla, se reintenta convirtiendo registro a
+    registro; los valores que no se pueden convertir quedan nulos y se
+    registran. Los registros devueltos son los convertidos, para que el
+    resto de la exportación vea los mismos valores que la tabla.
+    """
+    import pyarrow as pa
+
+    schema = schema or arrow_schema()
+    records = records if isinstance(records, list) else list(records)
+    try:
+        return pa.Table.from_pylist(records, schema=schema), records
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        pass
+    coerced = []
+    for index, record in enumerate(records):
+        fixed, failed = coerce_record(record, schema)
+        if failed:
+            logger.warning("Registro %d (%s): campos no convertibles, quedan nulos: %s",
+                           index, record.get("url_oferta") or record.get("cargo_titulo", ""), ", ".join(failed))
+        coerced.append(fixed)
+    return pa.Table.from_pylist(coerced, schema=schema), coerced
+
+
+def arrow_table(records, schema=None):
+    """Tabla Arrow tolerante a tipos (ver ``conform_records``)."""
+    return conform_records(records, schema)[0]
+
+
+class PostingView(MutableMapping):
+    """English-keyed view over a canonical record; reads and writes go through."""
+
+    def __init__(self, record: dict):
+        self.record = record
+
+    def __getitem__(self, key: str):
+        return self.record[LEGACY_FIELDS.get(key, key)]
+
+    def __setitem__(self, key: str, value):
+        self.record[LEGACY_FIELDS.get(key, key)] = value
+
+    def __delitem__(self, key: str):
+        del self.record[LEGACY_FIELDS.get(key, key)]
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, name in LEGACY_FIELDS.items() if name in self.record)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
 
 @dataclass
 class JobPosting:
@@ -16,6 +208,7 @@ class JobPosting:
     url: str = ""
     source: str = ""
     date_posted: Optional[str] = None
+    scraped_at: Optional[str] = None  # ISO timestamp of the fetch, anchor for date_posted
     
     # Processed fields
     salary_min: Optional[float] = None
@@ -44,5 +237,32 @@ class JobPosting:
             "url": self.url,
             "source": self.source,
             "date_posted": self.date_posted,
+            "scraped_at": self.scraped_at,
             "description": self.description,
         }
+
+    def to_record(self) -> dict:
+        """Canonical record for this posting. Lists are shared, not copied."""
+        values = {}
+        for key, name in LEGACY_FIELDS.items():
+            value = getattr(self, key)
+            if value is not None:
+                values[name] = value
+        record = new_job_record(values, self.source)
+        if self.scraped_at:
+            record["fecha_scraping"] = self.scraped_at[:10]
+            # "Hace 5 horas" necesita la hora de la descarga, que fecha_scraping
+            # (solo fecha) pierde: se resuelve aquí y el resultado ISO ya no cambia
+            if self.date_posted:
+                record["fecha_publicacion"] = resolve_date(self.date_posted, anchor=self.scraped_at) or self.date_posted
+        return record
+
+    @classmethod
+    def from_record(cls, record: dict) -> "JobPosting":
+        return cls(**{key: record[name] for key, name in LEGACY_FIELDS.items() if name in record})
+
+
+def as_records(jobs: Iterable) -> Iterator[dict]:
+    """Canonical records from a mix of ``JobPosting`` objects and records."""
+    for job in jobs:
+        yield job.to_record() if isinstance(job, JobPosting) else job
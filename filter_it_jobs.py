@@ -1,8 +1,17 @@
-import json
 import re
+from bisect import bisect_right
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 
+from data_schema import PostingView
+from utils import serialization
+from utils.cache import StageCache
+from utils.dates import resolve_date, resolve_dates
+from utils.feed import FEED_DIR, write_feed
+from utils.loader import iter_records
+from utils.text import NormalizedText, TextLike, fold_accents, normalize, record_text
+
 # Palabras clave IT - MAS flexible para capturar más ofertas
 IT_KEYWORDS = [
     # Desarrollo
@@ -56,26 +65,36 @@ EXCLUDE_KEYWORDS = [
 ]
 
 
-def is_it_job(title: str, company: str = "", description: str = "") -> bool:
-    """Determina si un trabajo es de TI/IT basado en el título"""
-    text = f"{title} {company} {description}".lower()
+# Versiones sin tildes y sin duplicados, para comparar contra NormalizedText.folded
+_EXCLUDE_FOLDED = tuple(dict.fromkeys(fold_accents(k.lower()) for k in EXCLUDE_KEYWORDS))
+_IT_FOLDED = tuple(dict.fromkeys(fold_accents(k.lower()) for k in IT_KEYWORDS))
+
+
+def matches_it(text: NormalizedText) -> bool:
+    """Determina si un texto ya normalizado corresponde a un trabajo de TI"""
+    folded = text.folded
     
     # Excluir primero
-    for exclude in EXCLUDE_KEYWORDS:
-        if exclude.lower() in text:
+    for exclude in _EXCLUDE_FOLDED:
+        if exclude in folded:
             return False
     
     # Buscar palabras IT
-    for keyword in IT_KEYWORDS:
-        if keyword.lower() in text:
+    for keyword in _IT_FOLDED:
+        if keyword in folded:
             return True
     
     return False
 
 
-def extract_skills_from_title(title: str) -> List[str]:
+def is_it_job(title: str, company: str = "", description: str = "") -> bool:
+    """Determina si un trabajo es de TI/IT basado en el título"""
+    return matches_it(normalize(f"{title} {company} {description}"))
+
+
+def extract_skills_from_title(title: TextLike) -> List[str]:
     """Extrae skills del título del trabajo"""
-    title_lower = title.lower()
+    title_lower = normalize(title).lower
     skills = []
     
     # Programming languages
@@ -246,26 +265,27 @@ def extract_skills_from_title(title: str) -> List[str]:
 
 def filter_it_jobs(jobs: List[Dict]) -> List[Dict]:
     """Filtra solo trabajos de IT"""
-    return [job for job in jobs if is_it_job(job.get("title", ""), job.get("company", ""))]
+    return [job for job in jobs if matches_it(record_text(job).joined("title", "company"))]
 
 
-def transform_job_to_frontend(job: Dict, index: int) -> Dict:
-    """Transforma un trabajo scrapeado al formato del frontend"""
-    title = job.get("title", "")
-    company = job.get("company", "No especificada")
-    location = job.get("location", "")
-    salary_raw = job.get("salary_raw", "")
+TITLE_STAGE = "frontend_title"
+TITLE_STAGE_VERSION = 1
+
+
+def title_features(job: Dict) -> Dict:
+    """Nivel, área, modalidad, experiencia y skills inferidos del título."""
+    title_text = record_text(job)["title"]
+    title_lower = title_text.lower
     
     # Detectar nivel
     nivel = "Senior"
-    if any(x in title.lower() for x in ["junior", "jr", "trainee", "practicante", "sin experiencia"]):
+    if any(x in title_lower for x in ["junior", "jr", "trainee", "practicante", "sin experiencia"]):
         nivel = "Junior"
-    elif any(x in title.lower() for x in ["semi", "mid", "1-3", "2-4"]):
+    elif any(x in title_lower for x in ["semi", "mid", "1-3", "2-4"]):
         nivel = "Semi-senior"
     
     # Detectar área IT
     area = "IT"
-    title_lower = title.lower()
     if any(x in title_lower for x in ["data", "datos", "analista", "analytics"]):
         area = "Ciencia de Datos"
     elif any(x in title_lower for x in ["devops", "cloud", "infra"]):
@@ -284,16 +304,6 @@ def transform_job_to_frontend(job: Dict, index: int) -> Dict:
     elif any(x in title_lower for x in ["híbrido", "hibrido", "hybrid"]):
         modalidad = "Híbrido"
     
-    # Extraer salario
-    salary_min = job.get("salary_min")
-    salary_max = job.get("salary_max")
-    
-    # Si company es "No especificada", usar la ubicación como fallback
-    if not company or company == "No especificada" or company.strip() == "":
-        # Extraer ciudad de la ubicación
-        city = location.split(",")[0].strip() if location else "Medellín"
-        company = f"Empresa en {city}"
-    
     # Extraer experiencia del título
     experiencia = 0
     if any(x in title_lower for x in ["junior", "jr", "jr.", "trainee", "practicante", "sin experiencia"]):
@@ -305,8 +315,47 @@ def transform_job_to_frontend(job: Dict, index: int) -> Dict:
     elif any(x in title_lower for x in ["lead", "líder", "coordinador", "jefe"]):
         experiencia = 6
     
-    # Extraer skills del título
-    habilidades_tecnicas = extract_skills_from_title(title)
+    return {
+        "nivel": nivel,
+        "area": area,
+        "modalidad": modalidad,
+        "experiencia": experiencia,
+        "habilidades_tecnicas": extract_skills_from_title(title_text),
+    }
+
+
+def transform_job_to_frontend(job: Dict, index: int, fecha_publicacion: str = None, features: Dict = None) -> Dict:
+    """Transforma un trabajo scrapeado al formato del frontend.
+    
+    ``fecha_publicacion`` permite pasar la fecha ya resuelta en lote; si no se
+    da, se resuelve ``date_posted`` contra ``scraped_at``. ``features`` es la
+    salida de ``title_features`` (p. ej. desde el caché de etapas).
+    """
+    title = job.get("title", "")
+    company = job.get("company", "No especificada")
+    location = job.get("location", "")
+    features = features if features is not None else title_features(job)
+    nivel = features["nivel"]
+    area = features["area"]
+    modalidad = features["modalidad"]
+    experiencia = features["experiencia"]
+    habilidades_tecnicas = list(features["habilidades_tecnicas"])
+    
+    # Extraer salario
+    salary_min = job.get("salary_min")
+    salary_max = job.get("salary_max")
+    
+    # Si company es "No especificada", usar la ubicación como fallback
+    if not company or company == "No especificada" or company.strip() == "":
+        # Extraer ciudad de la ubicación
+        city = location.split(",")[0].strip() if location else "Medellín"
+        company = f"Empresa en {city}"
+    
+    # Fechas: date_posted es relativa ("Hace 3 días") al momento de la descarga
+    scraped_at = job.get("scraped_at")
+    fecha_scraping = scraped_at[:10] if scraped_at else datetime.now().strftime("%Y-%m-%d")
+    if fecha_publicacion is None:
+        fecha_publicacion = resolve_date(job.get("date_posted"), anchor=scraped_at)
     
     return {
         "id": str(index + 1),
@@ -340,19 +389,25 @@ def transform_job_to_frontend(job: Dict, index: int) -> Dict:
             "idiomas": []
         },
         "metadata": {
-            "fecha_publicacion": job.get("date_posted", "2026-02-22"),
-            "fecha_scraping": "2026-02-22",
+            "fecha_publicacion": fecha_publicacion or fecha_scraping,
+            "fecha_scraping": fecha_scraping,
             "url": job.get("url", ""),
             "estado": "Activa"
         }
     }
 
 
-def load_and_filter_scraped_data(json_path: str = None) -> List[Dict]:
-    """Carga los datos scrapeados y los filtra para solo IT"""
+def load_and_filter_scraped_data(json_path: str = None, cache: StageCache = None) -> List[Dict]:
+    """Carga los datos scrapeados y los filtra para solo IT.
+    
+    Con ``cache`` lo inferido del título se reutiliza entre corridas.
+    """
     if json_path is None:
         # Usar el archivo más reciente
-        files = list(Path(".").glob("empleos_antioquia_*.json"))
+        files = [
+            p for p in Path(".").glob("empleos_antioquia_*")
+            if p.name.endswith((".json", ".jsonl", ".jsonl.gz", ".jsonl.zst"))
+        ]
         if not files:
             print("No se encontraron archivos de datos")
             return []
@@ -360,33 +415,151 @@ def load_and_filter_scraped_data(json_path: str = None) -> List[Dict]:
     
     print(f"Cargando datos de: {json_path}")
     
-    with open(json_path, "r", encoding="utf-8") as f:
-        jobs = json.load(f)
+    # Lectura perezosa: solo los trabajos IT quedan en memoria
+    total = 0
+    it_jobs = []
+    for job in iter_records(json_path):
+        total += 1
+        # Registros canónicos (export de main.py): vista con claves en inglés, sin copiar
+        if "cargo_titulo" in job:
+            job = PostingView(job)
+        if matches_it(record_text(job).joined("title", "company")):
+            it_jobs.append(job)
+    
+    print(f"Total trabajos cargados: {total}")
+    print(f"Trabajos IT encontrados: {len(it_jobs)}")
     
-    print(f"Total trabajos cargados: {len(jobs)}")
+    # Resolver fechas relativas en lote; sin scraped_at el ancla es la hora del archivo
+    file_anchor = datetime.fromtimestamp(Path(json_path).stat().st_mtime).isoformat(timespec="seconds")
+    anchors = [job.get("scraped_at") or file_anchor for job in it_jobs]
+    for job, anchor in zip(it_jobs, anchors):
+        job["scraped_at"] = anchor
+    fechas = resolve_dates([job.get("date_posted") for job in it_jobs], anchors)
     
-    # Filtrar solo IT
-    it_jobs = filter_it_jobs(jobs)
-    print(f"Trabajos IT encontrados: {len(it_jobs)}")
+    if cache is not None:
+        features = cache.run(TITLE_STAGE, title_features, it_jobs, inputs=("title",), version=TITLE_STAGE_VERSION)
+    else:
+        features = [title_features(job) for job in it_jobs]
     
     # Transformar al formato del frontend
-    frontend_jobs = [transform_job_to_frontend(job, i) for i, job in enumerate(it_jobs)]
+    frontend_jobs = [
+        transform_job_to_frontend(job, i, fecha_publicacion=fecha, features=feature)
+        for i, (job, fecha, feature) in enumerate(zip(it_jobs, fechas, features))
+    ]
     
     return frontend_jobs
 
 
+# Límites (COP) de los histogramas de salario; el último bin es abierto
+SALARY_BINS = [0, 1_500_000, 2_500_000, 3_500_000, 5_000_000, 7_000_000, 10_000_000, 15_000_000]
+TOP_SKILLS = 20
+
+
+def _chart(counts: Dict[str, int]) -> List[Dict]:
+    # Igual que en mock-data.ts: orden por valor descendente, empates por aparición
+    return [{"name": name, "value": value} for name, value in sorted(counts.items(), key=lambda item: -item[1])]
+
+
+def _salary_bin(salary: float) -> int:
+    return max(bisect_right(SALARY_BINS, salary) - 1, 0)
+
+
+def compute_analytics(jobs: List[Dict]) -> Dict:
+    """Agregados del dashboard de análisis en una sola pasada sobre ``jobs``.
+    
+    Reproduce ``getKPIs``, ``getSectorData``, ``getUbicacionData``,
+    ``getModalidadData``, ``getNivelData`` y ``getTopSkills`` de
+    ``frontend/lib/mock-data.ts`` y las estadísticas de ``analisis/page.tsx``,
+    más histogramas de salario mínimo por área y por ciudad.
+    """
+    sectores, ubicaciones, modalidades, niveles, skills = {}, {}, {}, {}, {}
+    empresas = set()
+    salarios = []
+    experiencia_total = 0
+    histograma_area, histograma_ciudad = {}, {}
+    
+    for job in jobs:
+        empresa, cargo = job["empresa"], job["cargo"]
+        for counts, value in (
+            (sectores, empresa.get("sector")),
+            (ubicaciones, empresa.get("ubicacion")),
+            (modalidades, cargo.get("modalidad")),
+            (niveles, cargo.get("nivel")),
+        ):
+            value = value or "Otro"
+            counts[value] = counts.get(value, 0) + 1
+        for skill in job["requisitos"]["habilidades_tecnicas"]:
+            skills[skill] = skills.get(skill, 0) + 1
+        empresas.add(empresa.get("nombre"))
+        experiencia_total += job["requisitos"].get("experiencia_anos") or 0
+        
+        salario = job["compensacion"].get("salario_min")
+        if salario:
+            salarios.append(salario)
+            bin_index = _salary_bin(salario)
+            for histograms, key in ((histograma_area, cargo.get("area") or "Otro"),
+                                    (histograma_ciudad, empresa.get("ubicacion") or "Otro")):
+                histograms.setdefault(key, [0] * len(SALARY_BINS))[bin_index] += 1
+    
+    salarios.sort()
+    total = len(jobs)
+    remotas = modalidades.get("Remoto", 0)
+    
+    return {
+        "generado": datetime.now().isoformat(timespec="seconds"),
+        "kpis": {
+            "totalOfertas": total,
+            "salarioMediano": salarios[len(salarios) // 2] if salarios else 5000000,
+            "empresasContratando": len(empresas),
+            "ofertasRemotas": remotas,
+        },
+        "stats": {
+            "avgSalary": round(sum(salarios) / len(salarios)) if salarios else 0,
+            "minSalary": salarios[0] if salarios else 0,
+            "maxSalary": salarios[-1] if salarios else 0,
+            "remoteCount": remotas,
+            "hybridCount": modalidades.get("Híbrido", 0),
+            "avgExperience": f"{experiencia_total / total:.1f}" if total else "0",
+        },
+        "sectorData": _chart(sectores),
+        "ubicacionData": _chart(ubicaciones),
+        "modalidadData": _chart(modalidades),
+        "nivelData": _chart(niveles),
+        "topSkills": [
+            {"skill": skill, "count": count}
+            for skill, count in sorted(skills.items(), key=lambda item: -item[1])[:TOP_SKILLS]
+        ],
+        "histogramasSalario": {
+            "bins": SALARY_BINS,
+            "porArea": histograma_area,
+            "porCiudad": histograma_ciudad,
+        },
+    }
+
+
 if __name__ == "__main__":
-    jobs = load_and_filter_scraped_data()
+    with StageCache() as cache:
+        jobs = load_and_filter_scraped_data(cache=cache)
+        for stage, stats in cache.report().items():
+            print(f"Caché {stage}: {stats['tasa_aciertos']:.0%} aciertos, {stats['cpu_ahorrado_s']:.3f}s CPU ahorrados")
     print(f"\n=== Resumen ===")
     print(f"Total trabajos IT: {len(jobs)}")
     
     if jobs:
         # Guardar para el frontend
         output_path = "frontend/lib/real-data.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(jobs, f, ensure_ascii=False, indent=2)
+        serialization.dump_json(jobs, output_path)
         print(f"\nDatos guardados en: {output_path}")
         
+        # Agregados precalculados para el dashboard de análisis
+        analytics_path = "frontend/lib/analytics.json"
+        serialization.dump_json(compute_analytics(jobs), analytics_path)
+        print(f"Agregados guardados en: {analytics_path}")
+        
+        # Feed particionado con índices de facetas para la página de ofertas
+        manifest = write_feed(jobs)
+        print(f"Feed: {len(manifest['shards'])} shards en {FEED_DIR}")
+        
         print(f"\nPrimeros 5 trabajos IT:")
         for job in jobs[:5]:
             print(f"  - {job['cargo']['titulo']} @ {job['empresa']['nombre']} ({job['cargo']['area']})")
@@ -1,6 +1,5 @@
 "use client";
 
-import { useMemo } from "react";
 import { 
   TrendingUp, 
   TrendingDown,
@@ -25,7 +24,7 @@ import {
   LineChart,
   Line
 } from "recharts";
-import { mockOfertas, getSectorData, getModalidadData, getNivelData, getTopSkills } from "@/lib/mock-data";
+import { analytics } from "@/lib/mock-data";
 
 const COLORS = ["#14b8a6", "#3b82f6", "#f59e0b", "#8b5cf6", "#ec4899", "#06b6d4", "#10b981", "#f97316"];
 
@@ -69,28 +68,9 @@ function CustomTooltip({ active, payload, label }: any) {
 }
 
 export default function AnalisisPage() {
-  const sectorData = useMemo(() => getSectorData(mockOfertas), []);
-  const modalidadData = useMemo(() => getModalidadData(mockOfertas), []);
-  const nivelData = useMemo(() => getNivelData(mockOfertas), []);
-  const topSkills = useMemo(() => getTopSkills(mockOfertas, 8), []);
-
-  const stats = useMemo(() => {
-    const salarios = mockOfertas
-      .filter(o => o.compensacion.salario_min)
-      .map(o => o.compensacion.salario_min!);
-    
-    const avgSalary = salarios.length ? Math.round(salarios.reduce((a, b) => a + b, 0) / salarios.length) : 0;
-    const minSalary = salarios.length ? Math.min(...salarios) : 0;
-    const maxSalary = salarios.length ? Math.max(...salarios) : 0;
-
-    const remoteCount = mockOfertas.filter(o => o.cargo.modalidad === "Remoto").length;
-    const hybridCount = mockOfertas.filter(o => o.cargo.modalidad === "Híbrido").length;
-    
-    const experienceYears = mockOfertas.map(o => o.requisitos.experiencia_anos);
-    const avgExperience = experienceYears.length ? (experienceYears.reduce((a, b) => a + b, 0) / experienceYears.length).toFixed(1) : "0";
-
-    return { avgSalary, minSalary, maxSalary, remoteCount, hybridCount, avgExperience };
-  }, []);
+  // Agregados precalculados en filter_it_jobs.py: la página no recorre las ofertas
+  const { sectorData, nivelData, stats } = analytics;
+  const totalOfertas = analytics.kpis.totalOfertas;
 
   return (
     <div className="space-y-8">
@@ -144,7 +124,7 @@ export default function AnalisisPage() {
             <span className="text-slate-400 text-sm">Modalidad</span>
           </div>
           <p className="text-2xl font-display font-bold text-slate-100">
-            {stats.remoteCount + stats.hybridCount}/{mockOfertas.length}
+            {stats.remoteCount + stats.hybridCount}/{totalOfertas}
           </p>
           <p className="text-sm text-purple-400 mt-1">Remoto o Híbrido</p>
         </div>
@@ -1,5 +1,6 @@
 import type { OfertaLaboral } from '@/types';
 import realData from './real-data.json';
+import analyticsData from './analytics.json';
 
 export const mockOfertas: OfertaLaboral[] = realData as unknown as OfertaLaboral[];
 
@@ -26,6 +27,32 @@ export interface SkillData {
   count: number;
 }
 
+// Agregados precalculados por filter_it_jobs.compute_analytics (frontend/lib/analytics.json)
+export interface AnalyticsData {
+  generado: string;
+  kpis: Pick<KPIData, "totalOfertas" | "salarioMediano" | "empresasContratando" | "ofertasRemotas">;
+  stats: {
+    avgSalary: number;
+    minSalary: number;
+    maxSalary: number;
+    remoteCount: number;
+    hybridCount: number;
+    avgExperience: string;
+  };
+  sectorData: ChartData[];
+  ubicacionData: ChartData[];
+  modalidadData: ChartData[];
+  nivelData: ChartData[];
+  topSkills: SkillData[];
+  histogramasSalario: {
+    bins: number[];
+    porArea: Record<string, number[]>;
+    porCiudad: Record<string, number[]>;
+  };
+}
+
+export const analytics: AnalyticsData = analyticsData as unknown as AnalyticsData;
+
 export function getKPIs(ofertas: OfertaLaboral[]): KPIData {
   const uniqueEmpresas = new Set(ofertas.map(o => o.empresa.nombre));
   const ofertasRemotas = ofertas.filter(o => o.cargo.modalidad === "Remoto").length;
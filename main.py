@@ -2,50 +2,20 @@ import argparse
 import logging
 import sys
 from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from config import settings
-from scrapers.computrabajo import ComputrabajoScraper
-from scrapers.elempleo import ElempleoScraper
-from scrapers.indeed import IndeedScraper
-from scrapers.linkedin import LinkedInScraper
-from scrapers.magneto365 import Magneto365Scraper
-from scrapers.masempleo import MasEmpleoScraper
-from scrapers.computrabajo_selenium import ComputrabajoSeleniumScraper
-from scrapers.indeed_selenium import IndeedSeleniumScraper
-from scrapers.elempleo_selenium import ElempleoSeleniumScraper
-from utils.exporter import DataExporter
-from utils.parser import parse_salary
-from utils.validator import JobValidator, deduplicate_jobs
-
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(settings.LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("main")
+from scrapers import registry
+
+# El resto de módulos se importa en las funciones que los usan: ``--help`` y
+# los errores de argumentos no pagan por ellos (ver benchmarks/bench_startup.py)
+if TYPE_CHECKING:
+    from utils.cache import StageCache
+    from utils.selector_stats import SelectorStats
 
+logger = logging.getLogger("main")
 
-SCRAPERS = {
-    "linkedin": LinkedInScraper,
-    "computrabajo": ComputrabajoScraper,
-    "indeed": IndeedScraper,
-    "magneto365": Magneto365Scraper,
-    "elempleo": ElempleoScraper,
-    "masempleo": MasEmpleoScraper,
-}
-
-SCRAPERS_SELENIUM = {
-    "linkedin": LinkedInScraper,
-    "computrabajo": ComputrabajoSeleniumScraper,
-    "indeed": IndeedSeleniumScraper,
-    "magneto365": Magneto365Scraper,
-    "elempleo": ElempleoSeleniumScraper,
-    "masempleo": MasEmpleoScraper,
-}
 
 IT_KEYWORDS = [
     "desarrollador",
@@ -58,21 +28,69 @@ IT_KEYWORDS = [
 ]
 
 
-def normalize_job(job: dict) -> dict:
-    if job.get("salario_texto_original"):
-        min_sal, max_sal, tipo = parse_salary(job["salario_texto_original"])
-        job["salario_min"] = min_sal
-        job["salario_max"] = max_sal
-        job["salario_tipo"] = tipo or "Mensual"
+NORMALIZE_STAGE = "normalize_salary"
+NORMALIZE_VERSION = 1
+
+
+def _salary_fields(job: dict) -> dict:
+    if not job.get("salario_texto_original"):
+        return {}
+    from utils.parser import parse_salary
+    
+    min_sal, max_sal, tipo = parse_salary(job["salario_texto_original"])
+    return {"salario_min": min_sal, "salario_max": max_sal, "salario_tipo": tipo or "Mensual"}
+
+
+def normalize_job(job: dict, salary: dict = None) -> dict:
+    job.update(_salary_fields(job) if salary is None else salary)
+    
+    # La fecha se resuelve siempre: depende del ancla (fecha_scraping) de esta corrida
+    if job.get("fecha_publicacion"):
+        from utils.dates import resolve_date
+        
+        fecha = resolve_date(job["fecha_publicacion"], anchor=job.get("fecha_scraping") or None)
+        if fecha:
+            job["fecha_publicacion"] = fecha
     
     return job
 
 
-def run_scraper(platform: str, max_pages: int = 5, keyword: str = None, use_selenium: bool = False, headless: bool = True) -> list:
-    scrapers_map = SCRAPERS_SELENIUM if use_selenium else SCRAPERS
+def normalize_jobs(jobs, cache: "StageCache" = None) -> list:
+    """Normaliza ``jobs``; con ``cache`` el parseo de salario se reutiliza entre corridas."""
+    jobs = list(jobs)
+    if cache is None:
+        return [normalize_job(job) for job in jobs]
+    salaries = cache.run(NORMALIZE_STAGE, _salary_fields, jobs,
+                         inputs=("salario_texto_original",), version=NORMALIZE_VERSION)
+    return [normalize_job(job, salary) for job, salary in zip(jobs, salaries)]
+
+
+def _accepts(cls, name: str) -> bool:
+    import inspect
+
+    try:
+        return name in inspect.signature(cls).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def run_scraper(platform: str, max_pages: int = 5, keyword: str = None, use_selenium: bool = False, headless: bool = True,
+                cache: "StageCache" = None, selector_stats: "SelectorStats" = None, status: dict = None) -> list:
+    """Scrapea y normaliza ``platform``.
+
+    Si se pasa ``status``, se le asigna ``completa``: si el scraper recorrió
+    el listado entero (sin páginas fallidas ni tope de páginas). Los scrapers
+    que no lo informan cuentan como incompletos.
+    """
+    from data_schema import as_records
+    from utils.metrics import registry as metrics
     
-    if platform not in scrapers_map:
-        logger.error(f"Plataforma desconocida: {platform}")
+    if status is not None:
+        status["completa"] = False
+    try:
+        scraper_class = registry.load(platform, selenium=use_selenium)
+    except (KeyError, ImportError) as e:
+        logger.error(str(e).strip("'\""))
         return []
     
     if not keyword:
@@ -81,23 +99,37 @@ def run_scraper(platform: str, max_pages: int = 5, keyword: str = None, use_sele
     
     logger.info(f"Iniciando scraper para {platform} {'(Selenium)' if use_selenium else ''}")
     
-    scraper_class = scrapers_map[platform]
-    scraper = scraper_class(headless=headless) if use_selenium and hasattr(scraper_class, '__init__') else scraper_class()
-    
+    scraper = None
     try:
-        jobs = scraper.scrape(keyword=keyword, max_pages=max_pages)
+        # Solo las variantes Selenium declaran headless; el resto se construye sin argumentos
+        if use_selenium and _accepts(scraper_class, "headless"):
+            scraper = scraper_class(headless=headless)
+        else:
+            scraper = scraper_class()
+        if hasattr(scraper, 'selector_stats'):
+            scraper.selector_stats = selector_stats
+        
+        with metrics.stage(f"scrape.{platform}") as stage:
+            if hasattr(scraper, 'scrape'):
+                jobs = scraper.scrape(keyword=keyword, max_pages=max_pages)
+            else:
+                jobs = scraper.run()
+            stage.records = len(jobs)
+        if status is not None:
+            status["completa"] = bool(getattr(scraper, "complete", False))
         
         if hasattr(scraper, 'close'):
             scraper.close()
         
-        normalized_jobs = [normalize_job(job) for job in jobs]
+        with metrics.stage("normalize", len(jobs)):
+            normalized_jobs = normalize_jobs(as_records(jobs), cache)
         
         logger.info(f"{platform}: {len(normalized_jobs)} empleos encontrados")
         return normalized_jobs
         
     except Exception as e:
         logger.error(f"Error en {platform}: {e}")
-        if hasattr(scraper, 'close'):
+        if scraper is not None and hasattr(scraper, 'close'):
             try:
                 scraper.close()
             except:
@@ -105,10 +137,39 @@ def run_scraper(platform: str, max_pages: int = 5, keyword: str = None, use_sele
         return []
 
 
+def write_metrics(metrics_dir, run_name: str):
+    """Reporte JSON de la corrida y ``ultima_corrida.prom`` para el textfile collector de Prometheus."""
+    from utils.metrics import registry as metrics
+    
+    metrics_dir = Path(metrics_dir)
+    report_path = metrics.write_report(metrics_dir / f"{run_name}.json")
+    metrics.write_prometheus(metrics_dir / "ultima_corrida.prom")
+    
+    for stage, info in metrics.to_dict()["etapas"].items():
+        rate = f", {info['registros_por_s']:,.0f} registros/s" if info["registros_por_s"] else ""
+        logger.info(f"Etapa {stage}: {info['segundos']:.3f}s{rate}")
+    logger.info(f"Métricas: {report_path}")
+
+
+def log_profile(report: dict):
+    for name, section in report["secciones"].items():
+        logger.info(f"Perfil {name}: {section['wall_s']:.2f}s pared, {section['cpu_s']:.2f}s CPU, "
+                    f"pico {section['pico_memoria_mb']} MB -> {section['perfil']}")
+    desglose = ", ".join(f"{category} {seconds:.2f}s" for category, seconds in report["desglose_s"].items())
+    logger.info(f"Desglose: {desglose}")
+    for allocation in report["asignaciones"][:5]:
+        logger.info(f"Memoria: {allocation['kb']:,.0f} KB en {allocation['sitio']}")
+    overhead = report["sobrecarga"]
+    logger.info(f"Sobrecarga del perfilado: x{overhead['factor']} en la carga de calibración "
+                f"(los tiempos perfilados son más lentos que una corrida normal). Reporte: {report['ruta']}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Data Collector - Empleos Antioquia")
-    parser.add_argument("--platforms", nargs="+", default=list(SCRAPERS.keys()),
-                       help="Plataformas a scrapear")
+    parser.add_argument("command", nargs="?", choices=["run", "serve"], default="run",
+                        help="run: recolectar ofertas (por defecto); serve: API de consulta sobre la base de ofertas")
+    parser.add_argument("--platforms", nargs="+", default=None,
+                       help=f"Plataformas a scrapear (por defecto las instaladas; declaradas: {', '.join(registry.SCRAPERS)})")
     parser.add_argument("--max-pages", type=int, default=5,
                        help="Máximo de páginas por plataforma")
     parser.add_argument("--keyword", type=str, default=None,
@@ -123,12 +184,76 @@ def main():
                        help="Ejecutar Selenium sin interfaz (default: True)")
     parser.add_argument("--debug", action="store_true",
                        help="Abrir navegador visible para depurar selectores")
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default=None,
+                       help="Comprimir los archivos JSONL/CSV exportados")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="No reutilizar normalizaciones de corridas anteriores")
+    parser.add_argument("--search-index", nargs="?", const="", default=None,
+                        help="Indexar las ofertas para búsqueda de texto completo (SQLite FTS5); "
+                             "requiere --store, que decide qué ofertas están cerradas")
+    parser.add_argument("--store", nargs="?", const="", default=None,
+                       help="Guardar en la base SQLite de ofertas (ruta opcional)")
+    
+    parser.add_argument("--metrics-dir", type=str, default=None,
+                        help="Carpeta del reporte de métricas (Prometheus + JSON; por defecto <data_dir>/metrics)")
+    
+    parser.add_argument("--profile", action="store_true",
+                        help="Perfilar la corrida (cProfile por plataforma, tracemalloc) junto a las exportaciones")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO",
+                        help="Nivel de log (DEBUG incluye una línea por petición, muestreada)")
+    parser.add_argument("--log-sample", type=float, default=0.01,
+                        help="Fracción de peticiones que se registran en DEBUG (0-1)")
+    
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="Host de la API (serve)")
+    parser.add_argument("--port", type=int, default=8000,
+                        help="Puerto de la API (serve)")
+    
+    parser.add_argument("--config", type=str, default=None,
+                        help="Archivo de configuración JSON o TOML (también SCRAPER_CONFIG)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="CAMPO=VALOR",
+                        help="Pisa un campo de la configuración, p. ej. --set request_timeout=30 (repetible)")
     
     args = parser.parse_args()
     
+    # La configuración se fija aquí, antes de que cualquier módulo la lea
+    bad = [item for item in args.overrides if "=" not in item]
+    if bad:
+        parser.error(f"--set espera CAMPO=VALOR, no {bad[0]!r}")
+    if args.command == "run" and args.search_index is not None and args.store is None:
+        # Sin JobStore nada marca las ofertas cerradas y el índice las seguiría mostrando como activas
+        parser.error("--search-index requiere --store")
+    try:
+        overrides = dict(item.split("=", 1) for item in args.overrides)
+        cfg = settings.configure(args.config, **overrides)
+    except ValueError as exc:
+        parser.error(str(exc))
+    settings.ensure_dirs(cfg)
+    # "" = la bandera sin ruta: va a la ruta por defecto dentro de data_dir
+    if args.store == "":
+        args.store = str(cfg.data_dir / "ofertas.db")
+    if args.search_index == "":
+        args.search_index = str(cfg.data_dir / "busqueda.db")
+    args.metrics_dir = args.metrics_dir or str(cfg.data_dir / "metrics")
+    
+    from utils.logs import setup_logging
+    from utils.metrics import registry as metrics
+    from utils.selector_stats import SelectorStats
+    from utils.validator import JobValidator, deduplicate_jobs
+    
+    setup_logging(cfg.log_file, level=getattr(logging, args.log_level), sample_rate=args.log_sample)
+    
+    if args.command == "serve":
+        from utils.api_server import serve
+        serve(args.store or cfg.data_dir / "ofertas.db", args.host, args.port,
+              search_path=args.search_index or cfg.data_dir / "busqueda.db")
+        return
+    
     logger.info("="*60)
     logger.info("Data Collector - Empleos Antioquia")
     logger.info("="*60)
+    if args.platforms is None:
+        args.platforms = registry.available(selenium=args.use_selenium)
     logger.info(f"Plataformas: {args.platforms}")
     logger.info(f"Máx páginas: {args.max_pages}")
     logger.info(f"Palabra clave: {args.keyword or IT_KEYWORDS[0]} (IT por defecto)")
@@ -137,40 +262,122 @@ def main():
     logger.info("="*60)
     
     all_jobs = []
+    run_started = datetime.now().isoformat(timespec="seconds")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     headless_mode = not args.debug
+    cache = None
+    if not args.no_cache:
+        from utils.cache import StageCache
+        cache = StageCache()
+    selector_stats = SelectorStats()
     
+    profiler = None
+    if args.profile:
+        from utils.profiling import RunProfiler
+        profiler = RunProfiler(cfg.data_dir / "exports" / f"empleos_antioquia_{timestamp}_perfil")
+    
+    # Plataformas (plataforma_origen) cuyo listado se recorrió entero: solo en ellas se infieren cierres
+    complete_sources = set()
     for platform in args.platforms:
-        jobs = run_scraper(platform, args.max_pages, args.keyword, args.use_selenium, headless=headless_mode)
+        if profiler:
+            profiler.begin(platform)
+        status = {}
+        jobs = run_scraper(platform, args.max_pages, args.keyword, args.use_selenium, headless=headless_mode,
+                           cache=cache, selector_stats=selector_stats, status=status)
+        if status["completa"]:
+            complete_sources.update(job.get("plataforma_origen") for job in jobs)
         all_jobs.extend(jobs)
+    # Lo visto en el portal, antes de deduplicar y validar
+    scraped_jobs = list(all_jobs)
+    from utils.store import storage_key
+    scraped_keys = {storage_key(job) for job in scraped_jobs} - {"", None}
+    
+    for scraper_name, fields in selector_stats.report().items():
+        for field, rates in fields.items():
+            logger.debug(f"Selectores {scraper_name}.{field}: {rates}")
+    selector_stats.save()
+    
+    if profiler:
+        profiler.begin("procesamiento")
+    
+    if cache is not None:
+        for stage, stats in cache.report().items():
+            logger.info(f"Caché {stage}: {stats['tasa_aciertos']:.0%} aciertos "
+                        f"({stats['aciertos']}/{stats['aciertos'] + stats['fallos']}), "
+                        f"{stats['cpu_ahorrado_s']:.3f}s CPU ahorrados")
+        cache.close()
     
     logger.info(f"\nTotal empleos recolectados: {len(all_jobs)}")
     
-    all_jobs = deduplicate_jobs(all_jobs)
+    with metrics.stage("dedupe", len(all_jobs)):
+        all_jobs = deduplicate_jobs(all_jobs)
     logger.info(f"Después de deduplicar: {len(all_jobs)}")
     
     if args.validate:
         logger.info("\nValidando empleos...")
-        validator = JobValidator()
-        valid_jobs, invalid_jobs, results = validator.validate_batch(all_jobs)
+        with metrics.stage("validate", len(all_jobs)):
+            validator = JobValidator()
+            validation = validator.validate_columnar(all_jobs)
+            valid_jobs, invalid_jobs = validation.split(all_jobs)
         
         logger.info(f"Válidos: {len(valid_jobs)}")
         logger.info(f"Inválidos: {len(invalid_jobs)}")
         
-        for result in results:
-            if not result["is_valid"]:
-                logger.warning(f"Job inválido: {result['errors']}")
+        for rule, count in validation.counts.items():
+            if count:
+                logger.warning(f"Regla {rule}: {count} empleos")
+                metrics.inc("validation_failures_total", count, "Empleos que fallan cada regla", rule=rule)
         
         all_jobs = valid_jobs
     
     if args.export and all_jobs:
         logger.info("\nExportando datos...")
-        exporter = DataExporter()
+        from utils.exporter import DataExporter
+        exporter = DataExporter(compression=args.compression)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        exporter.export_all_formats(all_jobs, f"empleos_antioquia_{timestamp}")
+        with metrics.stage("export", len(all_jobs)):
+            report = exporter.export_all_formats(all_jobs, f"empleos_antioquia_{timestamp}")
+            # Igual que en JobStore: cierres solo en listados completos y con lo visto antes de validar
+            exporter.export_changes(all_jobs, f"empleos_antioquia_{timestamp}", platforms=complete_sources,
+                                    seen_keys=scraped_keys)
+        for fmt, info in report["formats"].items():
+            metrics.inc("export_bytes_total", info["bytes"], "Bytes escritos por formato", format=fmt)
         
-        exporter.print_summary(all_jobs)
+        exporter.print_summary(summary=report["summary"])
+        historico = report["historico"]
+        logger.info(f"Histórico acumulado: ~{historico.get('ofertas_distintas', 0)} ofertas distintas "
+                    f"en {historico.get('total', 0)} registros")
+    
+    closed_keys = []
+    if args.store and scraped_jobs:
+        from utils.store import JobStore
+        with metrics.stage("store", len(all_jobs)), JobStore(args.store) as store:
+            stored = store.upsert(all_jobs, seen_at=run_started)
+            logger.info(f"Base de ofertas: {stored} ofertas actualizadas en {args.store}")
+            # Las descartadas por validación siguen publicadas: cuentan como vistas
+            store.touch(scraped_keys, run_started)
+            # Solo se cierran ofertas de plataformas cuyo listado se recorrió entero
+            for plataforma in complete_sources:
+                cerradas = store.close_missing(plataforma, run_started)
+                if cerradas:
+                    logger.info(f"{plataforma}: {cerradas} ofertas marcadas como cerradas")
+            closed_keys = store.closed_keys(run_started)
+    
+    if args.search_index and all_jobs:
+        from utils.search import SearchIndex
+        with metrics.stage("search_index", len(all_jobs)), SearchIndex(args.search_index) as index:
+            indexed = index.add(all_jobs)
+            logger.info(f"Índice de búsqueda: {indexed} ofertas indexadas en {args.search_index}")
+            if closed_keys:
+                # Las cerradas por JobStore dejan de salir en la búsqueda por defecto
+                from utils.store import ESTADO_CERRADA
+                index.set_estado(closed_keys, ESTADO_CERRADA)
+    
+    if profiler:
+        log_profile(profiler.finish())
+    
+    write_metrics(args.metrics_dir, f"empleos_antioquia_{timestamp}")
     
     logger.info("\n✓ Proceso completado")
 
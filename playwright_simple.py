@@ -4,6 +4,8 @@ Simplified Playwright scraper - focusing on working platforms
 
 import logging
 import asyncio
+from datetime import datetime
+from typing import List
 from bs4 import BeautifulSoup
 
 from data_schema import JobPosting
@@ -26,6 +28,51 @@ LOCATIONS = [
 ]
 
 
+def parse_computrabajo_page(soup: BeautifulSoup, location_name: str, fetched_at: str = None) -> List[JobPosting]:
+    """Parse a Computrabajo listing page rendered by Playwright"""
+    jobs = []
+    containers = soup.select("article.box_offer, div.box_offer")
+    
+    for el in containers:
+        try:
+            title_el = el.select_one("a[href*='/oferta-de-trabajo'], h2 a")
+            title = title_el.get_text(strip=True) if title_el else ""
+            
+            company_el = el.select_one("a[class*='enterprise'], span.icon-li-icon")
+            company = company_el.get_text(strip=True) if company_el else "No especificada"
+            if not company or company == "N/A":
+                for span in el.select("span"):
+                    t = span.get_text(strip=True)
+                    if t and t != title and len(t) < 80:
+                        company = t
+                        break
+            
+            location_el = el.select_one("span[class*='location'], p[class*='city']")
+            location = location_el.get_text(strip=True) if location_el else f"{location_name}, Antioquia"
+            
+            salary_el = el.select_one("span[class*='salary']")
+            salary = salary_el.get_text(strip=True) if salary_el else ""
+            
+            href = title_el.get('href', '') if title_el else ''
+            job_url = href if href.startswith('http') else f"https://co.computrabajo.com{href}" if href else ""
+            
+            if title:
+                jobs.append(JobPosting(
+                    title=title,
+                    company=company,
+                    location=location,
+                    salary_raw=salary,
+                    url=job_url,
+                    source="Computrabajo",
+                    date_posted=None,
+                    scraped_at=fetched_at,
+                ))
+        except Exception as e:
+            logger.debug(f"Parse error: {e}")
+    
+    return jobs
+
+
 async def scrape_computrabajo(max_pages=3):
     """Scrape Computrabajo with Playwright"""
     if not PLAYWRIGHT_AVAILABLE:
@@ -58,48 +105,14 @@ async def scrape_computrabajo(max_pages=3):
                     await page.goto(url, wait_until='networkidle', timeout=20000)
                     await asyncio.sleep(1.5)
                     
+                    fetched_at = datetime.now().isoformat(timespec="seconds")
                     content = await page.content()
                     soup = BeautifulSoup(content, 'lxml')
                     
-                    containers = soup.select("article.box_offer, div.box_offer")
-                    logger.info(f"Found {len(containers)} jobs")
+                    page_jobs = parse_computrabajo_page(soup, location_name, fetched_at)
+                    logger.info(f"Found {len(page_jobs)} jobs")
+                    jobs.extend(page_jobs)
                     
-                    for el in containers:
-                        try:
-                            title_el = el.select_one("a[href*='/oferta-de-trabajo'], h2 a")
-                            title = title_el.get_text(strip=True) if title_el else ""
-                            
-                            company_el = el.select_one("a[class*='enterprise'], span.icon-li-icon")
-                            company = company_el.get_text(strip=True) if company_el else "No especificada"
-                            if not company or company == "N/A":
-                                for span in el.select("span"):
-                                    t = span.get_text(strip=True)
-                                    if t and t != title and len(t) < 80:
-                                        company = t
-                                        break
-                            
-                            location_el = el.select_one("span[class*='location'], p[class*='city']")
-                            location = location_el.get_text(strip=True) if location_el else f"{location_name}, Antioquia"
-                            
-                            salary_el = el.select_one("span[class*='salary']")
-                            salary = salary_el.get_text(strip=True) if salary_el else ""
-                            
-                            href = title_el.get('href', '') if title_el else ''
-                            job_url = href if href.startswith('http') else f"https://co.computrabajo.com{href}" if href else ""
-                            
-                            if title:
-                                jobs.append(JobPosting(
-                                    title=title,
-                                    company=company,
-                                    location=location,
-                                    salary_raw=salary,
-                                    url=job_url,
-                                    source="Computrabajo",
-                                    date_posted=None,
-                                ))
-                        except Exception as e:
-                            logger.debug(f"Parse error: {e}")
-                            
                 except Exception as e:
                     logger.warning(f"Error on {location_name} page {page_num}: {e}")
         
@@ -127,13 +140,11 @@ if __name__ == "__main__":
     
     print(f"\nTotal jobs after deduplication: {len(jobs)}")
     
-    import json
-    from datetime import datetime
+    from utils import serialization
     
     jobs_data = [job.to_dict() for job in jobs]
     filename = f"empleos_antioquia_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(jobs_data, f, ensure_ascii=False, indent=2)
+    serialization.dump_json(jobs_data, filename)
     
     print(f"Saved to {filename}")
     
@@ -1,7 +1,6 @@
 import logging
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime
 from typing import Optional
 
 import requests
@@ -10,7 +9,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from config import settings
+from config.settings import get_settings
 from config.selectors import get_selectors
+from data_schema import new_job_record
+from utils import serialization
+from utils.metrics import registry as metrics
 
 
 class BaseScraper(ABC):
@@ -23,49 +26,55 @@ class BaseScraper(ABC):
         self.jobs = []
 
     def _create_session(self) -> requests.Session:
+        cfg = get_settings()
         session = requests.Session()
         retry_strategy = Retry(
-            total=settings.MAX_RETRIES,
-            backoff_factor=settings.RETRY_BACKOFF,
+            total=cfg.retry_attempts,
+            backoff_factor=cfg.retry_backoff,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "OPTIONS"]
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
-        session.headers.update(settings.HEADERS)
+        session.headers.update(cfg.headers)
         return session
 
     def _setup_logger(self) -> logging.Logger:
-        logger = logging.getLogger(f"scraper.{self.platform_key}")
-        logger.setLevel(logging.INFO)
-        if not logger.handlers:
-            handler = logging.FileHandler(settings.LOG_FILE, encoding='utf-8')
-            handler.setFormatter(logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            ))
-            logger.addHandler(handler)
-            console = logging.StreamHandler()
-            console.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-            logger.addHandler(console)
-        return logger
+        # Sin handlers propios: los registros suben al raíz, que configura utils.logs.setup_logging
+        return logging.getLogger(f"scraper.{self.platform_key}")
 
     def _make_request(self, url: str, max_retries: int = None) -> Optional[BeautifulSoup]:
-        max_retries = max_retries or settings.MAX_RETRIES
+        cfg = get_settings()
+        max_retries = max_retries or cfg.retry_attempts
         for attempt in range(max_retries):
             try:
-                self.logger.info(f"Requesting: {url} (attempt {attempt + 1})")
-                response = self.session.get(url, timeout=settings.REQUEST_TIMEOUT)
+                self.logger.debug("Requesting: %s (attempt %d)", url, attempt + 1,
+                                  extra={"sampled": True, "url": url, "intento": attempt + 1})
+                start = time.perf_counter()
+                try:
+                    response = self.session.get(url, timeout=cfg.request_timeout)
+                finally:
+                    metrics.observe("http_request_seconds", time.perf_counter() - start,
+                                    "HTTP request latency", scraper=self.platform_key)
+                metrics.inc("http_requests_total", help="HTTP requests by outcome",
+                            scraper=self.platform_key, status=response.status_code)
+                metrics.inc("http_response_bytes_total", len(response.content), "Bytes downloaded",
+                            scraper=self.platform_key)
                 response.raise_for_status()
-                time.sleep(settings.RATE_LIMIT_DELAY)
-                return BeautifulSoup(response.content, 'lxml')
+                time.sleep(cfg.polite_delay)
+                with metrics.timer("html_parse_seconds", "HTML to soup", scraper=self.platform_key):
+                    return BeautifulSoup(response.content, 'lxml')
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"Request failed: {e}")
                 if attempt < max_retries - 1:
-                    wait_time = settings.RETRY_BACKOFF ** attempt
+                    metrics.inc("http_retries_total", help="Retried requests", scraper=self.platform_key)
+                    wait_time = cfg.retry_backoff ** attempt
                     self.logger.info(f"Waiting {wait_time}s before retry...")
                     time.sleep(wait_time)
                 else:
+                    metrics.inc("http_gave_up_total", help="Requests abandoned after all retries",
+                                scraper=self.platform_key)
                     self.logger.error(f"Failed to fetch {url} after {max_retries} attempts")
         return None
 
@@ -87,35 +96,7 @@ class BaseScraper(ABC):
         return any(city.lower() in location_lower for city in settings.CITIES_ANTIOQUIA)
 
     def _create_job_object(self, data: dict) -> dict:
-        return {
-            "empresa_nombre": data.get("empresa_nombre", ""),
-            "empresa_sector": data.get("empresa_sector", ""),
-            "empresa_tamaño": data.get("empresa_tamaño", ""),
-            "empresa_ubicacion_exacta": data.get("empresa_ubicacion_exacta", ""),
-            "empresa_verificada": data.get("empresa_verificada", False),
-            "cargo_titulo": data.get("cargo_titulo", ""),
-            "cargo_nivel": data.get("cargo_nivel", ""),
-            "cargo_area": data.get("cargo_area", ""),
-            "cargo_modalidad": data.get("cargo_modalidad", ""),
-            "cargo_tipo_contrato": data.get("cargo_tipo_contrato", ""),
-            "cargo_jornada": data.get("cargo_jornada", ""),
-            "salario_min": data.get("salario_min"),
-            "salario_max": data.get("salario_max"),
-            "salario_texto_original": data.get("salario_texto_original", ""),
-            "salario_tipo": data.get("salario_tipo", "Mensual"),
-            "beneficios": data.get("beneficios", []),
-            "experiencia_requerida_anos": data.get("experiencia_requerida_anos"),
-            "educacion_minima": data.get("educacion_minima", ""),
-            "habilidades_tecnicas": data.get("habilidades_tecnicas", []),
-            "habilidades_blandas": data.get("habilidades_blandas", []),
-            "idiomas_requeridos": data.get("idiomas_requeridos", []),
-            "plataforma_origen": self.platform_name,
-            "fecha_publicacion": data.get("fecha_publicacion", ""),
-            "fecha_scraping": datetime.now().strftime("%Y-%m-%d"),
-            "url_oferta": data.get("url_oferta", ""),
-            "id_oferta_plataforma": data.get("id_oferta_plataforma", ""),
-            "estado_oferta": data.get("estado_oferta", "Activa"),
-        }
+        return new_job_record(data, self.platform_name)
 
     @abstractmethod
     def scrape(self, keyword: str = None, max_pages: int = 5) -> list:
@@ -132,17 +113,9 @@ class BaseScraper(ABC):
         pass
 
     def save_jobs(self, filepath: str = None):
-        import json
-        from pathlib import Path
-        
         if not filepath:
             filepath = settings.DATA_DIR / "raw" / f"{self.platform_key}_jobs.jsonl"
         
-        filepath = Path(filepath)
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for job in self.jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + '\n')
+        serialization.dump_jsonl(self.jobs, filepath)
         
         self.logger.info(f"Saved {len(self.jobs)} jobs to {filepath}")
@@ -3,26 +3,20 @@
 import logging
 import time
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import List, Optional
 
 import requests
 from bs4 import BeautifulSoup
 
 from data_schema import JobPosting
-import config
+from config.settings import get_settings
+from utils.metrics import SIZE_BUCKETS, registry as metrics
 
 logger = logging.getLogger(__name__)
 
-# Default settings
-REQUEST_TIMEOUT = 15
-RETRY_ATTEMPTS = 2
-POLITE_DELAY = 1.5
-
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
-)
+RETRY_AFTER_STATUS = (429, 503)
 
 
 class BaseScraper(ABC):
@@ -30,49 +24,147 @@ class BaseScraper(ABC):
 
     def __init__(self, name: str):
         self.name = name
+        # Timeout, reintentos, pausa y User-Agent salen de config.settings (env/archivo/CLI)
+        cfg = get_settings()
+        self.request_timeout = cfg.request_timeout
+        self.retry_attempts = cfg.retry_attempts
+        self.polite_delay = cfg.polite_delay
+        # utils.selector_stats.SelectorStats; main.py lo asigna para ordenar los fallbacks
+        self.selector_stats = None
+        # Set by run(): True only when every listing page was fetched and pagination
+        # ended on an empty page, i.e. the scrape saw the whole listing
+        self.complete = False
         self.session = requests.Session()
         self.session.headers.update({
-            "User-Agent": USER_AGENT,
-            "Accept-Language": "es-CO,es;q=0.9,en;q=0.8",
+            "User-Agent": cfg.user_agent,
+            "Accept-Language": cfg.accept_language,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         })
 
     # ── Network helpers ───────────────────────────────────────────
+    @staticmethod
+    def _retry_wait(exc: requests.RequestException, attempt: int) -> float:
+        """Exponential backoff, or the server's Retry-After on 429/503 (capped)."""
+        wait = 2 ** attempt
+        response = getattr(exc, "response", None)
+        if response is None or response.status_code not in RETRY_AFTER_STATUS:
+            return wait
+        retry_after = response.headers.get("Retry-After", "")
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return wait
+        return min(max(seconds, 0), get_settings().max_retry_after)
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET that records latency, status and bytes downloaded in the metrics registry."""
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(url, timeout=self.request_timeout, **kwargs)
+        except requests.RequestException as exc:
+            metrics.inc("http_requests_total", help="HTTP requests by outcome",
+                        scraper=self.name, status=type(exc).__name__)
+            raise
+        finally:
+            metrics.observe("http_request_seconds", time.perf_counter() - start,
+                            "HTTP request latency", scraper=self.name)
+        metrics.inc("http_requests_total", help="HTTP requests by outcome",
+                    scraper=self.name, status=resp.status_code)
+        logger.debug(
+            "%s  GET %s -> %d (%d bytes, %.0f ms)", self.name, url, resp.status_code, len(resp.content),
+            (time.perf_counter() - start) * 1000,
+            extra={"sampled": True, "url": url, "status": resp.status_code},
+        )
+        metrics.inc("http_response_bytes_total", len(resp.content), "Bytes downloaded", scraper=self.name)
+        metrics.observe("http_response_bytes", len(resp.content), "Response body size",
+                        buckets=SIZE_BUCKETS, scraper=self.name)
+        resp.raise_for_status()
+        return resp
+
+    def _count_retry(self, attempt: int):
+        if attempt < self.retry_attempts - 1:
+            metrics.inc("http_retries_total", help="Retried requests", scraper=self.name)
+        else:
+            metrics.inc("http_gave_up_total", help="Requests abandoned after all retries", scraper=self.name)
+
     def fetch(self, url: str, **kwargs) -> Optional[BeautifulSoup]:
         """Fetch a URL with retry + exponential backoff. Returns parsed soup."""
-        for attempt in range(RETRY_ATTEMPTS):
+        for attempt in range(self.retry_attempts):
             try:
-                resp = self.session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
-                resp.raise_for_status()
-                return BeautifulSoup(resp.content, "lxml")
+                resp = self._get(url, **kwargs)
+                with metrics.timer("html_parse_seconds", "HTML to soup", scraper=self.name):
+                    return BeautifulSoup(resp.content, "lxml")
             except requests.RequestException as exc:
-                wait = 2 ** attempt
+                wait = self._retry_wait(exc, attempt)
+                self._count_retry(attempt)
                 logger.warning(
-                    "%s  attempt %d/%d for %s failed: %s  (retry in %ds)",
-                    self.name, attempt + 1, RETRY_ATTEMPTS, url, exc, wait,
+                    "%s  attempt %d/%d for %s failed: %s  (retry in %gs)",
+                    self.name, attempt + 1, self.retry_attempts, url, exc, wait,
                 )
-                if attempt < RETRY_ATTEMPTS - 1:
+                if attempt < self.retry_attempts - 1:
                     time.sleep(wait)
         logger.error("%s  gave up on %s", self.name, url)
         return None
 
     def fetch_json(self, url: str, **kwargs) -> Optional[dict]:
         """Fetch a URL expecting JSON response."""
-        for attempt in range(RETRY_ATTEMPTS):
+        for attempt in range(self.retry_attempts):
             try:
-                resp = self.session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
-                resp.raise_for_status()
-                return resp.json()
+                return self._get(url, **kwargs).json()
             except (requests.RequestException, ValueError) as exc:
-                wait = 2 ** attempt
+                wait = self._retry_wait(exc, attempt) if isinstance(exc, requests.RequestException) else 2 ** attempt
+                self._count_retry(attempt)
                 logger.warning(
                     "%s  attempt %d/%d JSON fetch %s failed: %s",
-                    self.name, attempt + 1, RETRY_ATTEMPTS, url, exc,
+                    self.name, attempt + 1, self.retry_attempts, url, exc,
                 )
-                if attempt < RETRY_ATTEMPTS - 1:
+                if attempt < self.retry_attempts - 1:
                     time.sleep(wait)
         return None
 
+    # ── Parsing helpers ──────────────────────────────────────────
+    def _select_chain(self, root, selectors, field: str, select):
+        if self.selector_stats is not None:
+            selectors = self.selector_stats.order(self.name, field, selectors)
+        for position, selector in enumerate(selectors):
+            found = select(root, selector)
+            if self.selector_stats is not None:
+                self.selector_stats.record(self.name, field, selector, bool(found))
+            if found:
+                if position:
+                    metrics.inc("selector_fallbacks_total", help="Matches that needed a fallback selector",
+                                scraper=self.name, field=field, selector=selector)
+                return found
+        metrics.inc("selector_misses_total", help="Fields no selector matched", scraper=self.name, field=field)
+        return None
+
+    def select_first(self, el, selectors: tuple, field: str):
+        """First element matched by a chain of CSS selectors.
+
+        With ``selector_stats`` set, the chain keeps its declared order
+        unless the primary selector's own hit rate collapses, in which case
+        it is tried in order of observed hit rate; every attempt is
+        recorded. Matches that needed a fallback, and complete misses,
+        are counted in the run metrics.
+        """
+        return self._select_chain(el, selectors, field, lambda root, selector: root.select_one(selector))
+
+    def select_all_first(self, soup, selectors: tuple, field: str) -> list:
+        """Like ``select_first`` but returns every match of the first selector that matches anything."""
+        return self._select_chain(soup, selectors, field, lambda root, selector: root.select(selector)) or []
+
+    def url_sequence(self, url: str):
+        """Key of the pagination sequence ``url`` belongs to (e.g. one per location).
+
+        ``run`` stops paginating a sequence at its first empty page and
+        considers the listing complete only when every sequence got there.
+        By default all URLs form a single sequence.
+        """
+        return None
+
     # ── Abstract interface ───────────────────────────────────────
     @abstractmethod
     def get_urls(self) -> List[str]:
@@ -88,27 +180,55 @@ class BaseScraper(ABC):
         all_jobs: List[JobPosting] = []
         urls = self.get_urls()
         logger.info("%s  scraping %d URL(s)", self.name, len(urls))
+        self.complete = False
+        failed_pages = 0
+        # Sequence key -> pages visited so far / sequences that ended on an empty page
+        visited = {}
+        exhausted = set()
 
         for i, url in enumerate(urls):
+            sequence = self.url_sequence(url)
+            if sequence in exhausted:
+                continue
+            page_in_sequence = visited.get(sequence, 0)
+            visited[sequence] = page_in_sequence + 1
+
+            fetched_at = datetime.now().isoformat(timespec="seconds")
             soup = self.fetch(url)
             if soup is None:
+                failed_pages += 1
                 continue
 
-            jobs = self.parse_listings(soup, url)
+            with metrics.timer("parse_page_seconds", "parse_listings time per page", scraper=self.name):
+                jobs = self.parse_listings(soup, url)
+            metrics.inc("scraped_jobs_total", len(jobs), "Postings parsed from listing pages", scraper=self.name)
+            for job in jobs:
+                job.scraped_at = fetched_at
             all_jobs.extend(jobs)
             logger.info(
                 "%s  page %d/%d  →  %d jobs (total %d)",
                 self.name, i + 1, len(urls), len(jobs), len(all_jobs),
             )
 
-            # Stop paginating when a page returns nothing
-            if not jobs and i > 0:
-                logger.info("%s  empty page, stopping pagination", self.name)
-                break
+            # Stop paginating this sequence when a page returns nothing
+            if not jobs and page_in_sequence > 0:
+                logger.info("%s  empty page, stopping pagination of %s", self.name, sequence or "listing")
+                exhausted.add(sequence)
+                continue
 
             if i < len(urls) - 1:
-                time.sleep(POLITE_DELAY)
-
+                time.sleep(self.polite_delay)
+
+        # A failed page, or a sequence whose last page still had results (page
+        # cap), means postings may exist that this run did not see
+        self.complete = failed_pages == 0 and bool(visited) and exhausted == set(visited)
+        if not self.complete:
+            logger.info("%s  partial listing (%d failed page(s), %d/%d sequence(s) exhausted); "
+                        "closed postings will not be inferred",
+                        self.name, failed_pages, len(exhausted), len(visited))
+
+        if self.selector_stats is not None:
+            self.selector_stats.check(self.name)
         logger.info("%s  finished: %d jobs total", self.name, len(all_jobs))
         return all_jobs
 
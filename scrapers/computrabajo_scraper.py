@@ -27,26 +27,23 @@ _LOCATIONS = [
 
 MAX_PAGES = 5
 
-# Request settings (from config)
-REQUEST_TIMEOUT = 15
-RETRY_ATTEMPTS = 2
-POLITE_DELAY = 1.5
-
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
-)
+# Selector chains in declared order; with SelectorStats they are re-ranked by hit rate
+CONTAINER_SELECTORS = ("article.box_offer", "div.box_offer", "div.bRS", "div[class*='offer']")
+FIELD_SELECTORS = {
+    "title": ("a[href*='/oferta-de-trabajo']", "h2 a", "a.js-o-link", "a[class*='title']"),
+    "company": ("a[class*='enterprise']", "span.icon-li-icon"),
+    "location": ("span[class*='location']", "p[class*='city']"),
+    "salary": ("span[class*='salary']", "p[class*='salary']"),
+    "date": ("span[class*='date']", "p[class*='date']"),
+}
 
 
 class ComputrabajoScraper(BaseScraper):
-    def __init__(self):
+    BASE_URL = "https://co.computrabajo.com"
+
+    def __init__(self, base_url: str = None):
         super().__init__("Computrabajo")
-        self.session.headers.update({
-            "User-Agent": USER_AGENT,
-            "Accept-Language": "es-CO,es;q=0.9,en;q=0.8",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        })
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
 
     def get_urls(self) -> List[str]:
         urls = []
@@ -54,22 +51,23 @@ class ComputrabajoScraper(BaseScraper):
             for page in range(1, MAX_PAGES + 1):
                 if page == 1:
                     urls.append(
-                        f"https://co.computrabajo.com/empleos-de-{slug}"
+                        f"{self.base_url}/empleos-de-{slug}"
                     )
                 else:
                     urls.append(
-                        f"https://co.computrabajo.com/empleos-de-{slug}?p={page}"
+                        f"{self.base_url}/empleos-de-{slug}?p={page}"
                     )
         return urls
 
+    def url_sequence(self, url: str) -> str:
+        # Una secuencia de páginas por ubicación: /empleos-de-<slug>?p=N
+        return url.split("?", 1)[0]
+
     def parse_listings(self, soup: BeautifulSoup, url: str) -> List[JobPosting]:
         jobs: List[JobPosting] = []
 
         # Computrabajo uses <article> or <div> with class containing "box_offer"
-        containers = soup.select("article.box_offer") or soup.select("div.box_offer")
-        if not containers:
-            # Fallback: look for any link pattern
-            containers = soup.select("div.bRS") or soup.select("div[class*='offer']")
+        containers = self.select_all_first(soup, CONTAINER_SELECTORS, "container")
 
         logger.info(f"Found {len(containers)} job containers")
 
@@ -85,20 +83,15 @@ class ComputrabajoScraper(BaseScraper):
 
     def _parse_one(self, el, page_url: str) -> JobPosting | None:
         # Title + link
-        link_el = (
-            el.select_one("a[href*='/oferta-de-trabajo']")
-            or el.select_one("h2 a")
-            or el.select_one("a.js-o-link")
-            or el.select_one("a[class*='title']")
-        )
+        link_el = self.select_first(el, FIELD_SELECTORS["title"], "title")
         if not link_el:
             return None
         title = self.clean_text(link_el.get_text())
         href = link_el.get("href", "")
-        job_url = href if href.startswith("http") else f"https://co.computrabajo.com{href}"
+        job_url = href if href.startswith("http") else f"{self.base_url}{href}"
 
         # Company
-        company_el = el.select_one("a[class*='enterprise']") or el.select_one("span.icon-li-icon")
+        company_el = self.select_first(el, FIELD_SELECTORS["company"], "company")
         company = self.clean_text(company_el.get_text()) if company_el else "N/A"
         if not company or company == "N/A":
             # Try alternative
@@ -109,7 +102,7 @@ class ComputrabajoScraper(BaseScraper):
                     break
 
         # Location
-        loc_el = el.select_one("span[class*='location']") or el.select_one("p[class*='city']")
+        loc_el = self.select_first(el, FIELD_SELECTORS["location"], "location")
         location = self.clean_text(loc_el.get_text()) if loc_el else ""
         if not location:
             # Extract from URL
@@ -119,11 +112,11 @@ class ComputrabajoScraper(BaseScraper):
                     break
 
         # Salary
-        salary_el = el.select_one("span[class*='salary']") or el.select_one("p[class*='salary']")
+        salary_el = self.select_first(el, FIELD_SELECTORS["salary"], "salary")
         salary = self.clean_text(salary_el.get_text()) if salary_el else ""
 
         # Date
-        date_el = el.select_one("span[class*='date']") or el.select_one("p[class*='date']")
+        date_el = self.select_first(el, FIELD_SELECTORS["date"], "date")
         date_posted = self.clean_text(date_el.get_text()) if date_el else None
 
         if not title:
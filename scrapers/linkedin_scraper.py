@@ -4,6 +4,7 @@ Uses Selenium for browser automation - runs in visible mode (not headless)
 Based on the working implementation from Job_auto project
 """
 
+import importlib.util
 import logging
 import time
 from typing import List, Optional
@@ -32,26 +33,29 @@ LOCATIONS = [
     ("rionegro", "Rionegro"),
 ]
 
-try:
+# Selenium is heavy to import: check it is installed now, import it on first use
+SELENIUM_AVAILABLE = importlib.util.find_spec("selenium") is not None
+
+
+def _import_selenium():
+    global webdriver, By, WebDriverWait, EC, Options, TimeoutException, NoSuchElementException
     from selenium import webdriver
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
     from selenium.common.exceptions import TimeoutException, NoSuchElementException
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
 
 
 class LinkedInScraper(BaseScraper):
-    def __init__(self):
+    def __init__(self, base_url: str = None):
         super().__init__("LinkedIn")
+        self.base_url = base_url or LINKEDIN_BASE_URL
         self.logged_in = False
         self.driver = None
 
     def _setup_driver(self):
+        _import_selenium()
         options = Options()
         options.add_argument("--start-maximized")
         options.add_argument("--disable-blink-features=AutomationControlled")
@@ -74,7 +78,7 @@ class LinkedInScraper(BaseScraper):
             "position": "1",
             "pageNum": "0",
         }
-        url = LINKEDIN_BASE_URL + "?"
+        url = self.base_url + "?"
         url += "&".join([f"{k}={v}" for k, v in params.items()])
         return url
 
@@ -170,6 +174,7 @@ class LinkedInScraper(BaseScraper):
             logger.error("Selenium not installed")
             return False
             
+        _import_selenium()
         try:
             logger.info("Opening LinkedIn login page...")
             driver.get("https://www.linkedin.com/login")
@@ -0,0 +1,69 @@
+"""
+Scraper registry: platforms are declared by name and imported only when used.
+
+Each entry maps a platform key to ``"module:Class"``. Nothing is imported
+until ``load`` is called, so ``main.py --help`` (or a run over a single
+platform) never pays for requests/bs4/Selenium of the others, and a
+platform whose module is not installed does not break the CLI.
+"""
+
+import importlib
+import importlib.util
+from typing import Dict, List
+
+
+SCRAPERS: Dict[str, str] = {
+    "linkedin": "scrapers.linkedin_scraper:LinkedInScraper",
+    "computrabajo": "scrapers.computrabajo_scraper:ComputrabajoScraper",
+    "indeed": "scrapers.indeed:IndeedScraper",
+    "magneto365": "scrapers.magneto365:Magneto365Scraper",
+    "elempleo": "scrapers.elempleo:ElempleoScraper",
+    "masempleo": "scrapers.masempleo:MasEmpleoScraper",
+}
+
+# Variantes con navegador real; las que no se declaran usan la de SCRAPERS
+SCRAPERS_SELENIUM: Dict[str, str] = {
+    "computrabajo": "scrapers.computrabajo_selenium:ComputrabajoSeleniumScraper",
+    "indeed": "scrapers.indeed_selenium:IndeedSeleniumScraper",
+    "elempleo": "scrapers.elempleo_selenium:ElempleoSeleniumScraper",
+}
+
+
+def register(name: str, target: str, selenium: bool = False):
+    """Declara (o reemplaza) un scraper: ``register("miportal", "paquete.modulo:Clase")``."""
+    if ":" not in target:
+        raise ValueError(f"Se esperaba 'modulo:Clase', no {target!r}")
+    (SCRAPERS_SELENIUM if selenium else SCRAPERS)[name] = target
+
+
+def target(name: str, selenium: bool = False) -> str:
+    if selenium and name in SCRAPERS_SELENIUM:
+        return SCRAPERS_SELENIUM[name]
+    if name not in SCRAPERS:
+        raise KeyError(f"Plataforma desconocida: {name}")
+    return SCRAPERS[name]
+
+
+def is_available(name: str, selenium: bool = False) -> bool:
+    """Si el módulo del scraper existe, sin importarlo."""
+    module = target(name, selenium).split(":")[0]
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def available(selenium: bool = False) -> List[str]:
+    return [name for name in SCRAPERS if is_available(name, selenium)]
+
+
+def load(name: str, selenium: bool = False) -> type:
+    """Importa y devuelve la clase del scraper ``name``.
+
+    Lanza ``KeyError`` si la plataforma no está declarada e ``ImportError``
+    si su módulo no existe.
+    """
+    module_name, class_name = target(name, selenium).split(":")
+    if not is_available(name, selenium):
+        raise ImportError(f"El scraper de {name} ({module_name}) no está instalado")
+    return getattr(importlib.import_module(module_name), class_name)
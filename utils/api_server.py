@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from utils.http_server import HttpServer, Request, Response, error_response, json_response
+from utils.search import SearchIndex
+from utils.stats import KLLSketch
+from utils.store import ESTADO_ACTIVA, JobStore
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+RESPONSE_CACHE_SIZE = 256
+
+# Parámetro de la URL -> argumento de JobStore.query
+_STORE_FILTERS = {
+    "ciudad": "ciudad",
+    "area": "area",
+    "modalidad": "modalidad",
+    "plataforma": "plataforma",
+    "desde": "desde",
+    "hasta": "hasta",
+    "nuevas_desde": "nuevas_desde",
+}
+
+# Parámetro de la URL -> faceta de SearchIndex
+_SEARCH_FILTERS = {
+    "ciudad": "ciudad",
+    "area": "cargo_area",
+    "modalidad": "cargo_modalidad",
+    "plataforma": "plataforma_origen",
+    "desde": "desde",
+    "hasta": "hasta",
+}
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.status = {}
+        self.total_ms = 0.0
+        self.latency = KLLSketch()
+
+    def observe(self, status: int, elapsed_ms: float):
+        self.requests += 1
+        self.errors += status >= 500
+        self.status[status] = self.status.get(status, 0) + 1
+        self.total_ms += elapsed_ms
+        self.latency.update(elapsed_ms)
+
+    def to_dict(self) -> dict:
+        p50, p95, p99 = self.latency.quantiles([0.5, 0.95, 0.99])
+        return {
+            "solicitudes": self.requests,
+            "errores": self.errors,
+            "por_estado": {str(code): count for code, count in sorted(self.status.items())},
+            "promedio_ms": round(self.total_ms / self.requests, 3) if self.requests else None,
+            "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+        }
+
+
+def _page_args(query: dict):
+    try:
+        page = max(int(query.get("pagina", 1)), 1)
+        size = min(max(int(query.get("por_pagina", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("pagina y por_pagina deben ser enteros")
+    return page, size
+
+
+class QueryApi:
+    """API de solo lectura sobre ``JobStore`` (y ``SearchIndex`` para ``q``).
+
+    Endpoints: ``/ofertas`` (filtros, orden y paginación), ``/facetas``,
+    ``/metrics`` y ``/health``. SQLite corre en un único hilo aparte para
+    no bloquear el event loop. Las respuestas de datos se cachean hasta que
+    otra conexión (una corrida del scraper) modifica la base, lo que se
+    detecta con ``PRAGMA data_version``.
+    """
+
+    def __init__(self, store_path=None, search_path=None):
+        self.store_path = store_path
+        self.search_path = search_path
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.metrics = {}
+        self._store = None
+        self._search = None
+        self._cache = OrderedDict()
+        self._data_version = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite", initializer=self._open)
+        self.routes = {
+            "/ofertas": self._ofertas,
+            "/facetas": self._facetas,
+            "/metrics": self._metrics,
+            "/health": self._health,
+        }
+        self.cached_routes = {"/ofertas", "/facetas"}
+        # Abre las conexiones ya, en el hilo de SQLite
+        self._executor.submit(lambda: None).result()
+
+    def _open(self):
+        self._store = JobStore(self.store_path)
+        if self.search_path and Path(self.search_path).exists():
+            self._search = SearchIndex(self.search_path)
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    async def handle(self, request: Request) -> Response:
+        start = time.perf_counter()
+        path = request.path.rstrip("/") or "/"
+        route = self.routes.get(path)
+        if request.method not in ("GET", "HEAD"):
+            response = error_response(405, "Solo GET")
+        elif route is None:
+            response = error_response(404, f"Ruta desconocida: {request.path}")
+        else:
+            try:
+                response = await self._cached(path, route, request)
+            except ValueError as e:
+                response = error_response(400, str(e))
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        name = path if route is not None else "otras"
+        self.metrics.setdefault(name, RouteMetrics()).observe(response.status, elapsed_ms)
+        response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.2f}"
+        return response
+
+    def _version(self) -> tuple:
+        version = self._store.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._search is not None:
+            version = (version, self._search.conn.execute("PRAGMA data_version").fetchone()[0])
+        return version
+
+    async def _cached(self, path: str, route, request: Request) -> Response:
+        if path not in self.cached_routes:
+            return await route(request)
+        version = await self._run(self._version)
+        if version != self._data_version:
+            self._cache.clear()
+            self._data_version = version
+        key = (path, tuple(sorted(request.query.items())))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            status, body = cached
+            return Response(status, body, etag=True)
+        response = await route(request)
+        if response.status == 200:
+            self._cache[key] = (response.status, response.body)
+            if len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return response
+
+    async def _ofertas(self, request: Request) -> Response:
+        query = request.query
+        page, size = _page_args(query)
+        offset = (page - 1) * size
+
+        # Mismo estado por defecto con y sin texto: solo ofertas activas salvo estado=todas
+        estado = query.get("estado", ESTADO_ACTIVA)
+        estado = None if estado == "todas" else estado
+        
+        if query.get("q"):
+            if self._search is None:
+                raise ValueError("Búsqueda de texto no disponible (sin índice)")
+            if query.get("nuevas_desde"):
+                # El índice no guarda first_seen: mejor un 400 que ignorar el filtro
+                raise ValueError("nuevas_desde no se puede combinar con q")
+            filters = {facet: query[param] for param, facet in _SEARCH_FILTERS.items() if query.get(param)}
+            filters["estado"] = estado
+            ofertas = await self._run(
+                self._search.search, query["q"], limit=size, offset=offset,
+                order_by=query.get("orden"), **filters,
+            )
+            total = await self._run(self._search.count, query["q"], **filters)
+        else:
+            filters = {arg: query[param] for param, arg in _STORE_FILTERS.items() if query.get(param)}
+            filters["estado"] = estado
+            ofertas = await self._run(
+                self._store.query, order_by=query.get("orden", "fecha_publicacion"),
+                limit=size, offset=offset, **filters,
+            )
+            total = await self._run(self._store.count, **filters)
+
+        return json_response({
+            "total": total,
+            "pagina": page,
+            "por_pagina": size,
+            "paginas": (total + size - 1) // size,
+            "ofertas": ofertas,
+        })
+
+    async def _facetas(self, request: Request) -> Response:
+        filters = {arg: request.query[param] for param, arg in _STORE_FILTERS.items() if request.query.get(param)}
+        estado = request.query.get("estado", ESTADO_ACTIVA)
+        filters["estado"] = None if estado == "todas" else estado
+        return json_response(await self._run(self._store.facets, **filters))
+
+    async def _metrics(self, request: Request) -> Response:
+        return json_response({
+            "desde": self.started,
+            "rutas": {name: metrics.to_dict() for name, metrics in sorted(self.metrics.items())},
+        }, etag=False)
+
+    async def _health(self, request: Request) -> Response:
+        total = await self._run(self._store.count, estado=None)
+        return json_response({"estado": "ok", "ofertas": total}, etag=False)
+
+    def close(self):
+        def _close():
+            self._store.close()
+            if self._search is not None:
+                self._search.close()
+        self._executor.submit(_close).result()
+        self._executor.shutdown()
+
+
+def serve(store_path=None, host: str = "127.0.0.1", port: int = 8000, search_path=None):
+    """Arranca la API y bloquea hasta Ctrl+C."""
+    api = QueryApi(store_path, search_path)
+    server = HttpServer(api.handle, host, port)
+
+    async def _main():
+        await server.start()
+        logger.info(f"API de ofertas en http://{server.host}:{server.port} (store: {store_path})")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.close()
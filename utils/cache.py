@@ -0,0 +1,144 @@
+import hashlib
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from config import settings
+from utils import serialization
+
+
+LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS etapas (
+    etapa TEXT NOT NULL,
+    huella TEXT NOT NULL,
+    salida BLOB NOT NULL,
+    costo REAL NOT NULL,
+    usado TEXT NOT NULL,
+    PRIMARY KEY (etapa, huella)
+) WITHOUT ROWID;
+"""
+
+
+def fingerprint(stage: str, version: int, values: Sequence) -> str:
+    # JSON canónico de la stdlib (como utils.changes.content_hash): los bytes de
+    # serialization.dumps cambian con el backend y vaciarían la caché
+    payload = json.dumps([stage, version, list(values)], sort_keys=True, separators=(",", ":"),
+                         ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class StageStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self.seconds_spent = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "aciertos": self.hits,
+            "fallos": self.misses,
+            "tasa_aciertos": round(self.hit_rate, 4),
+            "cpu_ahorrado_s": round(self.seconds_saved, 4),
+            "cpu_gastado_s": round(self.seconds_spent, 4),
+        }
+
+
+class StageCache:
+    """Caché persistente huella -> salida para etapas deterministas del pipeline.
+
+    Una etapa declara los campos que lee (``inputs``); la huella es el hash
+    de esos valores más el nombre y la versión de la etapa, así que cambios
+    en otros campos del registro no invalidan la salida. Al cambiar la
+    lógica de una etapa se sube su ``version``.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.DATA_DIR / "cache" / "etapas.db")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.stats: Dict[str, StageStats] = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _lookup(self, stage: str, fingerprints: List[str]) -> Dict[str, tuple]:
+        found = {}
+        for start in range(0, len(fingerprints), LOOKUP_BATCH):
+            chunk = fingerprints[start:start + LOOKUP_BATCH]
+            rows = self.conn.execute(
+                f"SELECT huella, salida, costo FROM etapas WHERE etapa = ? "
+                f"AND huella IN ({', '.join('?' for _ in chunk)})",
+                [stage, *chunk],
+            )
+            for huella, salida, costo in rows:
+                found[huella] = (serialization.loads(salida), costo)
+        return found
+
+    def run(self, stage: str, fn: Callable[[dict], dict], records: Iterable[dict],
+            inputs: Sequence[str], version: int = 1) -> List[dict]:
+        """Aplica ``fn`` a cada registro reutilizando salidas cacheadas.
+
+        ``fn`` debe depender solo de ``inputs`` y devolver un dict
+        serializable. Devuelve las salidas en el orden de ``records``.
+        """
+        records = list(records)
+        stats = self.stats.setdefault(stage, StageStats())
+        fingerprints = [fingerprint(stage, version, [record.get(name) for name in inputs]) for record in records]
+        cached = self._lookup(stage, sorted(set(fingerprints)))
+
+        now = datetime.now().isoformat(timespec="seconds")
+        outputs = []
+        new_rows = []
+        for record, huella in zip(records, fingerprints):
+            hit = cached.get(huella)
+            if hit is not None:
+                output, cost = hit
+                stats.hits += 1
+                stats.seconds_saved += cost
+            else:
+                start = time.process_time()
+                output = fn(record)
+                cost = time.process_time() - start
+                stats.misses += 1
+                stats.seconds_spent += cost
+                # Repetidos dentro de la misma corrida también se reutilizan
+                cached[huella] = (output, cost)
+                new_rows.append((stage, huella, serialization.dumps(output), cost, now))
+            outputs.append(output)
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO etapas VALUES (?, ?, ?, ?, ?)", new_rows)
+            self.conn.executemany(
+                "UPDATE etapas SET usado = ? WHERE etapa = ? AND huella = ?",
+                [(now, stage, huella) for huella in set(fingerprints) - {row[1] for row in new_rows}],
+            )
+        return outputs
+
+    def prune(self, max_age_days: int = 30) -> int:
+        """Borra salidas que no se usan hace más de ``max_age_days`` días."""
+        limit = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+        with self.conn:
+            return self.conn.execute("DELETE FROM etapas WHERE usado < ?", (limit,)).rowcount
+
+    def report(self) -> Dict[str, dict]:
+        return {stage: stats.to_dict() for stage, stats in self.stats.items()}
@@ -0,0 +1,149 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+from data_schema import JOB_FIELD_NAMES
+from utils import serialization
+from utils.sinks import JsonlSink, compressed_path
+from utils.store import ESTADO_CERRADA, storage_key
+
+
+# Campos que cambian en cada corrida sin que cambie la oferta
+VOLATILE_FIELDS = {"fecha_scraping", "estado_oferta", "puntaje_relevancia"}
+HASH_FIELDS = tuple(name for name in JOB_FIELD_NAMES if name not in VOLATILE_FIELDS)
+
+# Lo que se guarda de cada oferta para poder reportar su cierre
+_STATE_FIELDS = ("plataforma_origen", "id_oferta_plataforma", "url_oferta", "cargo_titulo", "empresa_nombre")
+
+OP_INSERT = "insert"
+OP_UPDATE = "update"
+OP_CLOSE = "close"
+
+
+def content_hash(job: dict) -> str:
+    """Hash del contenido normalizado de la oferta (sin campos volátiles).
+
+    Se hashea JSON canónico de la stdlib y no ``serialization.dumps``: sus
+    bytes dependen del backend (orjson compacto, json con espacios) y
+    cambiar de backend marcaría todas las ofertas como actualizadas.
+    """
+    values = [job.get(name) for name in HASH_FIELDS]
+    canonical = json.dumps(values, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class ChangeSet:
+    inserted: List[dict] = field(default_factory=list)
+    updated: List[dict] = field(default_factory=list)
+    closed: List[dict] = field(default_factory=list)
+    unchanged: int = 0
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "nuevas": len(self.inserted),
+            "actualizadas": len(self.updated),
+            "cerradas": len(self.closed),
+            "sin_cambios": self.unchanged,
+        }
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated or self.closed)
+
+
+def diff(jobs: Iterable[dict], previous: Dict[str, dict], platforms: Optional[Iterable[str]] = None,
+         seen_keys: Optional[Iterable[str]] = None) -> Tuple[ChangeSet, Dict[str, dict]]:
+    """Compara la corrida actual contra el estado anterior (clave -> hash).
+
+    Es lineal: una pasada sobre ``jobs`` con búsqueda por clave y otra sobre
+    el estado anterior para las desaparecidas. Solo se cierran ofertas de
+    ``platforms`` (por defecto, las presentes en ``jobs``); las de otras
+    plataformas pasan intactas al nuevo estado. ``seen_keys`` son claves
+    vistas en el portal aunque no estén en ``jobs`` (p. ej. descartadas por
+    validación): no se cierran y conservan su estado anterior.
+    """
+    changes = ChangeSet()
+    state: Dict[str, dict] = {}
+    seen_platforms = set()
+
+    for job in jobs:
+        key = storage_key(job)
+        if not key:
+            continue
+        seen_platforms.add(job.get("plataforma_origen", ""))
+        digest = content_hash(job)
+        old = previous.get(key)
+        if old is None:
+            if key not in state:
+                changes.inserted.append(job)
+        elif old["hash"] != digest:
+            if key not in state:
+                changes.updated.append(job)
+        elif key not in state:
+            changes.unchanged += 1
+        state[key] = {"clave": key, "hash": digest, **{name: job.get(name, "") for name in _STATE_FIELDS}}
+
+    platforms = set(platforms) if platforms is not None else seen_platforms
+    seen_keys = set(seen_keys) if seen_keys is not None else set()
+    fecha = datetime.now().strftime("%Y-%m-%d")
+    for key, entry in previous.items():
+        if key in state:
+            continue
+        if entry.get("plataforma_origen") in platforms and key not in seen_keys:
+            closed = {name: entry.get(name, "") for name in _STATE_FIELDS}
+            closed["estado_oferta"] = ESTADO_CERRADA
+            closed["fecha_scraping"] = fecha
+            changes.closed.append(closed)
+        else:
+            state[key] = entry
+
+    return changes, state
+
+
+class ChangeTracker:
+    """Detecta ofertas nuevas, actualizadas y cerradas entre corridas.
+
+    El estado (clave, hash y datos mínimos de cada oferta activa) vive en un
+    JSONL; cada corrida lo reemplaza de forma atómica.
+    """
+
+    def __init__(self, state_path=None, compression: Optional[str] = None):
+        self.state_path = Path(state_path or settings.DATA_DIR / "state" / "ofertas_hash.jsonl")
+        self.compression = compression
+
+    def load_state(self) -> Dict[str, dict]:
+        if not self.state_path.exists():
+            return {}
+        return {entry["clave"]: entry for entry in serialization.iter_jsonl(self.state_path)}
+
+    def save_state(self, state: Dict[str, dict]) -> Path:
+        with JsonlSink(self.state_path) as sink:
+            sink.write_all(state.values())
+        return sink.path
+
+    def compute(self, jobs: Iterable[dict], platforms: Optional[Iterable[str]] = None,
+                seen_keys: Optional[Iterable[str]] = None) -> Tuple[ChangeSet, Dict[str, dict]]:
+        return diff(jobs, self.load_state(), platforms, seen_keys)
+
+    def write_delta(self, changes: ChangeSet, path) -> Path:
+        """Delta JSONL: una línea ``{"op", "clave", "registro"}`` por cambio."""
+        def lines():
+            for op, jobs in ((OP_INSERT, changes.inserted), (OP_UPDATE, changes.updated), (OP_CLOSE, changes.closed)):
+                for job in jobs:
+                    yield {"op": op, "clave": storage_key(job), "registro": job}
+
+        with JsonlSink(compressed_path(path, self.compression), self.compression) as sink:
+            sink.write_all(lines())
+        return sink.path
+
+    def track(self, jobs: List[dict], delta_path, platforms: Optional[Iterable[str]] = None,
+              seen_keys: Optional[Iterable[str]] = None) -> ChangeSet:
+        """Calcula el delta, lo escribe y solo entonces avanza el estado."""
+        changes, state = self.compute(jobs, platforms, seen_keys)
+        self.write_delta(changes, delta_path)
+        self.save_state(state)
+        return changes
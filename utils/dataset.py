@@ -0,0 +1,139 @@
+import uuid
+from urllib.parse import unquote
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+from config import settings
+from data_schema import arrow_schema, arrow_table
+
+
+PARTITION_COLUMNS = ("fecha_scraping", "plataforma_origen")
+ROW_GROUP_SIZE = 64 * 1024
+
+# Columnas de baja cardinalidad que se benefician del diccionario
+_DICTIONARY_COLUMNS = [
+    "empresa_sector", "empresa_tamaño", "empresa_ubicacion_exacta", "cargo_nivel",
+    "cargo_area", "cargo_modalidad", "cargo_tipo_contrato", "cargo_jornada",
+    "salario_tipo", "educacion_minima", "fecha_publicacion", "estado_oferta", "zona",
+]
+
+
+class JobDataset:
+    """Dataset Parquet particionado por fecha de scraping y plataforma (estilo Hive).
+
+    Cada corrida agrega archivos nuevos en sus particiones; nunca se reescribe
+    lo existente.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.DATA_DIR / "dataset")
+
+    def _partitioning(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        schema = arrow_schema()
+        return ds.partitioning(
+            pa.schema([schema.field(name) for name in PARTITION_COLUMNS]), flavor="hive",
+        )
+
+    def append(self, jobs, run_id: Optional[str] = None) -> List[str]:
+        """Agrega ``jobs`` (lista de registros o tabla Arrow) como archivos nuevos."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        table = jobs if isinstance(jobs, pa.Table) else arrow_table(jobs)
+        if table.num_rows == 0:
+            return []
+
+        run_id = run_id or uuid.uuid4().hex[:12]
+        write_options = ds.ParquetFileFormat().make_write_options(
+            compression="zstd",
+            use_dictionary=_DICTIONARY_COLUMNS,
+            write_statistics=True,
+        )
+        written = []
+        ds.write_dataset(
+            table,
+            self.root,
+            format="parquet",
+            partitioning=self._partitioning(),
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=write_options,
+            max_rows_per_group=ROW_GROUP_SIZE,
+            min_rows_per_group=min(ROW_GROUP_SIZE, table.num_rows),
+            file_visitor=lambda written_file: written.append(written_file.path),
+        )
+        return written
+
+    def dataset(self):
+        import pyarrow.dataset as ds
+
+        return ds.dataset(
+            self.root, schema=arrow_schema(), format="parquet", partitioning=self._partitioning(),
+        )
+
+    def _filter(self, plataforma=None, desde=None, hasta=None, ciudad=None):
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        expression = None
+
+        def _and(condition):
+            nonlocal expression
+            expression = condition if expression is None else expression & condition
+
+        if plataforma is not None:
+            if isinstance(plataforma, str):
+                _and(ds.field("plataforma_origen") == plataforma)
+            else:
+                _and(ds.field("plataforma_origen").isin(list(plataforma)))
+        if desde:
+            _and(ds.field("fecha_scraping") >= desde)
+        if hasta:
+            _and(ds.field("fecha_scraping") <= hasta)
+        if ciudad:
+            _and(pc.match_substring(ds.field("empresa_ubicacion_exacta"), ciudad, ignore_case=True))
+        return expression
+
+    def scanner(self, columns: Optional[Sequence[str]] = None, plataforma=None,
+                desde: str = None, hasta: str = None, ciudad: str = None, batch_size: int = ROW_GROUP_SIZE):
+        """Scanner con poda de particiones (plataforma, fecha) y proyección de columnas.
+
+        ``desde``/``hasta`` son fechas de scraping ISO; las particiones fuera
+        del rango no se abren.
+        """
+        if not self.root.exists():
+            return None
+        return self.dataset().scanner(
+            columns=list(columns) if columns else None,
+            filter=self._filter(plataforma, desde, hasta, ciudad),
+            batch_size=batch_size,
+        )
+
+    def read(self, columns: Optional[Sequence[str]] = None, **filters):
+        import pyarrow as pa
+
+        scanner = self.scanner(columns, **filters)
+        if scanner is None:
+            schema = arrow_schema()
+            fields = [schema.field(name) for name in columns] if columns else schema
+            return pa.Table.from_pylist([], schema=pa.schema(fields))
+        return scanner.to_table()
+
+    def iter_batches(self, columns: Optional[Sequence[str]] = None, **filters) -> Iterator:
+        scanner = self.scanner(columns, **filters)
+        if scanner is not None:
+            yield from scanner.to_batches()
+
+    def partitions(self) -> List[dict]:
+        """Particiones existentes, p. ej. ``{"fecha_scraping": "2026-10-19", "plataforma_origen": "Computrabajo"}``."""
+        found = []
+        for day_dir in sorted(self.root.glob(f"{PARTITION_COLUMNS[0]}=*")):
+            for platform_dir in sorted(day_dir.glob(f"{PARTITION_COLUMNS[1]}=*")):
+                found.append({
+                    PARTITION_COLUMNS[0]: unquote(day_dir.name.split("=", 1)[1]),
+                    PARTITION_COLUMNS[1]: unquote(platform_dir.name.split("=", 1)[1]),
+                })
+        return found
@@ -0,0 +1,183 @@
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from utils.text import fold_accents
+
+
+Anchor = Union[datetime, date, str, None]
+
+_NUMBER_WORDS = {
+    "un": 1, "una": 1, "uno": 1, "a": 1, "an": 1, "one": 1,
+    "dos": 2, "two": 2, "tres": 3, "three": 3, "cuatro": 4, "four": 4,
+    "cinco": 5, "five": 5, "seis": 6, "six": 6, "siete": 7, "seven": 7,
+    "ocho": 8, "eight": 8, "nueve": 9, "nine": 9, "diez": 10, "ten": 10,
+}
+
+_UNITS = {
+    "segundo": "seconds", "second": "seconds", "seg": "seconds",
+    "minuto": "minutes", "minute": "minutes", "min": "minutes",
+    "hora": "hours", "hour": "hours", "h": "hours",
+    "dia": "days", "day": "days", "d": "days",
+    "semana": "weeks", "week": "weeks",
+    "mes": "months", "month": "months",
+    "ano": "years", "year": "years",
+}
+
+_MONTHS = {
+    "enero": 1, "ene": 1, "january": 1, "jan": 1,
+    "febrero": 2, "feb": 2, "february": 2,
+    "marzo": 3, "mar": 3, "march": 3,
+    "abril": 4, "abr": 4, "april": 4, "apr": 4,
+    "mayo": 5, "may": 5,
+    "junio": 6, "jun": 6, "june": 6,
+    "julio": 7, "jul": 7, "july": 7,
+    "agosto": 8, "ago": 8, "august": 8, "aug": 8,
+    "septiembre": 9, "setiembre": 9, "sep": 9, "sept": 9, "september": 9,
+    "octubre": 10, "oct": 10, "october": 10,
+    "noviembre": 11, "nov": 11, "november": 11,
+    "diciembre": 12, "dic": 12, "december": 12, "dec": 12,
+}
+
+_TODAY_WORDS = ("hoy", "today", "ahora", "just now", "recien", "hace instantes", "hace momentos", "moments ago")
+
+_ISO_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_DMY_RE = re.compile(r"\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})\b")
+_UNIT_PATTERN = r"(segundo|second|seg|minuto|minute|min|hora|hour|h|dia|day|d|semana|week|mes|month|ano|year)(?:e?s)?\b"
+_AMOUNT_PATTERN = r"(\d+|un|una|uno|a|an|one|dos|two|tres|three|cuatro|four|cinco|five|seis|six|siete|seven|ocho|eight|nueve|nine|diez|ten)"
+_RELATIVE_RE = re.compile(r"(?:mas de |more than |over )?" + _AMOUNT_PATTERN + r"\+?\s*" + _UNIT_PATTERN)
+_DAY_MONTH_RE = re.compile(r"\b(\d{1,2})\s+(?:de\s+)?([a-z]+)\.?(?:\s+(?:de\s+)?(\d{4}))?")
+
+# Resultado del análisis de una frase: ("abs", (y, m, d)), ("rel", (unidad, cantidad))
+# o ("dm", (d, m)) para fechas sin año.
+Parsed = Optional[Tuple[str, tuple]]
+
+
+@lru_cache(maxsize=4096)
+def _parse_phrase(phrase: str) -> Parsed:
+    text = fold_accents(" ".join(phrase.lower().split()))
+    if not text:
+        return None
+
+    iso = _ISO_RE.search(text)
+    if iso:
+        return "abs", tuple(int(g) for g in iso.groups())
+
+    dmy = _DMY_RE.search(text)
+    if dmy:
+        day, month, year = (int(g) for g in dmy.groups())
+        return "abs", (year, month, day)
+
+    if "anteayer" in text or "antier" in text:
+        return "rel", ("days", 2)
+    if "ayer" in text or "yesterday" in text:
+        return "rel", ("days", 1)
+
+    relative = _RELATIVE_RE.search(text)
+    if relative and ("hace" in text or "ago" in text or "publicad" in text or "posted" in text):
+        amount, unit = relative.groups()
+        amount = int(amount) if amount.isdigit() else _NUMBER_WORDS[amount]
+        return "rel", (_UNITS[unit], amount)
+
+    if any(word in text for word in _TODAY_WORDS):
+        return "rel", ("days", 0)
+
+    for match in _DAY_MONTH_RE.finditer(text):
+        day, month_name, year = match.groups()
+        month = _MONTHS.get(month_name)
+        if month:
+            if year:
+                return "abs", (int(year), month, int(day))
+            return "dm", (int(day), month)
+
+    return None
+
+
+def _to_anchor(anchor: Anchor) -> Union[datetime, date]:
+    if anchor is None:
+        return datetime.now()
+    if isinstance(anchor, str):
+        try:
+            if len(anchor) == 10:
+                return datetime.strptime(anchor, "%Y-%m-%d").date()
+            return datetime.fromisoformat(anchor)
+        except ValueError:
+            # Ancla ilegible (p. ej. "10/01/2024"): se resuelve contra ahora, como sin ancla
+            return datetime.now()
+    return anchor
+
+
+def _apply(parsed: Parsed, anchor: Union[datetime, date]) -> Optional[str]:
+    if parsed is None:
+        return None
+
+    kind, value = parsed
+    anchor_date = anchor.date() if isinstance(anchor, datetime) else anchor
+
+    try:
+        if kind == "abs":
+            return date(*value).isoformat()
+
+        if kind == "dm":
+            day, month = value
+            resolved = date(anchor_date.year, month, day)
+            if resolved > anchor_date:
+                resolved = date(anchor_date.year - 1, month, day)
+            return resolved.isoformat()
+    except ValueError:
+        return None
+
+    unit, amount = value
+    if unit == "months":
+        unit, amount = "days", amount * 30
+    elif unit == "years":
+        unit, amount = "days", amount * 365
+
+    if unit in ("seconds", "minutes", "hours"):
+        # Sin hora en el ancla no se puede cruzar la medianoche con certeza
+        if not isinstance(anchor, datetime):
+            return anchor_date.isoformat()
+        return (anchor - timedelta(**{unit: amount})).date().isoformat()
+
+    return (anchor_date - timedelta(**{unit: amount})).isoformat()
+
+
+def resolve_date(text: Optional[str], anchor: Anchor = None) -> Optional[str]:
+    """Convierte "Hace 3 días", "Ayer", "2 weeks ago"... en una fecha ISO.
+
+    ``anchor`` es el momento de la descarga (datetime, date o string ISO);
+    por defecto, o si no es una fecha ISO válida, ahora. Devuelve None si
+    la frase no se reconoce.
+    """
+    if not text:
+        return None
+    return _apply(_parse_phrase(text), _to_anchor(anchor))
+
+
+def resolve_dates(texts: Iterable[Optional[str]], anchor: Union[Anchor, Sequence[Anchor]] = None) -> List[Optional[str]]:
+    """Versión por columnas de ``resolve_date``.
+
+    ``anchor`` puede ser un único ancla o una secuencia alineada con ``texts``.
+    Cada combinación distinta de (frase, ancla) se resuelve una sola vez.
+    """
+    texts = list(texts)
+    if isinstance(anchor, (list, tuple)):
+        anchors = anchor
+    else:
+        anchors = [anchor] * len(texts)
+
+    resolved = {}
+    parsed_anchors = {}
+    results = []
+    for text, row_anchor in zip(texts, anchors):
+        key = (text, row_anchor)
+        if key not in resolved:
+            if not text:
+                resolved[key] = None
+            else:
+                if row_anchor not in parsed_anchors:
+                    parsed_anchors[row_anchor] = _to_anchor(row_anchor)
+                resolved[key] = _apply(_parse_phrase(text), parsed_anchors[row_anchor])
+        results.append(resolved[key])
+    return results
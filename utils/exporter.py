@@ -1,106 +1,192 @@
-import json
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
-
-import pandas as pd
+from typing import Iterable, List
 
 from config import settings
+from data_schema import arrow_table, conform_records
+from utils import serialization
+from utils.changes import ChangeSet, ChangeTracker
+from utils.dataset import JobDataset
+from utils.loader import iter_records
+from utils.sinks import CsvSink, JsonlSink, ParquetSink
+from utils.stats import SummaryAggregator
 
 
 class DataExporter:
-    def __init__(self):
+    def __init__(self, compression: str = None):
         self.data_dir = settings.DATA_DIR
+        self.compression = compression
     
-    def to_jsonl(self, jobs: List[dict], filename: str) -> Path:
-        filepath = self.data_dir / "raw" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for job in jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + '\n')
+    def to_jsonl(self, jobs: Iterable[dict], filename: str) -> Path:
+        with JsonlSink(self.data_dir / "raw" / filename, self.compression) as sink:
+            sink.write_all(jobs)
         
-        print(f"✓ JSONL: {filepath} ({len(jobs)} jobs)")
-        return filepath
+        print(f"✓ JSONL: {sink.path} ({sink.count} jobs)")
+        return sink.path
     
-    def to_jsonl_processed(self, jobs: List[dict], filename: str) -> Path:
-        filepath = self.data_dir / "processed" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+    def to_jsonl_processed(self, jobs: Iterable[dict], filename: str) -> Path:
+        with JsonlSink(self.data_dir / "processed" / filename, self.compression) as sink:
+            sink.write_all(jobs)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for job in jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + '\n')
-        
-        print(f"✓ JSONL processed: {filepath} ({len(jobs)} jobs)")
-        return filepath
+        print(f"✓ JSONL processed: {sink.path} ({sink.count} jobs)")
+        return sink.path
     
-    def to_csv(self, jobs: List[dict], filename: str) -> Path:
-        filepath = self.data_dir / "exports" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+    def to_csv(self, jobs: Iterable[dict], filename: str) -> Path:
+        with CsvSink(self.data_dir / "exports" / filename, self.compression) as sink:
+            sink.write_all(jobs)
         
-        df = pd.DataFrame(jobs)
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        print(f"✓ CSV: {sink.path} ({sink.count} jobs)")
+        return sink.path
+    
+    def to_parquet(self, jobs: Iterable[dict], filename: str) -> Path:
+        with ParquetSink(self.data_dir / "exports" / filename) as sink:
+            sink.write_all(jobs)
         
-        print(f"✓ CSV: {filepath} ({len(jobs)} jobs)")
-        return filepath
+        print(f"✓ Parquet: {sink.path} ({sink.count} jobs)")
+        return sink.path
     
-    def to_parquet(self, jobs: List[dict], filename: str) -> Path:
-        filepath = self.data_dir / "exports" / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+    def export_all_formats(self, jobs: List[dict], base_filename: str) -> dict:
+        """Exporta todos los formatos desde una única materialización.
+        
+        Los registros se serializan a JSON una vez (raw y processed comparten
+        los bytes) y se convierten una vez a tabla Arrow, que alimentan el CSV,
+        el dataset Parquet y el resumen. Los escritores corren en paralelo;
+        el reporte incluye tiempo y bytes por formato.
+        """
+        name = base_filename
+        # Con valores de tipo incorrecto, jobs pasa a ser la versión convertida
+        table, jobs = conform_records(jobs)
+        encoded = [serialization.dumps(job) for job in jobs]
+        
+        def write_jsonl(subdir: str, filename: str):
+            with JsonlSink(self.data_dir / subdir / filename, self.compression) as sink:
+                sink.write_encoded(encoded)
+            return [sink.path], sink.bytes_written
+        
+        def write_csv():
+            with CsvSink(self.data_dir / "exports" / f"{name}.csv", self.compression) as sink:
+                sink.write_table(table)
+            return [sink.path], sink.bytes_written
+        
+        def write_dataset():
+            files = JobDataset(self.data_dir / "dataset").append(table, run_id=name)
+            return files, sum(Path(f).stat().st_size for f in files)
+        
+        writers = {
+            "jsonl": lambda: write_jsonl("raw", f"{name}.jsonl"),
+            "jsonl_processed": lambda: write_jsonl("processed", f"{name}_processed.jsonl"),
+            "csv": write_csv,
+            "parquet_dataset": write_dataset,
+        }
         
-        df = pd.DataFrame(jobs)
-        df.to_parquet(filepath, index=False)
+        def timed(writer):
+            start = time.perf_counter()
+            paths, size = writer()
+            return {"paths": [str(p) for p in paths], "bytes": size, "seconds": time.perf_counter() - start}
         
-        print(f"✓ Parquet: {filepath} ({len(jobs)} jobs)")
-        return filepath
-    
-    def export_all_formats(self, jobs: List[dict], base_filename: str):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name = f"{base_filename}_{timestamp}"
+        with ThreadPoolExecutor(max_workers=len(writers)) as pool:
+            futures = {fmt: pool.submit(timed, writer) for fmt, writer in writers.items()}
+            formats = {fmt: future.result() for fmt, future in futures.items()}
         
-        self.to_jsonl(jobs, f"{name}.jsonl")
-        self.to_jsonl_processed(jobs, f"{name}_processed.jsonl")
-        self.to_csv(jobs, f"{name}.csv")
+        for fmt, info in formats.items():
+            print(f"✓ {fmt}: {len(info['paths'])} archivo(s), {info['bytes'] / 1024:,.1f} KB en {info['seconds']:.3f}s ({len(jobs)} jobs)")
         
-        if len(jobs) > 100:
-            self.to_parquet(jobs, f"{name}.parquet")
+        history = self.update_history(jobs, name)
         
-        return name
+        return {
+            "name": name,
+            "formats": formats,
+            "summary": self.get_summary(table),
+            "historico": history.summary(),
+        }
+    
+    def update_history(self, jobs: Iterable[dict], run_name: str) -> SummaryAggregator:
+        """Guarda el estado agregado de la corrida y lo suma a ``stats/historico.json``.
+        
+        ``stats/<corrida>.json`` permite recombinar corridas (o nodos) con
+        ``utils.stats.merge_states``. Una oferta que sigue activa en varias
+        corridas suma en ``total`` cada vez; ``ofertas_distintas`` la cuenta
+        una sola vez (HyperLogLog, tamaño fijo sin importar el histórico).
+        """
+        stats_dir = self.data_dir / "stats"
+        run = SummaryAggregator().update_many(jobs)
+        run.save(stats_dir / f"{run_name}.json")
+        
+        history = SummaryAggregator.load(stats_dir / "historico.json").merge(run)
+        history.save(stats_dir / "historico.json")
+        return history
+    
+    def summarize_history(self, paths=None) -> dict:
+        """Resumen en memoria constante de exports históricos (por defecto, el dataset Parquet)."""
+        paths = paths or self.data_dir / "dataset"
+        columns = ["plataforma_origen", "empresa_ubicacion_exacta", "cargo_modalidad", "salario_min", "salario_max"]
+        return SummaryAggregator().update_many(iter_records(paths, columns=columns)).summary()
+    
+    def export_changes(self, jobs: List[dict], base_filename: str, platforms: Iterable[str] = None,
+                       seen_keys: Iterable[str] = None) -> ChangeSet:
+        """Delta de ofertas nuevas/actualizadas/cerradas respecto a la corrida anterior.
+        
+        Solo se cierran ofertas de ``platforms`` cuyas claves no estén en
+        ``seen_keys`` (ver ``utils.changes.diff``).
+        """
+        tracker = ChangeTracker(self.data_dir / "state" / "ofertas_hash.jsonl", self.compression)
+        changes = tracker.track(jobs, self.data_dir / "cambios" / f"{base_filename}_delta.jsonl",
+                                platforms, seen_keys)
+        
+        counts = changes.counts()
+        print(f"✓ Cambios: {counts['nuevas']} nuevas, {counts['actualizadas']} actualizadas, "
+              f"{counts['cerradas']} cerradas, {counts['sin_cambios']} sin cambios")
+        return changes
+    
+    def to_dataset(self, jobs: List[dict], run_id: str = None) -> List[str]:
+        files = JobDataset(self.data_dir / "dataset").append(jobs, run_id=run_id)
+        
+        print(f"✓ Parquet dataset: {len(files)} particiones ({len(jobs)} jobs)")
+        return files
     
     def load_jsonl(self, filepath: str) -> List[dict]:
-        jobs = []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    jobs.append(json.loads(line))
-        return jobs
+        return list(iter_records(filepath))
     
-    def get_summary(self, jobs: List[dict]) -> dict:
-        if not jobs:
+    def get_summary(self, jobs) -> dict:
+        """Resumen de una lista de registros o de una tabla Arrow ya materializada."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        if not isinstance(jobs, pa.Table):
+            if not jobs:
+                return {"total": 0}
+            jobs = arrow_table(jobs)
+        table = jobs
+        if table.num_rows == 0:
             return {"total": 0}
         
-        df = pd.DataFrame(jobs)
+        def counts(column: str) -> dict:
+            values = pc.value_counts(pc.drop_null(table.column(column))).to_pylist()
+            values.sort(key=lambda item: item["counts"], reverse=True)
+            return {item["values"]: item["counts"] for item in values}
+        
+        modalidades = counts("cargo_modalidad")
+        salario_min = pc.drop_null(table.column("salario_min"))
         
         summary = {
-            "total": len(jobs),
-            "por_plataforma": df['plataforma_origen'].value_counts().to_dict() if 'plataforma_origen' in df else {},
-            "por_ciudad": df['empresa_ubicacion_exacta'].value_counts().to_dict() if 'empresa_ubicacion_exacta' in df else {},
-            "con_salario": len(df[df['salario_min'].notna()]) if 'salario_min' in df else 0,
-            "remotos": len(df[df['cargo_modalidad'] == 'Remoto']) if 'cargo_modalidad' in df else 0,
-            "presenciales": len(df[df['cargo_modalidad'] == 'Presencial']) if 'cargo_modalidad' in df else 0,
-            "hibridos": len(df[df['cargo_modalidad'] == 'Híbrido']) if 'cargo_modalidad' in df else 0,
+            "total": table.num_rows,
+            "por_plataforma": counts("plataforma_origen"),
+            "por_ciudad": counts("empresa_ubicacion_exacta"),
+            "con_salario": len(salario_min),
+            "remotos": modalidades.get("Remoto", 0),
+            "presenciales": modalidades.get("Presencial", 0),
+            "hibridos": modalidades.get("Híbrido", 0),
         }
         
-        if 'salario_min' in df:
-            salary_data = df[df['salario_min'].notna()]['salario_min']
-            if not salary_data.empty:
-                summary["salario_min_promedio"] = float(salary_data.mean())
-                summary["salario_min_mediana"] = float(salary_data.median())
+        if len(salario_min):
+            summary["salario_min_promedio"] = pc.mean(salario_min).as_py()
+            summary["salario_min_mediana"] = pc.quantile(salario_min, q=0.5)[0].as_py()
         
         return summary
     
-    def print_summary(self, jobs: List[dict]):
-        summary = self.get_summary(jobs)
+    def print_summary(self, jobs: List[dict] = None, summary: dict = None):
+        summary = summary if summary is not None else self.get_summary(jobs)
         
         print("\n" + "="*50)
         print("RESUMEN DE DATOS")
@@ -125,5 +211,8 @@ class DataExporter:
         if summary.get('salario_min_promedio'):
             print(f"\nSalario mínimo promedio: ${summary['salario_min_promedio']:,.0f} COP")
             print(f"Salario mínimo mediana: ${summary['salario_min_mediana']:,.0f} COP")
+            if summary.get('salario_min_cuantiles'):
+                cuantiles = ", ".join(f"{q}: ${v:,.0f}" for q, v in summary['salario_min_cuantiles'].items())
+                print(f"Salario mínimo cuantiles: {cuantiles}")
         
         print("="*50)
@@ -0,0 +1,253 @@
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils import serialization
+
+
+FEED_DIR = Path("frontend/public/feed")
+FEED_VERSION = 1
+SHARD_SIZE = 250
+
+# Columnas (ruta en el registro del frontend) con pocos valores distintos:
+# se guardan como índices a un diccionario del manifiesto
+DICTIONARY_COLUMNS = (
+    "plataforma_origen",
+    "empresa.sector",
+    "empresa.tamaño",
+    "empresa.ubicacion",
+    "cargo.nivel",
+    "cargo.area",
+    "cargo.modalidad",
+    "cargo.tipo_contrato",
+    "cargo.jornada",
+    "compensacion.moneda",
+    "requisitos.educacion_minima",
+    "metadata.fecha_publicacion",
+    "metadata.fecha_scraping",
+    "metadata.estado",
+)
+
+# Listas cuyos elementos también van por diccionario
+LIST_DICTIONARY_COLUMNS = (
+    "compensacion.beneficios",
+    "requisitos.habilidades_tecnicas",
+    "requisitos.habilidades_blandas",
+    "requisitos.idiomas",
+)
+
+# Faceta -> columna; cada valor tiene la lista ordenada de filas que lo contienen
+FACETS = {
+    "ciudad": "empresa.ubicacion",
+    "modalidad": "cargo.modalidad",
+    "nivel": "cargo.nivel",
+    "area": "cargo.area",
+    "skills": "requisitos.habilidades_tecnicas",
+}
+
+
+def _get_path(record: dict, path: str):
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _set_path(record: dict, path: str, value):
+    *parents, leaf = path.split(".")
+    for part in parents:
+        record = record.setdefault(part, {})
+    record[leaf] = value
+
+
+def _column_paths(record: dict, prefix: str = "") -> List[str]:
+    paths = []
+    for key, value in record.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            paths.extend(_column_paths(value, f"{path}."))
+        else:
+            paths.append(path)
+    return paths
+
+
+class _Dictionary:
+    def __init__(self):
+        self.values: List = []
+        self._index: Dict = {}
+
+    def encode(self, value) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def _write_json(obj, path: Path):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    serialization.dump_json(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_feed(jobs: List[dict], out_dir=None, shard_size: int = SHARD_SIZE) -> dict:
+    """Publica ``jobs`` (registros del frontend) como feed particionado.
+
+    Estructura de ``out_dir``:
+
+    - ``shards/<generación>-NNNN.json``: páginas de ``shard_size``
+      registros en formato columnar; las columnas de ``DICTIONARY_COLUMNS``
+      y ``LIST_DICTIONARY_COLUMNS`` van como índices al diccionario.
+    - ``facets/<generación>-<faceta>.json``: para cada valor, las filas que
+      lo tienen (ordenadas), para filtrar intersectando listas sin leer los
+      shards.
+    - ``manifest.json``: generación, columnas, diccionarios, shards y
+      conteo por valor de cada faceta.
+
+    Cada publicación escribe archivos con nombres nuevos y luego reemplaza
+    ``manifest.json`` de forma atómica; nunca se sobrescribe un shard. Un
+    lector con el manifiesto anterior sigue leyendo los shards que lo
+    acompañan (los índices de diccionario solo valen contra su propio
+    manifiesto). Se conservan la generación actual y la anterior; las más
+    viejas se borran.
+    """
+    out_dir = Path(out_dir or FEED_DIR)
+    manifest_path = out_dir / "manifest.json"
+    previous = load_manifest(out_dir).get("generation") if manifest_path.exists() else None
+    generation = f"{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:6]}"
+    shards_dir = out_dir / "shards"
+    facets_dir = out_dir / "facets"
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    facets_dir.mkdir(parents=True, exist_ok=True)
+
+    columns = _column_paths(jobs[0]) if jobs else []
+    dictionaries = {
+        column: _Dictionary()
+        for column in columns if column in DICTIONARY_COLUMNS or column in LIST_DICTIONARY_COLUMNS
+    }
+    postings = {facet: {} for facet in FACETS}
+
+    shards = []
+    for shard_number, start in enumerate(range(0, len(jobs), shard_size)):
+        chunk = jobs[start:start + shard_size]
+        data = {column: [] for column in columns}
+        for row, job in enumerate(chunk, start):
+            for column in columns:
+                value = _get_path(job, column)
+                dictionary = dictionaries.get(column)
+                if dictionary is not None:
+                    if column in LIST_DICTIONARY_COLUMNS:
+                        value = [dictionary.encode(item) for item in value or []]
+                    else:
+                        value = dictionary.encode(value)
+                data[column].append(value)
+
+            for facet, column in FACETS.items():
+                value = _get_path(job, column)
+                for item in (value if isinstance(value, list) else [value]):
+                    if item is not None:
+                        postings[facet].setdefault(item, []).append(row)
+
+        filename = f"{generation}-{shard_number:04d}.json"
+        _write_json({"start": start, "count": len(chunk), "columns": data}, shards_dir / filename)
+        shards.append({"file": f"shards/{filename}", "start": start, "count": len(chunk)})
+
+    facets = {}
+    for facet, values in postings.items():
+        ordered = dict(sorted(values.items(), key=lambda item: (-len(item[1]), str(item[0]))))
+        filename = f"{generation}-{facet}.json"
+        _write_json(ordered, facets_dir / filename)
+        facets[facet] = {
+            "file": f"facets/{filename}",
+            "column": FACETS[facet],
+            "counts": {value: len(rows) for value, rows in ordered.items()},
+        }
+
+    manifest = {
+        "version": FEED_VERSION,
+        "generation": generation,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "total": len(jobs),
+        "shard_size": shard_size,
+        "columns": columns,
+        "dictionaries": {column: dictionary.values for column, dictionary in dictionaries.items()},
+        "shards": shards,
+        "facets": facets,
+    }
+    _write_json(manifest, manifest_path)
+
+    # Generaciones viejas (y archivos sin generación de versiones anteriores del feed)
+    keep = tuple(f"{gen}-" for gen in (generation, previous) if gen)
+    for directory in (shards_dir, facets_dir):
+        for stale in directory.glob("*.json"):
+            if not stale.name.startswith(keep):
+                stale.unlink(missing_ok=True)
+
+    return manifest
+
+
+def load_manifest(feed_dir=None) -> dict:
+    return serialization.load_json(Path(feed_dir or FEED_DIR) / "manifest.json")
+
+
+def decode_shard(shard: dict, manifest: dict) -> List[dict]:
+    """Reconstruye los registros anidados de un shard."""
+    dictionaries = manifest["dictionaries"]
+    records = [{} for _ in range(shard["count"])]
+    for column, values in shard["columns"].items():
+        dictionary = dictionaries.get(column)
+        for record, value in zip(records, values):
+            if dictionary is not None:
+                if isinstance(value, list):
+                    value = [dictionary[index] for index in value]
+                else:
+                    value = dictionary[value]
+            _set_path(record, column, value)
+    return records
+
+
+def load_feed(feed_dir=None, rows: Optional[Iterable[int]] = None) -> List[dict]:
+    """Registros del feed; con ``rows`` solo se leen los shards que los contienen."""
+    feed_dir = Path(feed_dir or FEED_DIR)
+    manifest = load_manifest(feed_dir)
+    wanted = None if rows is None else sorted(set(rows))
+
+    records = []
+    for shard_info in manifest["shards"]:
+        start, end = shard_info["start"], shard_info["start"] + shard_info["count"]
+        if wanted is not None and not any(start <= row < end for row in wanted):
+            continue
+        shard = serialization.load_json(feed_dir / shard_info["file"])
+        decoded = decode_shard(shard, manifest)
+        if wanted is None:
+            records.extend(decoded)
+        else:
+            records.extend(decoded[row - start] for row in wanted if start <= row < end)
+    return records
+
+
+def filter_rows(feed_dir=None, **selected) -> List[int]:
+    """Filas que cumplen todos los filtros de faceta (OR dentro de cada faceta).
+
+    Ejemplo: ``filter_rows(ciudad=["Medellín"], modalidad=["Remoto", "Híbrido"])``.
+    """
+    feed_dir = Path(feed_dir or FEED_DIR)
+    manifest = load_manifest(feed_dir)
+    result = None
+    for facet, values in selected.items():
+        if not values:
+            continue
+        if isinstance(values, str):
+            values = [values]
+        postings = serialization.load_json(feed_dir / manifest["facets"][facet]["file"])
+        rows = set()
+        for value in values:
+            rows.update(postings.get(value, []))
+        result = rows if result is None else result & rows
+    if result is None:
+        return list(range(manifest["total"]))
+    return sorted(result)
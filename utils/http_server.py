@@ -0,0 +1,169 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from utils import serialization
+
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+GZIP_MIN_BYTES = 1024
+KEEP_ALIVE_TIMEOUT = 15
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "application/json"
+    headers: Dict[str, str] = field(default_factory=dict)
+    etag: bool = False
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+def json_response(obj, status: int = 200, etag: bool = True, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(status, serialization.dumps(obj), headers=headers or {}, etag=etag)
+
+
+def error_response(status: int, message: str) -> Response:
+    return json_response({"error": message}, status=status, etag=False)
+
+
+class RequestError(ValueError):
+    """Petición que no se puede atender; ``status`` es la respuesta que le corresponde."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise RequestError(431, "Cabeceras demasiado grandes")
+
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3 or not parts[0] or not parts[1] or not parts[2].startswith("HTTP/"):
+        raise RequestError(400, "Línea de petición inválida")
+    method, target, _ = parts
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    body = b""
+    raw_length = headers.get("content-length", "") or "0"
+    if not raw_length.isdigit():
+        raise RequestError(400, "Content-Length inválido")
+    length = int(raw_length)
+    if length:
+        try:
+            body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            return None
+
+    url = urlsplit(target)
+    return Request(method.upper(), url.path or "/", dict(parse_qsl(url.query)), headers, body)
+
+
+def _finalize(request: Request, response: Response) -> bytes:
+    headers = {"Content-Type": response.content_type, **response.headers}
+    body = response.body
+    status = response.status
+
+    if response.etag and status == 200:
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        headers["ETag"] = etag
+        headers.setdefault("Cache-Control", "no-cache")
+        if etag in request.headers.get("if-none-match", ""):
+            status, body = 304, b""
+
+    if (len(body) >= GZIP_MIN_BYTES
+            and "gzip" in request.headers.get("accept-encoding", "")):
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    headers["Content-Length"] = str(len(body))
+    reason = HTTPStatus(status).phrase
+    head = f"HTTP/1.1 {status} {reason}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+    return head.encode("latin-1") + (body if request.method != "HEAD" else b"")
+
+
+class HttpServer:
+    """Servidor HTTP/1.1 mínimo sobre asyncio (keep-alive, ETag y gzip).
+
+    ``handler`` recibe un ``Request`` y devuelve un ``Response``; el
+    servidor se encarga del protocolo. Pensado para uso local (API de
+    consulta, portales simulados en benchmarks), no para exponer a internet.
+    """
+
+    def __init__(self, handler: Handler, host: str = "127.0.0.1", port: int = 8000):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as e:
+                    writer.write(_finalize(Request("GET", "/", {}, {}), error_response(e.status, str(e))))
+                    break
+                if request is None:
+                    break
+                try:
+                    response = await self.handler(request)
+                except Exception:
+                    logger.exception(f"Error atendiendo {request.method} {request.path}")
+                    response = error_response(500, "Error interno")
+                writer.write(_finalize(request, response))
+                await writer.drain()
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
@@ -0,0 +1,251 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+from data_schema import LEGACY_FIELDS, arrow_schema
+from utils import serialization
+from utils.dataset import PARTITION_COLUMNS, JobDataset
+
+
+PathSpec = Union[str, Path, Sequence[Union[str, Path]]]
+
+JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+BATCH_SIZE = 10_000
+
+# Nombre canónico -> nombre en registros con claves en inglés (JobPosting)
+_ENGLISH_NAMES = {canonical: english for english, canonical in LEGACY_FIELDS.items()}
+
+
+def expand_paths(paths: PathSpec) -> List[Path]:
+    """Archivos (o raíces de dataset Parquet) a partir de rutas, directorios o globs."""
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    expanded = []
+    for spec in paths:
+        spec = Path(spec)
+        if any(ch in str(spec) for ch in "*?["):
+            anchor = Path(spec.anchor or ".")
+            expanded.extend(sorted(anchor.glob(str(spec.relative_to(anchor)))))
+        elif spec.is_dir():
+            if any(spec.glob(f"{PARTITION_COLUMNS[0]}=*")):
+                expanded.append(spec)
+            else:
+                expanded.extend(
+                    sorted(p for p in spec.iterdir()
+                           if p.name.endswith(JSONL_SUFFIXES) or p.suffix in (".parquet", ".json"))
+                )
+        else:
+            expanded.append(spec)
+    return expanded
+
+
+class RecordFilter:
+    """Predicados sobre plataforma, ciudad (subcadena) y rango de fechas ISO."""
+
+    def __init__(self, plataforma=None, ciudad: str = None, desde: str = None, hasta: str = None,
+                 date_field: str = "fecha_scraping"):
+        self.plataformas = {plataforma} if isinstance(plataforma, str) else (set(plataforma) if plataforma else None)
+        self.ciudad = ciudad.lower() if ciudad else None
+        self.desde = desde
+        self.hasta = hasta
+        self.date_field = date_field
+
+    @property
+    def fields(self) -> List[str]:
+        fields = []
+        if self.plataformas:
+            fields.append("plataforma_origen")
+        if self.ciudad:
+            fields.append("empresa_ubicacion_exacta")
+        if self.desde or self.hasta:
+            fields.append(self.date_field)
+        return fields
+
+    def line_prefilter(self):
+        """Chequeo barato sobre bytes crudos antes de decodificar la línea.
+
+        Descarta líneas donde el valor buscado no aparece en absoluto; las
+        que pasan se verifican después sobre el registro decodificado.
+        """
+        checks = []  # (candidatos, comparar en minúsculas)
+        if self.plataformas:
+            checks.append(([form for value in self.plataformas for form in _encoded_forms(value)], False))
+        if self.ciudad and self.ciudad.isascii():
+            checks.append(([self.ciudad.encode("ascii")], True))
+        if not checks:
+            return None
+
+        def keep(line: bytes) -> bool:
+            lowered = None
+            for needles, lower in checks:
+                haystack = line
+                if lower:
+                    lowered = lowered if lowered is not None else line.lower()
+                    haystack = lowered
+                if not any(needle in haystack for needle in needles):
+                    return False
+            return True
+
+        return keep
+
+    def __call__(self, record: dict) -> bool:
+        if self.plataformas and _get(record, "plataforma_origen") not in self.plataformas:
+            return False
+        if self.ciudad and self.ciudad not in (_get(record, "empresa_ubicacion_exacta") or "").lower():
+            return False
+        if self.desde or self.hasta:
+            fecha = (_get(record, self.date_field) or "")[:10]
+            if not fecha:
+                return False
+            if self.desde and fecha < self.desde:
+                return False
+            if self.hasta and fecha > self.hasta:
+                return False
+        return True
+
+    def arrow_expression(self):
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        expression = None
+        conditions = []
+        if self.plataformas:
+            conditions.append(ds.field("plataforma_origen").isin(sorted(self.plataformas)))
+        if self.ciudad:
+            conditions.append(pc.match_substring(ds.field("empresa_ubicacion_exacta"), self.ciudad, ignore_case=True))
+        if self.desde:
+            conditions.append(ds.field(self.date_field) >= self.desde)
+        if self.hasta:
+            conditions.append(ds.field(self.date_field) <= self.hasta)
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+
+def _encoded_forms(value: str) -> List[bytes]:
+    forms = [value.encode("utf-8")]
+    escaped = json.dumps(value)[1:-1].encode("ascii")
+    if escaped != forms[0]:
+        forms.append(escaped)
+    return forms
+
+
+def _get(record: dict, name: str):
+    if name in record:
+        return record[name]
+    return record.get(_ENGLISH_NAMES.get(name, name))
+
+
+def _projected_decoder(columns: Optional[Sequence[str]]):
+    """Con msgspec, decodifica solo ``columns`` (los demás campos ni se construyen)."""
+    if not columns or not serialization.MSGSPEC_AVAILABLE:
+        return serialization.loads
+    import msgspec
+
+    names = list(dict.fromkeys(list(columns) + [_ENGLISH_NAMES[c] for c in columns if c in _ENGLISH_NAMES]))
+    decoder = msgspec.json.Decoder(msgspec.defstruct("Projection", [(name, Any, None) for name in names]))
+
+    def decode(line: bytes) -> dict:
+        obj = decoder.decode(line)
+        return {name: getattr(obj, name) for name in names}
+
+    return decode
+
+
+def _project(record: dict, columns: Optional[Sequence[str]]) -> dict:
+    if not columns:
+        return record
+    return {name: _get(record, name) for name in columns}
+
+
+def _iter_jsonl(path: Path, columns, record_filter: RecordFilter) -> Iterator[dict]:
+    decode_columns = list(dict.fromkeys(list(columns) + record_filter.fields)) if columns else None
+    decode = _projected_decoder(decode_columns)
+    prefilter = record_filter.line_prefilter()
+    with serialization.open_binary(path) as fp:
+        for line in fp:
+            if not line.strip():
+                continue
+            if prefilter is not None and not prefilter(line):
+                continue
+            record = decode(line)
+            if record_filter(record):
+                yield _project(record, columns)
+
+
+def _iter_json_array(path: Path, columns, record_filter: RecordFilter) -> Iterator[dict]:
+    # Un arreglo JSON no se puede leer por partes: se carga entero
+    for record in serialization.load_json(path):
+        if record_filter(record):
+            yield _project(record, columns)
+
+
+def _arrow_scanner(path: Path, columns, record_filter: RecordFilter, batch_size: int):
+    import pyarrow.dataset as ds
+
+    if path.is_dir():
+        dataset = JobDataset(path).dataset()
+    else:
+        dataset = ds.dataset(path, format="parquet")
+    return dataset.scanner(
+        columns=list(columns) if columns else None,
+        filter=record_filter.arrow_expression(),
+        batch_size=batch_size,
+    )
+
+
+def iter_batches(paths: PathSpec, columns: Optional[Sequence[str]] = None, batch_size: int = BATCH_SIZE,
+                 **filters) -> Iterator:
+    """Lotes Arrow (``RecordBatch``) de uno o varios archivos históricos.
+
+    En Parquet (archivo o dataset particionado) la proyección y los filtros
+    se empujan al scanner; en JSONL se aplica un prefiltro sobre los bytes
+    crudos antes de decodificar. Filtros: ``plataforma``, ``ciudad``,
+    ``desde``, ``hasta`` y ``date_field``.
+    """
+    import pyarrow as pa
+
+    record_filter = RecordFilter(**filters)
+    for path in expand_paths(paths):
+        if path.is_dir() or path.suffix == ".parquet":
+            yield from _arrow_scanner(path, columns, record_filter, batch_size).to_batches()
+            continue
+        records = _iter_file(path, columns, record_filter)
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= batch_size:
+                yield _to_batch(pa, chunk, columns)
+                chunk = []
+        if chunk:
+            yield _to_batch(pa, chunk, columns)
+
+
+def _to_batch(pa, chunk: List[dict], columns):
+    schema = arrow_schema()
+    if "cargo_titulo" in chunk[0] or (columns and all(name in schema.names for name in columns)):
+        fields = columns or schema.names
+        return pa.RecordBatch.from_pylist(chunk, schema=pa.schema([schema.field(name) for name in fields]))
+    return pa.RecordBatch.from_pylist(chunk)
+
+
+def _iter_file(path: Path, columns, record_filter: RecordFilter) -> Iterator[dict]:
+    if path.name.endswith(JSONL_SUFFIXES):
+        return _iter_jsonl(path, columns, record_filter)
+    return _iter_json_array(path, columns, record_filter)
+
+
+def iter_records(paths: PathSpec, columns: Optional[Sequence[str]] = None, **filters) -> Iterator[dict]:
+    """Registros (dicts) de uno o varios archivos históricos, sin cargarlos enteros.
+
+    Mismos filtros que ``iter_batches``. Con ``columns`` cada registro trae
+    solo esas claves.
+    """
+    record_filter = RecordFilter(**filters)
+    for path in expand_paths(paths):
+        if path.is_dir() or path.suffix == ".parquet":
+            for batch in _arrow_scanner(path, columns, record_filter, BATCH_SIZE).to_batches():
+                yield from batch.to_pylist()
+        else:
+            yield from _iter_file(path, columns, record_filter)
@@ -0,0 +1,180 @@
+import atexit
+import copy
+import gzip
+import logging
+import os
+import queue
+import random
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from utils import serialization
+
+
+CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+MAX_BYTES = 20 * 1024 * 1024
+BACKUP_COUNT = 10
+DEBUG_SAMPLE_RATE = 0.01
+
+# Atributos estándar de LogRecord; el resto viene de ``extra=`` y va al JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+_listener = None  # QueueListener activo
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro: ts, nivel, logger, mensaje y los campos de ``extra``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["excepcion"] = record.exc_text or self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["excepcion"] = record.exc_text
+        try:
+            return serialization.dumps(entry).decode("utf-8")
+        except (TypeError, ValueError):
+            # Un extra no serializable (Path, objeto propio...) va como texto, no tumba el registro
+            return serialization.dumps({key: _jsonable(value) for key, value in entry.items()}).decode("utf-8")
+
+
+def _jsonable(value):
+    try:
+        serialization.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _prepare(record: logging.LogRecord) -> logging.LogRecord:
+    """``QueueHandler.prepare`` sin perder la excepción.
+
+    El original mete la traza en el mensaje y borra ``exc_info``/``exc_text``,
+    así el ``JsonFormatter`` no podía escribir ``"excepcion"``. Aquí solo se
+    fija el mensaje (los ``args`` pueden cambiar antes de que el listener lo
+    formatee) y se precalcula el texto de la traza.
+    """
+    record = copy.copy(record)
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info and not record.exc_text:
+        record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+    return record
+
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class SamplingFilter(logging.Filter):
+    """Deja pasar solo una fracción de los registros marcados con ``extra={"sampled": True}``.
+
+    Pensado para el DEBUG por solicitud: con ``rate=0.01`` se ve una de cada
+    cien peticiones sin pagar el costo de formatearlas y escribirlas todas.
+    """
+
+    def __init__(self, rate: float = DEBUG_SAMPLE_RATE, seed: Optional[int] = None):
+        super().__init__()
+        self.rate = rate
+        self._rng = random.Random(seed)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        return self.rate > 0 and self._rng.random() < self.rate
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as src, gzip.open(dest, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def rotating_handler(log_file, max_bytes: int = MAX_BYTES, backups: int = BACKUP_COUNT,
+                     when: Optional[str] = None) -> logging.Handler:
+    """Handler de archivo con rotación por tamaño (o por tiempo con ``when``, p. ej. ``"midnight"``).
+
+    Los archivos rotados se comprimen con gzip (``scraper.log.1.gz``, ...).
+    """
+    # logging.handlers arrastra socket y pickle: se importa al configurar, no al arrancar
+    import logging.handlers
+
+    log_file = Path(log_file)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    if when:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=when, backupCount=backups, encoding="utf-8", delay=True,
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True,
+        )
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logging(log_file=None, level: int = logging.INFO, console: bool = True,
+                  json_lines: bool = True, sample_rate: float = DEBUG_SAMPLE_RATE,
+                  max_bytes: int = MAX_BYTES, backups: int = BACKUP_COUNT, when: Optional[str] = None):
+    """Configura el logger raíz con una cola: los hilos solo encolan y un hilo aparte escribe.
+
+    El archivo (JSON lines por defecto, con rotación y compresión) y la
+    consola cuelgan de un ``QueueListener``, así el formateo y la E/S de
+    disco quedan fuera del bucle de peticiones. Idempotente: una segunda
+    llamada reemplaza la configuración anterior.
+    """
+    import logging.handlers
+
+    global _listener
+    shutdown_logging()
+
+    handlers = []
+    if log_file is not None:
+        file_handler = rotating_handler(log_file, max_bytes, backups, when)
+        file_handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(file_handler)
+    if console:
+        stream = logging.StreamHandler()
+        stream.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(stream)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.prepare = _prepare
+    # El muestreo va antes de la cola: lo descartado no se formatea ni se encola
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Vacía la cola y cierra los handlers del listener (también corre al salir)."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
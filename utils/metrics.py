@@ -0,0 +1,236 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from utils import serialization
+from utils.stats import KLLSketch
+
+
+# Límites (segundos) de los buckets de latencia, al estilo de los clientes de Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+REPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Histogram:
+    """Buckets acumulativos (para Prometheus) más un sketch KLL para cuantiles en el reporte."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.sketch = KLLSketch()
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.sketch.update(value)
+
+    def to_dict(self) -> dict:
+        quantiles = self.sketch.quantiles(REPORT_QUANTILES)
+        return {
+            "n": self.count,
+            "suma": round(self.sum, 6),
+            "promedio": round(self.sum / self.count, 6) if self.count else None,
+            "max": self.sketch.max,
+            **{f"p{int(q * 100)}": value for q, value in zip(REPORT_QUANTILES, quantiles)},
+        }
+
+
+class _Family:
+    def __init__(self, kind: str, help_text: str, buckets=None):
+        self.kind = kind
+        self.help = help_text
+        self.buckets = buckets
+        self.series: Dict[Labels, object] = {}
+
+
+class MetricsRegistry:
+    """Contadores e histogramas con etiquetas, seguros entre hilos.
+
+    Los scrapers y las etapas del pipeline registran aquí latencias, bytes,
+    reintentos y tiempos; al final de la corrida se exporta en formato de
+    texto de Prometheus (``write_prometheus``) y como reporte JSON
+    (``write_report``).
+    """
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def _family(self, name: str, kind: str, help_text: str, buckets=None) -> _Family:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families.setdefault(name, _Family(kind, help_text, buckets))
+        elif family.kind != kind:
+            raise ValueError(f"La métrica {name} ya existe como {family.kind}")
+        return family
+
+    def inc(self, name: str, amount: float = 1, help: str = "", **labels):
+        with self._lock:
+            series = self._family(name, "counter", help).series
+            key = _labels(labels)
+            counter = series.get(key)
+            if counter is None:
+                counter = series[key] = Counter()
+            counter.inc(amount)
+
+    def observe(self, name: str, value: float, help: str = "", buckets: Sequence[float] = LATENCY_BUCKETS,
+                **labels):
+        with self._lock:
+            family = self._family(name, "histogram", help, buckets)
+            key = _labels(labels)
+            histogram = family.series.get(key)
+            if histogram is None:
+                histogram = family.series[key] = Histogram(family.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, help: str = "", **labels):
+        """Mide la duración (segundos) del bloque en el histograma ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, help, **labels)
+
+    @contextmanager
+    def stage(self, name: str, records: Optional[int] = None):
+        """Cronometra una etapa del pipeline.
+
+        Se le puede asignar ``records`` al objeto que devuelve para saber
+        cuántos registros procesó; el reporte calcula registros/s por etapa.
+        """
+        info = _StageInfo(records)
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.observe("pipeline_stage_seconds", time.perf_counter() - start,
+                         "Duración de cada etapa del pipeline", stage=name)
+            if info.records is not None:
+                self.inc("pipeline_stage_records_total", info.records,
+                         "Registros procesados por etapa", stage=name)
+
+    def value(self, name: str, **labels) -> float:
+        """Valor de un contador (o número de observaciones de un histograma)."""
+        family = self._families.get(name)
+        if family is None:
+            return 0
+        if labels:
+            metrics = [family.series.get(_labels(labels))]
+        else:
+            metrics = family.series.values()
+        return sum((m.value if family.kind == "counter" else m.count) for m in metrics if m is not None)
+
+    def reset(self):
+        with self._lock:
+            self._families.clear()
+            self.started = time.time()
+
+    # ── Exportación ───────────────────────────────────────────────
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, family in sorted(self._families.items()):
+                if family.help:
+                    lines.append(f"# HELP {name} {family.help}")
+                lines.append(f"# TYPE {name} {family.kind}")
+                for labels, metric in sorted(family.series.items()):
+                    if family.kind == "counter":
+                        lines.append(f"{name}{_format_labels(labels)} {_number(metric.value)}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), metric.counts):
+                        cumulative += count
+                        le = (("le", _number(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_number(metric.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        """Reporte de la corrida: contadores, histogramas (con cuantiles) y registros/s por etapa."""
+        metrics = {}
+        with self._lock:
+            for name, family in sorted(self._families.items()):
+                series = []
+                for labels, metric in sorted(family.series.items()):
+                    value = metric.value if family.kind == "counter" else metric.to_dict()
+                    series.append({"etiquetas": dict(labels), "valor": value})
+                metrics[name] = {"tipo": family.kind, "series": series}
+
+        stages = {}
+        for entry in metrics.get("pipeline_stage_seconds", {}).get("series", []):
+            stage = entry["etiquetas"]["stage"]
+            seconds = entry["valor"]["suma"]
+            records = self.value("pipeline_stage_records_total", stage=stage)
+            stages[stage] = {
+                "segundos": seconds,
+                "registros": int(records),
+                "registros_por_s": round(records / seconds, 1) if seconds and records else None,
+            }
+
+        return {
+            "inicio": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "duracion_s": round(time.time() - self.started, 3),
+            "etapas": dict(sorted(stages.items(), key=lambda item: -item[1]["segundos"])),
+            "metricas": metrics,
+        }
+
+    def write_prometheus(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+    def write_report(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(serialization.dumps(self.to_dict(), indent=True))
+        return path
+
+
+class _StageInfo:
+    def __init__(self, records: Optional[int] = None):
+        self.records = records
+
+
+# Registro por defecto del proceso, como el logger raíz de ``logging``
+registry = MetricsRegistry()
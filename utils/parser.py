@@ -2,6 +2,7 @@ import re
 from typing import Optional, Tuple
 
 from config import settings
+from utils.text import TextLike, normalize
 
 
 def parse_salary(salary_text: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
@@ -39,11 +40,12 @@ def _convert_to_number(value: str, context: str) -> float:
     return num
 
 
-def parse_experience(text: str) -> Optional[int]:
+def parse_experience(text: TextLike) -> Optional[int]:
+    text = normalize(text)
     if not text:
         return None
     
-    text_lower = text.lower()
+    text_lower = text.lower
     
     years_match = re.search(r'(\d+)\s*(?:año|year)', text_lower)
     if years_match:
@@ -65,33 +67,35 @@ def parse_experience(text: str) -> Optional[int]:
     return None
 
 
-def parse_education(text: str) -> str:
+def parse_education(text: TextLike) -> str:
+    text = normalize(text)
     if not text:
         return ""
     
-    text_lower = text.lower()
+    text_folded = text.folded
     
-    if "doctorado" in text_lower or "phd" in text_lower:
+    if "doctorado" in text_folded or "phd" in text_folded:
         return "Doctorado"
-    elif "posgrado" in text_lower or "maestría" in text_lower or "maestria" in text_lower or "master" in text_lower:
+    elif "posgrado" in text_folded or "maestria" in text_folded or "master" in text_folded:
         return "Posgrado"
-    elif "pregrado" in text_lower or "universidad" in text_lower or "licenciatura" in text_lower:
+    elif "pregrado" in text_folded or "universidad" in text_folded or "licenciatura" in text_folded:
         return "Pregrado"
-    elif "tecnólogo" in text_lower or "tecnologo" in text_lower:
+    elif "tecnologo" in text_folded:
         return "Tecnólogo"
-    elif "técnico" in text_lower or "tecnico" in text_lower:
+    elif "tecnico" in text_folded:
         return "Técnico"
-    elif "bachillerato" in text_lower or "bachiller" in text_lower:
+    elif "bachiller" in text_folded:
         return "Bachillerato"
     
     return ""
 
 
-def extract_skills(text: str) -> Tuple[list, list]:
+def extract_skills(text: TextLike) -> Tuple[list, list]:
+    text = normalize(text)
     if not text:
         return [], []
     
-    text_lower = text.lower()
+    text_lower = text.lower
     
     tech_skills = [
         "python", "java", "javascript", "typescript", "c#", "c++", "c ", "ruby", "go", "rust",
@@ -147,11 +151,12 @@ def normalize_company_name(name: str) -> str:
     return name
 
 
-def normalize_sector(sector: str) -> str:
+def normalize_sector(sector: TextLike) -> str:
+    sector = normalize(sector)
     if not sector:
         return ""
     
-    sector_lower = sector.lower()
+    sector_lower = sector.lower
     
     sector_mapping = {
         "tecnología": "Tecnología",
@@ -206,17 +211,18 @@ def normalize_sector(sector: str) -> str:
         if key in sector_lower:
             return value
     
-    return sector
+    return sector.raw
 
 
-def normalize_location(location: str) -> str:
+def normalize_location(location: TextLike) -> str:
+    location = normalize(location)
     if not location:
         return ""
     
-    location_lower = location.lower()
+    location_lower = location.lower
     
     for city in settings.CITIES_ANTIOQUIA:
         if city.lower() in location_lower:
             return city
     
-    return location
+    return location.raw
@@ -0,0 +1,192 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils import serialization
+from utils.metrics import MetricsRegistry, registry as default_registry
+
+
+TOP_ALLOCATIONS = 15
+TOP_FUNCTIONS = 15
+
+# Métrica (y etiqueta opcional) -> categoría del desglose de tiempo de pared
+_BREAKDOWN = {
+    "red": [("http_request_seconds", None)],
+    "parseo": [("html_parse_seconds", None), ("parse_page_seconds", None)],
+    "normalizacion": [("pipeline_stage_seconds", "normalize")],
+    "deduplicacion": [("pipeline_stage_seconds", "dedupe")],
+    "validacion": [("pipeline_stage_seconds", "validate")],
+    "exportacion": [("pipeline_stage_seconds", stage) for stage in ("export", "store", "search_index")],
+}
+
+
+def _calibration_workload():
+    # Mezcla representativa de llamadas Python cortas: dicts, strings y JSON
+    records = [{"cargo_titulo": f"Desarrollador {i}", "salario": i * 1000, "skills": ["python", "sql"]}
+               for i in range(3000)]
+    total = 0
+    for record in records:
+        encoded = serialization.dumps(record)
+        total += len(serialization.loads(encoded)["cargo_titulo"].lower().split())
+    return total
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+class RunProfiler:
+    """Perfilado de una corrida de ``main.py`` (``--profile``).
+
+    Cada sección (una por plataforma y otra para el procesamiento posterior)
+    tiene su propio cProfile, guardado como ``<sección>.prof`` (se abre con
+    snakeviz o ``pstats``). tracemalloc registra el pico de memoria por
+    sección y los sitios que más asignan. ``finish`` escribe ``perfil.json``
+    con eso, el desglose de tiempo de pared (red, parseo, exportación...)
+    tomado del registro de métricas y una estimación de la sobrecarga que
+    añade el propio perfilado. cProfile solo ve el hilo que abre la sección
+    (el principal); los escritores en paralelo de la exportación cuentan en
+    el desglose pero no en los ``.prof``.
+    """
+
+    def __init__(self, out_dir, memory: bool = True, registry: MetricsRegistry = None):
+        self.out_dir = Path(out_dir)
+        self.memory = memory
+        self.registry = registry or default_registry
+        self.sections: Dict[str, dict] = {}
+        self._current = None
+        self._started = time.perf_counter()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def begin(self, name: str):
+        if self._current is not None:
+            self.end()
+        profile = cProfile.Profile()
+        if self.memory:
+            tracemalloc.reset_peak()
+        self._current = (name, profile, time.perf_counter(), time.process_time())
+        profile.enable()
+
+    def end(self):
+        if self._current is None:
+            return
+        name, profile, wall_start, cpu_start = self._current
+        profile.disable()
+        self._current = None
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / f"{name}.prof"
+        profile.dump_stats(path)
+
+        section = self.sections.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "pico_memoria_mb": 0.0})
+        section["wall_s"] = round(section["wall_s"] + time.perf_counter() - wall_start, 3)
+        section["cpu_s"] = round(section["cpu_s"] + time.process_time() - cpu_start, 3)
+        section["perfil"] = str(path)
+        section["funciones"] = self._top_functions(profile)
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            section["pico_memoria_mb"] = round(max(section["pico_memoria_mb"], peak), 2)
+
+    @contextmanager
+    def section(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    @staticmethod
+    def _top_functions(profile: cProfile.Profile) -> List[dict]:
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"funcion": f"{Path(filename).name}:{line}({function})", "llamadas": calls,
+                         "tottime_s": round(tottime, 4), "cumtime_s": round(cumtime, 4)})
+        rows.sort(key=lambda row: -row["cumtime_s"])
+        return rows[:TOP_FUNCTIONS]
+
+    def _top_allocations(self) -> List[dict]:
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, pstats.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        return [
+            {"sitio": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             "kb": round(stat.size / 1024, 1), "bloques": stat.count}
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        ]
+
+    def breakdown(self) -> Dict[str, float]:
+        """Segundos de pared por categoría, sumando los histogramas del registro de métricas.
+
+        Con varios hilos de red la suma puede superar el tiempo de pared total.
+        """
+        metrics = self.registry.to_dict()["metricas"]
+        result = {}
+        for category, sources in _BREAKDOWN.items():
+            seconds = 0.0
+            for name, stage in sources:
+                for entry in metrics.get(name, {}).get("series", []):
+                    if stage is None or entry["etiquetas"].get("stage") == stage:
+                        seconds += entry["valor"]["suma"]
+            result[category] = round(seconds, 3)
+        return result
+
+    def overhead(self) -> dict:
+        """Mide la carga de calibración sin y con cProfile (+ tracemalloc) activos."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.stop()
+        _calibration_workload()  # calentamiento
+        plain = min(_timed(_calibration_workload) for _ in range(3))
+
+        if self.memory:
+            tracemalloc.start(10)
+        profile = cProfile.Profile()
+        profile.enable()
+        profiled = min(_timed(_calibration_workload) for _ in range(3))
+        profile.disable()
+        if not self.memory and tracing:
+            tracemalloc.start(10)
+
+        return {
+            "sin_perfil_s": round(plain, 4),
+            "con_perfil_s": round(profiled, 4),
+            "factor": round(profiled / plain, 2) if plain else None,
+        }
+
+    def finish(self, path: Optional[Path] = None) -> dict:
+        self.end()
+        total = time.perf_counter() - self._started
+        allocations = self._top_allocations()
+        peaks = [section["pico_memoria_mb"] for section in self.sections.values()]
+        peak = max(peaks) if self.memory and peaks else None
+        report = {
+            "wall_total_s": round(total, 3),
+            "secciones": self.sections,
+            "desglose_s": self.breakdown(),
+            "pico_memoria_mb": peak,
+            "asignaciones": allocations,
+            "sobrecarga": self.overhead(),
+        }
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        path = Path(path or self.out_dir / "perfil.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(serialization.dumps(report, indent=True))
+        report["ruta"] = str(path)
+        return report
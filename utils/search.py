@@ -0,0 +1,251 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config import settings
+from utils import serialization
+from utils.parser import normalize_location
+from utils.store import ESTADO_ACTIVA, storage_key
+from utils.text import normalize
+
+
+# Pesos BM25 por columna: el título pesa más que la empresa y la descripción
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+FACET_COLUMNS = ("plataforma_origen", "ciudad", "cargo_modalidad", "cargo_area", "cargo_nivel")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documentos (
+    id INTEGER PRIMARY KEY,
+    clave TEXT NOT NULL UNIQUE,
+    cargo_titulo TEXT,
+    empresa_nombre TEXT,
+    descripcion TEXT,
+    plataforma_origen TEXT,
+    ciudad TEXT,
+    cargo_modalidad TEXT,
+    cargo_area TEXT,
+    cargo_nivel TEXT,
+    fecha_publicacion TEXT,
+    estado_oferta TEXT NOT NULL DEFAULT 'Activa',
+    datos BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_documentos_ciudad ON documentos (ciudad);
+CREATE INDEX IF NOT EXISTS ix_documentos_modalidad ON documentos (cargo_modalidad);
+CREATE INDEX IF NOT EXISTS ix_documentos_area ON documentos (cargo_area);
+CREATE INDEX IF NOT EXISTS ix_documentos_fecha ON documentos (fecha_publicacion);
+CREATE INDEX IF NOT EXISTS ix_documentos_estado ON documentos (estado_oferta);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS documentos_fts USING fts5(
+    cargo_titulo, empresa_nombre, descripcion,
+    content='documentos', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2"
+);
+
+-- Mantiene el índice invertido sincronizado con la tabla de contenido
+CREATE TRIGGER IF NOT EXISTS documentos_ai AFTER INSERT ON documentos BEGIN
+    INSERT INTO documentos_fts (rowid, cargo_titulo, empresa_nombre, descripcion)
+    VALUES (new.id, new.cargo_titulo, new.empresa_nombre, new.descripcion);
+END;
+CREATE TRIGGER IF NOT EXISTS documentos_ad AFTER DELETE ON documentos BEGIN
+    INSERT INTO documentos_fts (documentos_fts, rowid, cargo_titulo, empresa_nombre, descripcion)
+    VALUES ('delete', old.id, old.cargo_titulo, old.empresa_nombre, old.descripcion);
+END;
+CREATE TRIGGER IF NOT EXISTS documentos_au AFTER UPDATE ON documentos BEGIN
+    INSERT INTO documentos_fts (documentos_fts, rowid, cargo_titulo, empresa_nombre, descripcion)
+    VALUES ('delete', old.id, old.cargo_titulo, old.empresa_nombre, old.descripcion);
+    INSERT INTO documentos_fts (rowid, cargo_titulo, empresa_nombre, descripcion)
+    VALUES (new.id, new.cargo_titulo, new.empresa_nombre, new.descripcion);
+END;
+"""
+
+# Filtros de rango (mismo significado que en JobStore.query)
+_RANGES = {
+    "desde": "d.fecha_publicacion >= ?",
+    "hasta": "d.fecha_publicacion <= ?",
+}
+
+ORDER_RELEVANCE = "relevancia"
+ORDER_DATE = "fecha_publicacion"
+
+_COLUMNS = (
+    "clave", "cargo_titulo", "empresa_nombre", "descripcion", "plataforma_origen", "ciudad",
+    "cargo_modalidad", "cargo_area", "cargo_nivel", "fecha_publicacion", "estado_oferta", "datos",
+)
+
+_UPSERT = (
+    f"INSERT INTO documentos ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    "ON CONFLICT(clave) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS if column != "clave")
+)
+
+
+def match_expression(text: str) -> Optional[str]:
+    """Consulta libre -> expresión MATCH de FTS5.
+
+    Se tokeniza igual que el índice (minúsculas, sin tildes) y cada término
+    se busca como prefijo, así "desarrolla pyth" encuentra "Desarrollador
+    Python". Los términos se combinan con AND.
+    """
+    tokens = normalize(text).tokens
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class SearchIndex:
+    """Índice de texto completo (SQLite FTS5) sobre título, empresa y descripción.
+
+    Se construye de forma incremental: ``add`` inserta o reemplaza por la
+    misma clave que ``JobStore``.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.DATA_DIR / "busqueda.db")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO documentos_fts (documentos_fts, rank) VALUES ('rank', ?)", (f"bm25({weights})",),
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row(self, job: dict) -> tuple:
+        return (
+            storage_key(job),
+            job.get("cargo_titulo", ""),
+            job.get("empresa_nombre", ""),
+            job.get("descripcion", ""),
+            job.get("plataforma_origen", ""),
+            normalize_location(job.get("empresa_ubicacion_exacta", "")),
+            job.get("cargo_modalidad", ""),
+            job.get("cargo_area", ""),
+            job.get("cargo_nivel", ""),
+            job.get("fecha_publicacion", ""),
+            job.get("estado_oferta") or ESTADO_ACTIVA,
+            serialization.dumps(job),
+        )
+
+    def add(self, jobs: Iterable[dict], batch_size: int = 1000) -> int:
+        count = 0
+        batch = []
+        with self.conn:
+            for job in jobs:
+                if not storage_key(job):
+                    continue
+                batch.append(self._row(job))
+                if len(batch) >= batch_size:
+                    self.conn.executemany(_UPSERT, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(_UPSERT, batch)
+                count += len(batch)
+        return count
+
+    def remove(self, claves: Iterable[str]) -> int:
+        with self.conn:
+            cursor = self.conn.executemany("DELETE FROM documentos WHERE clave = ?", [(clave,) for clave in claves])
+        return cursor.rowcount
+
+    def set_estado(self, claves: Iterable[str], estado: str) -> int:
+        """Actualiza el estado de ofertas ya indexadas (p. ej. las que ``JobStore`` cerró)."""
+        with self.conn:
+            cursor = self.conn.executemany(
+                "UPDATE documentos SET estado_oferta = ? WHERE clave = ?", [(estado, clave) for clave in claves],
+            )
+        return cursor.rowcount
+
+    def optimize(self):
+        """Fusiona los segmentos del índice (conviene tras cargas grandes)."""
+        with self.conn:
+            self.conn.execute("INSERT INTO documentos_fts (documentos_fts) VALUES ('optimize')")
+
+    def _where(self, text: Optional[str], filters: Dict[str, Optional[str]]):
+        clauses, params = [], []
+        expression = match_expression(text) if text else None
+        if expression:
+            clauses.append("documentos_fts MATCH ?")
+            params.append(expression)
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if column in _RANGES:
+                clauses.append(_RANGES[column])
+                params.append(value)
+                continue
+            if column == "estado":
+                column = "estado_oferta"
+            elif column not in FACET_COLUMNS:
+                raise ValueError(f"Faceta desconocida: {column}")
+            clauses.append(f"d.{column} = ?")
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        source = "documentos_fts JOIN documentos d ON d.id = documentos_fts.rowid" if expression else "documentos d"
+        return source, where, params, bool(expression)
+
+    def search(self, text: str = None, limit: int = 20, offset: int = 0, order_by: str = None,
+               **filters) -> List[dict]:
+        """Ofertas que contienen todos los términos de ``text``, por relevancia BM25.
+
+        ``filters`` son igualdades sobre ``FACET_COLUMNS`` (p. ej.
+        ``ciudad="Medellín", cargo_modalidad="Remoto"``), ``estado``
+        (``"Activa"``, ``"Cerrada"``; ``None`` = todas) y ``desde``/``hasta``
+        sobre la fecha de publicación. ``order_by`` es ``"relevancia"`` (por
+        defecto con texto) o ``"fecha_publicacion"`` (por defecto sin texto).
+        Cada resultado trae ``puntaje`` (más alto = más relevante).
+        """
+        source, where, params, ranked = self._where(text, filters)
+        order_by = order_by or (ORDER_RELEVANCE if ranked else ORDER_DATE)
+        if order_by not in (ORDER_RELEVANCE, ORDER_DATE):
+            raise ValueError(f"Orden no soportado en la búsqueda: {order_by}")
+        score = "-documentos_fts.rank" if ranked else "0.0"
+        if ranked and order_by == ORDER_RELEVANCE and not any(value is not None for value in filters.values()):
+            # Solo texto: FTS5 ordena por rank y corta antes de tocar la tabla de contenido
+            sql = ("SELECT d.datos, -r.rank AS puntaje FROM ("
+                   "SELECT rowid, rank FROM documentos_fts WHERE documentos_fts MATCH ? "
+                   "ORDER BY rank LIMIT ? OFFSET ?) r JOIN documentos d ON d.id = r.rowid "
+                   "ORDER BY r.rank")
+        elif ranked and order_by == ORDER_RELEVANCE:
+            sql = (f"SELECT d.datos, {score} AS puntaje FROM {source}{where} "
+                   f"ORDER BY documentos_fts.rank LIMIT ? OFFSET ?")
+        else:
+            sql = (f"SELECT d.datos, {score} AS puntaje FROM {source}{where} "
+                   f"ORDER BY d.fecha_publicacion DESC LIMIT ? OFFSET ?")
+
+        results = []
+        for row in self.conn.execute(sql, params + [limit, offset]):
+            job = serialization.loads(row["datos"])
+            job["puntaje"] = row["puntaje"]
+            results.append(job)
+        return results
+
+    def count(self, text: str = None, **filters) -> int:
+        source, where, params, _ = self._where(text, filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+
+    def facets(self, text: str = None, columns=FACET_COLUMNS, **filters) -> Dict[str, Dict[str, int]]:
+        """Conteo por valor de cada faceta sobre los resultados de la búsqueda."""
+        source, where, params, _ = self._where(text, filters)
+        result = {}
+        for column in columns:
+            rows = self.conn.execute(
+                f"SELECT d.{column} AS valor, COUNT(*) AS n FROM {source}{where} "
+                f"GROUP BY d.{column} ORDER BY n DESC",
+                params,
+            )
+            result[column] = {row["valor"]: row["n"] for row in rows if row["valor"]}
+        return result
@@ -0,0 +1,137 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from config import settings
+from utils import serialization
+from utils.metrics import registry as metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Peso de la historia frente a la corrida actual al guardar (decae por corrida)
+DECAY = 0.8
+# Intentos acumulados antes de confiar en la tasa para reordenar o alertar
+MIN_TRIALS = 20
+# Alerta si el selector principal cae por debajo de esta fracción de su tasa histórica
+ALERT_RATIO = 0.5
+ALERT_MIN_HISTORY = 0.6
+# Los fallbacks solo se prueban cuando falla el anterior: su tasa es condicional
+# y uno genérico ("h2 a") puede rozar el 100% en esos pocos casos. Por eso el
+# principal declarado solo cede el primer puesto si su propia tasa (que sí es
+# incondicional mientras va primero) cae por debajo de esto.
+PROMOTE_BELOW = 0.5
+
+
+def _rate(entry: dict) -> float:
+    # Suavizado de Laplace: un selector sin datos queda en 0.5, no en 0 ni en 1
+    return (entry.get("hits", 0) + 1) / (entry.get("hits", 0) + entry.get("misses", 0) + 2)
+
+
+def _trials(entry: dict) -> float:
+    return entry.get("hits", 0) + entry.get("misses", 0)
+
+
+class SelectorStats:
+    """Aciertos/fallos por selector CSS, persistidos entre corridas.
+
+    ``order`` devuelve la cadena en el orden declarado mientras el selector
+    principal siga acertando (``PROMOTE_BELOW``); si se desploma, la ordena
+    por tasa de acierto histórica (la declarada desempata), así el selector
+    que de verdad funciona se prueba primero. ``check`` compara
+    la tasa de esta corrida del primer selector de cada cadena con su
+    histórico y alerta cuando se desploma, señal típica de un cambio de
+    maquetado en el portal.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.DATA_DIR / "state" / "selectores.json")
+        self.history: Dict[str, Dict[str, Dict[str, dict]]] = {}
+        self.run: Dict[str, Dict[str, Dict[str, dict]]] = {}
+        self._orders: Dict[Tuple[str, str, tuple], tuple] = {}
+        self._primary: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.history = serialization.loads(self.path.read_bytes())
+
+    def order(self, scraper: str, field: str, chain: Tuple[str, ...]) -> tuple:
+        key = (scraper, field, chain)
+        ordered = self._orders.get(key)
+        if ordered is None:
+            stats = self.history.get(scraper, {}).get(field, {})
+            primary = stats.get(chain[0], {})
+            if _trials(primary) < MIN_TRIALS or _rate(primary) >= PROMOTE_BELOW:
+                ordered = tuple(chain)
+            else:
+                ranked = [
+                    (-_rate(stats[selector]) if _trials(stats.get(selector, {})) >= MIN_TRIALS else -0.5,
+                     position, selector)
+                    for position, selector in enumerate(chain)
+                ]
+                ordered = tuple(selector for _, _, selector in sorted(ranked))
+            self._orders[key] = ordered
+            self._primary[(scraper, field)] = ordered[0]
+        return ordered
+
+    def record(self, scraper: str, field: str, selector: str, hit: bool):
+        with self._lock:
+            entry = self.run.setdefault(scraper, {}).setdefault(field, {}).setdefault(
+                selector, {"hits": 0, "misses": 0},
+            )
+            entry["hits" if hit else "misses"] += 1
+
+    def check(self, scraper: str) -> List[dict]:
+        """Selectores principales cuya tasa en esta corrida se desplomó respecto al histórico."""
+        alerts = []
+        for field, selectors in self.run.get(scraper, {}).items():
+            # El primero de la cadena tal como se usó en esta corrida
+            primary = self._primary.get((scraper, field))
+            current = selectors.get(primary)
+            past = self.history.get(scraper, {}).get(field, {}).get(primary)
+            if not current or not past or _trials(current) < MIN_TRIALS or _trials(past) < MIN_TRIALS:
+                continue
+            before, now = past["hits"] / _trials(past), current["hits"] / _trials(current)
+            if before >= ALERT_MIN_HISTORY and now < before * ALERT_RATIO:
+                alert = {"scraper": scraper, "campo": field, "selector": primary,
+                         "tasa_historica": round(before, 3), "tasa_actual": round(now, 3)}
+                alerts.append(alert)
+                metrics.inc("selector_alerts_total", help="Primary selectors whose hit rate collapsed",
+                            scraper=scraper, field=field)
+                logger.warning(
+                    f"{scraper}: el selector principal de '{field}' ({primary}) acertó {now:.0%} "
+                    f"vs {before:.0%} histórico; ¿cambió el HTML del portal?"
+                )
+        return alerts
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Tasa de acierto por scraper/campo/selector en esta corrida."""
+        return {
+            scraper: {
+                field: {selector: round(entry["hits"] / _trials(entry), 3)
+                        for selector, entry in selectors.items() if _trials(entry)}
+                for field, selectors in fields.items()
+            }
+            for scraper, fields in self.run.items()
+        }
+
+    def save(self):
+        """Combina la corrida con el histórico (con decaimiento) y lo escribe."""
+        with self._lock:
+            for scraper, fields in self.run.items():
+                for field, selectors in fields.items():
+                    past = self.history.setdefault(scraper, {}).setdefault(field, {})
+                    for selector in set(past) | set(selectors):
+                        old = past.get(selector, {})
+                        new = selectors.get(selector, {})
+                        past[selector] = {
+                            name: round(old.get(name, 0) * DECAY + new.get(name, 0), 2)
+                            for name in ("hits", "misses")
+                        }
+            self.run = {}
+            self._orders = {}
+            self._primary = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(serialization.dumps(self.history, indent=True))
+        tmp.replace(self.path)
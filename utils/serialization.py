@@ -0,0 +1,191 @@
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, List, Optional, Union
+
+from utils.text import TEXT_CACHE_KEY
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+PathLike = Union[str, Path]
+
+WRITE_BUFFER_SIZE = 1 << 20
+WRITE_BATCH_SIZE = 1000
+
+
+def _default(obj: Any):
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _strip(obj: Any) -> Any:
+    # El caché de texto normalizado (utils.text) nunca se serializa
+    if isinstance(obj, dict):
+        if TEXT_CACHE_KEY in obj:
+            return {key: value for key, value in obj.items() if key != TEXT_CACHE_KEY}
+    elif isinstance(obj, list) and any(isinstance(item, dict) and TEXT_CACHE_KEY in item for item in obj):
+        return [_strip(item) for item in obj]
+    return obj
+
+
+class _StdlibBackend:
+    name = "json"
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(
+            _strip(obj), ensure_ascii=False, indent=2 if indent else None, default=_default,
+        ).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class _OrjsonBackend:
+    name = "orjson"
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(_strip(obj), default=_default, option=option)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class _MsgspecBackend:
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        data = self._encoder.encode(_strip(obj))
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+def get_backend(name: Optional[str] = None):
+    """Backend JSON: el pedido, o el más rápido instalado (orjson > msgspec > json)."""
+    if name == "json":
+        return _StdlibBackend()
+    if name == "orjson" or (name is None and ORJSON_AVAILABLE):
+        return _OrjsonBackend()
+    if name == "msgspec" or (name is None and MSGSPEC_AVAILABLE):
+        return _MsgspecBackend()
+    return _StdlibBackend()
+
+
+backend = get_backend()
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    return backend.dumps(obj, indent=indent)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return backend.loads(data)
+
+
+def write_jsonl(records: Iterable[Any], fp: IO[bytes], batch_size: int = WRITE_BATCH_SIZE) -> int:
+    """Escribe ``records`` como JSONL en un archivo binario, en lotes. Devuelve el conteo."""
+    encode = backend.dumps
+    count = 0
+    batch = []
+    for record in records:
+        batch.append(encode(record))
+        if len(batch) >= batch_size:
+            fp.write(b"\n".join(batch) + b"\n")
+            count += len(batch)
+            batch = []
+    if batch:
+        fp.write(b"\n".join(batch) + b"\n")
+        count += len(batch)
+    return count
+
+
+def dump_jsonl(records: Iterable[Any], path: PathLike, batch_size: int = WRITE_BATCH_SIZE) -> int:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as fp:
+        return write_jsonl(records, fp, batch_size=batch_size)
+
+
+def open_binary(path: PathLike) -> IO[bytes]:
+    """Abre para lectura binaria, descomprimiendo .gz y .zst según la extensión."""
+    name = str(path)
+    if name.endswith(".gz"):
+        return gzip.open(name, "rb")
+    if name.endswith(".zst"):
+        import zstandard
+        reader = zstandard.ZstdDecompressor().stream_reader(open(name, "rb"), closefd=True)
+        return io.BufferedReader(reader, buffer_size=WRITE_BUFFER_SIZE)
+    return open(name, "rb", buffering=WRITE_BUFFER_SIZE)
+
+
+def iter_jsonl(path: PathLike, decode=None) -> Iterator[Any]:
+    """Itera los registros de un JSONL (plano, .gz o .zst), omitiendo líneas vacías.
+
+    ``decode`` sustituye a ``loads`` (p. ej. ``posting_decoder()`` para obtener
+    ``JobPosting`` directamente).
+    """
+    decode = decode or backend.loads
+    with open_binary(path) as fp:
+        for line in fp:
+            if line.strip():
+                yield decode(line)
+
+
+def load_jsonl(path: PathLike, decode=None) -> List[Any]:
+    return list(iter_jsonl(path, decode=decode))
+
+
+def dump_json(obj: Any, path: PathLike, indent: bool = False) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fp:
+        fp.write(backend.dumps(obj, indent=indent))
+    return path
+
+
+def load_json(path: PathLike) -> Any:
+    with open(path, "rb") as fp:
+        return backend.loads(fp.read())
+
+
+def posting_decoder():
+    """Decoder de una línea JSON directamente a ``JobPosting``.
+
+    Con msgspec la validación y construcción ocurren en C; si no, se decodifica
+    a dict y se construye el dataclass ignorando claves desconocidas.
+    """
+    from data_schema import JobPosting
+
+    if MSGSPEC_AVAILABLE:
+        return msgspec.json.Decoder(JobPosting).decode
+
+    fields = set(JobPosting.__dataclass_fields__)
+
+    def decode(data):
+        raw = backend.loads(data)
+        return JobPosting(**{key: value for key, value in raw.items() if key in fields})
+
+    return decode
@@ -0,0 +1,250 @@
+import csv
+import gzip
+import io
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from data_schema import JOB_FIELD_NAMES, arrow_schema, arrow_table
+from utils import serialization
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+CHUNK_SIZE = 5000
+
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def chunked(records: Iterable, size: int = CHUNK_SIZE) -> Iterator[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def compressed_path(path, compression: Optional[str]) -> Path:
+    path = Path(path)
+    suffix = COMPRESSION_SUFFIXES[compression]
+    return path if not suffix or path.name.endswith(suffix) else path.with_name(path.name + suffix)
+
+
+class AtomicSink(ABC):
+    """Archivo que se escribe en un temporal del mismo directorio y se publica
+    con ``os.replace`` al confirmar. Si hay una excepción dentro del ``with``
+    el temporal se borra y el destino queda intacto.
+    """
+
+    def __init__(self, path, compression: Optional[str] = None):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Compresión no soportada: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard no está instalado")
+        self.compression = compression
+        self.path = compressed_path(path, compression)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self.count = 0
+        self.bytes_written = 0
+        self._raw = None
+        self._stream = None
+
+    def open(self):
+        self._raw = open(self.tmp_path, "wb", buffering=serialization.WRITE_BUFFER_SIZE)
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        return self
+
+    @abstractmethod
+    def write(self, records: List[dict]):
+        """Escribe un lote de registros."""
+
+    def write_all(self, records: Iterable[dict], chunk_size: int = CHUNK_SIZE) -> int:
+        for chunk in chunked(records, chunk_size):
+            self.write(chunk)
+        return self.count
+
+    def write_table(self, table, chunk_size: int = CHUNK_SIZE) -> int:
+        """Escribe una tabla Arrow por lotes de ``chunk_size`` filas."""
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            self.write(table.from_batches([batch]))
+        return self.count
+
+    def _close_streams(self):
+        if self._stream is not None and self._stream is not self._raw:
+            self._stream.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+
+    def commit(self) -> Path:
+        self._close_streams()
+        os.replace(self.tmp_path, self.path)
+        self.bytes_written = self.path.stat().st_size
+        return self.path
+
+    def abort(self):
+        try:
+            self._close_streams()
+        finally:
+            if self.tmp_path.exists():
+                self.tmp_path.unlink()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+class JsonlSink(AtomicSink):
+    def write(self, records: List[dict]):
+        self.count += serialization.write_jsonl(records, self._stream)
+
+    def write_encoded(self, lines: List[bytes]):
+        """Escribe líneas JSON ya serializadas (sin salto de línea final)."""
+        if lines:
+            self._stream.write(b"\n".join(lines) + b"\n")
+            self.count += len(lines)
+
+
+class CsvSink(AtomicSink):
+    """CSV con las columnas del esquema canónico; las listas se escriben como JSON."""
+
+    def __init__(self, path, compression: Optional[str] = None, fieldnames=JOB_FIELD_NAMES):
+        super().__init__(path, compression)
+        self.fieldnames = list(fieldnames)
+        self._text = None
+        self._writer = None
+
+    def open(self):
+        super().open()
+        self._text = io.TextIOWrapper(self._stream, encoding="utf-8", newline="", write_through=True)
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(self.fieldnames)
+        return self
+
+    def write(self, records):
+        if not isinstance(records, list):
+            self._write_table(records)
+            return
+        rows = []
+        for record in records:
+            row = []
+            for name in self.fieldnames:
+                value = record.get(name)
+                if value is None:
+                    value = ""
+                elif isinstance(value, bool):
+                    # Igual que pyarrow.csv en write_table: true/false y 2000000, no True/False ni 2000000.0
+                    value = "true" if value else "false"
+                elif isinstance(value, float) and value.is_integer():
+                    value = int(value)
+                elif isinstance(value, (list, dict)):
+                    value = serialization.dumps(value).decode("utf-8")
+                row.append(value)
+            rows.append(row)
+        self._writer.writerows(rows)
+        self.count += len(rows)
+
+    def _write_table(self, table):
+        import pyarrow.csv as pa_csv
+        
+        table = arrow_csv_table(table.select(self.fieldnames))
+        self._text.flush()
+        options = pa_csv.WriteOptions(include_header=False, quoting_style="needed")
+        pa_csv.write_csv(table, self._stream, write_options=options)
+        self.count += table.num_rows
+
+    def _close_streams(self):
+        if self._text is not None:
+            self._text.flush()
+            self._text.detach()
+            self._text = None
+        super()._close_streams()
+
+
+_JSON_ESCAPES = (("\\", "\\\\"), ('"', '\\"'), ("\n", "\\n"), ("\r", "\\r"), ("\t", "\\t"))
+_OTHER_CONTROL = tuple(code for code in range(0x20) if chr(code) not in "\n\r\t")
+
+
+def _json_string_list(column):
+    """list<string> -> texto JSON (``["a","b"]``) calculado por columnas."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    chunks = []
+    for chunk in column.chunks:
+        values = pc.list_flatten(chunk)
+        for old, new in _JSON_ESCAPES:
+            values = pc.replace_substring(values, old, new)
+        # El resto de caracteres de control (raros) solo si aparecen: una pasada por carácter
+        if len(values) and pc.any(pc.match_substring_regex(values, "[\\x00-\\x1f]")).as_py():
+            for code in _OTHER_CONTROL:
+                values = pc.replace_substring(values, chr(code), f"\\u{code:04x}")
+        # Un elemento nulo es null en JSON; sin esto binary_join anula la celda entera
+        quoted = pc.fill_null(pc.binary_join_element_wise('"', values, '"', ""), "null")
+        lengths = pc.fill_null(pc.list_value_length(chunk), 0)
+        offsets = pa.concat_arrays([pa.array([0], pa.int32()), pc.cumulative_sum(lengths).cast(pa.int32())])
+        rebuilt = pa.ListArray.from_arrays(offsets, quoted, mask=chunk.is_null())
+        chunks.append(pc.binary_join_element_wise("[", pc.binary_join(rebuilt, ","), "]", ""))
+    return pa.chunked_array(chunks, type=pa.string())
+
+
+def arrow_csv_table(table):
+    """Tabla apta para ``pyarrow.csv``: las columnas lista pasan a texto JSON."""
+    import pyarrow as pa
+
+    for index, field in enumerate(table.schema):
+        if pa.types.is_list(field.type):
+            table = table.set_column(index, field.name, _json_string_list(table.column(index)))
+    return table
+
+
+class ParquetSink(AtomicSink):
+    """Parquet escrito por row groups; la compresión es la interna de Parquet."""
+
+    def __init__(self, path, compression: Optional[str] = "zstd", schema=None):
+        super().__init__(path, None)
+        self.parquet_compression = compression or "none"
+        self.schema = schema or arrow_schema()
+        self._writer = None
+
+    def open(self):
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(self.tmp_path, self.schema, compression=self.parquet_compression)
+        return self
+
+    def write(self, records):
+        import pyarrow as pa
+
+        table = records if isinstance(records, pa.Table) else arrow_table(records, self.schema)
+        self._writer.write_table(table)
+        self.count += table.num_rows
+
+    def _close_streams(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            # Como los demás sinks: a disco antes de que commit() publique con os.replace
+            with open(self.tmp_path, "rb") as fp:
+                os.fsync(fp.fileno())
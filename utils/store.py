@@ -0,0 +1,241 @@
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from config import settings
+from utils import serialization
+from utils.parser import normalize_location
+from utils.validator import job_key
+
+
+ESTADO_ACTIVA = "Activa"
+ESTADO_CERRADA = "Cerrada"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ofertas (
+    clave TEXT PRIMARY KEY,
+    plataforma_origen TEXT NOT NULL,
+    id_oferta_plataforma TEXT NOT NULL DEFAULT '',
+    url_oferta TEXT NOT NULL DEFAULT '',
+    cargo_titulo TEXT,
+    empresa_nombre TEXT,
+    ciudad TEXT,
+    cargo_area TEXT,
+    cargo_modalidad TEXT,
+    fecha_publicacion TEXT,
+    salario_min REAL,
+    salario_max REAL,
+    estado_oferta TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    closed_at TEXT,
+    datos BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_ofertas_plataforma_id
+    ON ofertas (plataforma_origen, id_oferta_plataforma) WHERE id_oferta_plataforma != '';
+CREATE INDEX IF NOT EXISTS ix_ofertas_url ON ofertas (url_oferta);
+CREATE INDEX IF NOT EXISTS ix_ofertas_ciudad ON ofertas (ciudad, first_seen);
+CREATE INDEX IF NOT EXISTS ix_ofertas_area ON ofertas (cargo_area, first_seen);
+CREATE INDEX IF NOT EXISTS ix_ofertas_modalidad ON ofertas (cargo_modalidad);
+CREATE INDEX IF NOT EXISTS ix_ofertas_fecha ON ofertas (fecha_publicacion);
+CREATE INDEX IF NOT EXISTS ix_ofertas_estado ON ofertas (plataforma_origen, estado_oferta, last_seen);
+"""
+
+_COLUMNS = (
+    "clave", "plataforma_origen", "id_oferta_plataforma", "url_oferta", "cargo_titulo",
+    "empresa_nombre", "ciudad", "cargo_area", "cargo_modalidad", "fecha_publicacion",
+    "salario_min", "salario_max", "estado_oferta", "first_seen", "last_seen", "datos",
+)
+
+# first_seen se conserva; todo lo demás se actualiza y la oferta se reabre
+_UPSERT = (
+    f"INSERT INTO ofertas ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    "ON CONFLICT(clave) DO UPDATE SET "
+    + ", ".join(
+        f"{column} = excluded.{column}"
+        for column in _COLUMNS if column not in ("clave", "first_seen")
+    )
+    + ", closed_at = NULL"
+)
+
+_ORDER_BY = {
+    "fecha_publicacion": "fecha_publicacion DESC",
+    "first_seen": "first_seen DESC",
+    "salario_min": "salario_min DESC",
+    "salario_max": "salario_max DESC",
+}
+
+
+def storage_key(job: dict) -> str:
+    key = job_key(job)
+    if isinstance(key, tuple):
+        return f"{key[0]}:{key[1]}"
+    return key
+
+
+class JobStore:
+    """Repositorio SQLite de ofertas con historial de estado (first/last seen, cierre)."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.DATA_DIR / "ofertas.db")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row(self, job: dict, seen_at: str) -> tuple:
+        return (
+            storage_key(job),
+            job.get("plataforma_origen", ""),
+            job.get("id_oferta_plataforma", "") or "",
+            job.get("url_oferta", "") or "",
+            job.get("cargo_titulo", ""),
+            job.get("empresa_nombre", ""),
+            normalize_location(job.get("empresa_ubicacion_exacta", "")),
+            job.get("cargo_area", ""),
+            job.get("cargo_modalidad", ""),
+            job.get("fecha_publicacion", ""),
+            job.get("salario_min"),
+            job.get("salario_max"),
+            ESTADO_ACTIVA,
+            seen_at,
+            seen_at,
+            serialization.dumps(job),
+        )
+
+    def upsert(self, jobs: Iterable[dict], seen_at: Optional[str] = None, batch_size: int = 1000) -> int:
+        """Inserta o actualiza ofertas en lotes con ``executemany``. Devuelve el conteo."""
+        seen_at = seen_at or datetime.now().isoformat(timespec="seconds")
+        count = 0
+        batch = []
+        with self.conn:
+            for job in jobs:
+                if not storage_key(job):
+                    continue
+                batch.append(self._row(job, seen_at))
+                if len(batch) >= batch_size:
+                    self.conn.executemany(_UPSERT, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(_UPSERT, batch)
+                count += len(batch)
+        return count
+
+    def touch(self, keys: Iterable[str], seen_at: str) -> int:
+        """Actualiza ``last_seen`` de ofertas vistas en el portal aunque no se guarden (p. ej. inválidas)."""
+        with self.conn:
+            cursor = self.conn.executemany(
+                "UPDATE ofertas SET last_seen = ? WHERE clave = ? AND last_seen < ?",
+                ((seen_at, key, seen_at) for key in keys if key),
+            )
+        return cursor.rowcount
+
+    def close_missing(self, plataforma: str, run_started: str) -> int:
+        """Marca como cerradas las ofertas activas de ``plataforma`` no vistas desde ``run_started``."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE ofertas SET estado_oferta = ?, closed_at = ? "
+                "WHERE plataforma_origen = ? AND estado_oferta = ? AND last_seen < ?",
+                (ESTADO_CERRADA, datetime.now().isoformat(timespec="seconds"),
+                 plataforma, ESTADO_ACTIVA, run_started),
+            )
+        return cursor.rowcount
+
+    def closed_keys(self, since: str) -> List[str]:
+        """Claves de las ofertas cerradas desde ``since`` (ISO)."""
+        rows = self.conn.execute(
+            "SELECT clave FROM ofertas WHERE estado_oferta = ? AND closed_at >= ?", (ESTADO_CERRADA, since),
+        )
+        return [row["clave"] for row in rows]
+
+    def query(
+        self,
+        ciudad: str = None,
+        area: str = None,
+        modalidad: str = None,
+        plataforma: str = None,
+        estado: Optional[str] = ESTADO_ACTIVA,
+        desde: str = None,
+        hasta: str = None,
+        nuevas_desde: str = None,
+        order_by: str = "fecha_publicacion",
+        limit: int = None,
+        offset: int = 0,
+    ) -> List[dict]:
+        """Ofertas filtradas por índices secundarios.
+
+        ``desde``/``hasta`` filtran por fecha_publicacion (ISO) y
+        ``nuevas_desde`` por la primera vez que se vio la oferta. Cada
+        registro incluye ``first_seen``, ``last_seen`` y ``closed_at``.
+        """
+        where, params = self._where(ciudad, area, modalidad, plataforma, estado, desde, hasta, nuevas_desde)
+        sql = f"SELECT datos, estado_oferta, first_seen, last_seen, closed_at FROM ofertas{where}"
+        sql += f" ORDER BY {_ORDER_BY.get(order_by, _ORDER_BY['fecha_publicacion'])}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+
+        results = []
+        for row in self.conn.execute(sql, params):
+            job = serialization.loads(row["datos"])
+            job["estado_oferta"] = row["estado_oferta"]
+            job["first_seen"] = row["first_seen"]
+            job["last_seen"] = row["last_seen"]
+            job["closed_at"] = row["closed_at"]
+            results.append(job)
+        return results
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM ofertas{where}", params).fetchone()[0]
+
+    def facets(self, columns=("ciudad", "cargo_area", "cargo_modalidad", "plataforma_origen"), **filters) -> dict:
+        """Conteo por valor de cada columna sobre las ofertas que cumplen ``filters``."""
+        where, params = self._where(**filters)
+        result = {}
+        for column in columns:
+            if column not in _COLUMNS:
+                raise ValueError(f"Columna desconocida: {column}")
+            rows = self.conn.execute(
+                f"SELECT {column}, COUNT(*) AS n FROM ofertas{where} GROUP BY {column} ORDER BY n DESC", params,
+            )
+            result[column] = {row[0]: row[1] for row in rows if row[0]}
+        return result
+
+    def _where(self, ciudad=None, area=None, modalidad=None, plataforma=None,
+               estado=ESTADO_ACTIVA, desde=None, hasta=None, nuevas_desde=None):
+        clauses, params = [], []
+        for column, value in (
+            ("ciudad", ciudad),
+            ("cargo_area", area),
+            ("cargo_modalidad", modalidad),
+            ("plataforma_origen", plataforma),
+            ("estado_oferta", estado),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if desde:
+            clauses.append("fecha_publicacion >= ?")
+            params.append(desde)
+        if hasta:
+            clauses.append("fecha_publicacion <= ?")
+            params.append(hasta)
+        if nuevas_desde:
+            clauses.append("first_seen >= ?")
+            params.append(nuevas_desde)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
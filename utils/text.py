@@ -0,0 +1,127 @@
+import re
+import unicodedata
+from collections.abc import Mapping
+from typing import Tuple, Union
+
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+# Clave privada bajo la que se cachea el texto normalizado en registros dict.
+TEXT_CACHE_KEY = "_texto"
+
+
+def fold_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class NormalizedText:
+    """Formas normalizadas de un texto, calculadas una sola vez y bajo demanda."""
+
+    __slots__ = ("raw", "_lower", "_folded", "_collapsed", "_tokens", "_token_set")
+
+    def __init__(self, raw: str):
+        self.raw = raw or ""
+        self._lower = None
+        self._folded = None
+        self._collapsed = None
+        self._tokens = None
+        self._token_set = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.raw.lower()
+        return self._lower
+
+    @property
+    def folded(self) -> str:
+        """Minúsculas, sin tildes y con espacios colapsados."""
+        if self._folded is None:
+            self._folded = fold_accents(self.collapsed)
+        return self._folded
+
+    @property
+    def collapsed(self) -> str:
+        if self._collapsed is None:
+            self._collapsed = " ".join(self.lower.split())
+        return self._collapsed
+
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        if self._tokens is None:
+            self._tokens = tuple(_TOKEN_RE.findall(self.folded))
+        return self._tokens
+
+    @property
+    def token_set(self) -> frozenset:
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def __str__(self) -> str:
+        return self.raw
+
+    def __repr__(self) -> str:
+        return f"NormalizedText({self.raw!r})"
+
+
+TextLike = Union[str, NormalizedText, None]
+
+
+def normalize(text: TextLike) -> NormalizedText:
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(text or "")
+
+
+class RecordText:
+    """Textos normalizados de los campos de un registro, cacheados por campo."""
+
+    __slots__ = ("_get", "_cache")
+
+    def __init__(self, get):
+        self._get = get
+        self._cache = {}
+
+    def __getitem__(self, name: str) -> NormalizedText:
+        text = self._cache.get(name)
+        if text is None:
+            text = self._cache[name] = NormalizedText(self._get(name))
+        return text
+
+    def joined(self, *names: str) -> NormalizedText:
+        key = " ".join(names)
+        text = self._cache.get(key)
+        if text is None:
+            raw = " ".join(self._get(name) or "" for name in names)
+            text = self._cache[key] = NormalizedText(raw)
+        return text
+
+
+def record_text(record) -> RecordText:
+    """Devuelve el RecordText cacheado en ``record``, creándolo si no existe.
+
+    Para dicts el caché vive bajo ``TEXT_CACHE_KEY`` (los exportadores deben
+    ignorar esa clave); para vistas y objetos con ``__dict__`` (p. ej.
+    ``PostingView`` o ``JobPosting``) como atributo privado.
+    """
+    if isinstance(record, dict):
+        cached = record.get(TEXT_CACHE_KEY)
+        if cached is None:
+            cached = record[TEXT_CACHE_KEY] = RecordText(lambda name: record.get(name, ""))
+        return cached
+
+    cached = record.__dict__.get(TEXT_CACHE_KEY)
+    if cached is None:
+        if isinstance(record, Mapping):
+            cached = RecordText(lambda name: record.get(name, ""))
+        else:
+            cached = RecordText(lambda name: getattr(record, name, ""))
+        record.__dict__[TEXT_CACHE_KEY] = cached
+    return cached
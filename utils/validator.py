@@ -1,17 +1,83 @@
+import re
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from enum import IntFlag
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from config import settings
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+KNOWN_PLATFORMS = ("linkedin", "computrabajo", "indeed", "magneto", "elempleo", "masempleo")
+CONFIDENTIAL_NAMES = ("confidencial", "confidential", "anonimo")
+MAX_PUBLICATION_AGE = timedelta(days=90)
+
+
+class ValidationCode(IntFlag):
+    # Errores
+    EMPRESA_VACIA = 1 << 0
+    EMPRESA_CORTA = 1 << 1
+    CARGO_VACIO = 1 << 2
+    CARGO_CORTO = 1 << 3
+    UBICACION_VACIA = 1 << 4
+    UBICACION_FUERA = 1 << 5
+    FECHA_PUB_VACIA = 1 << 6
+    FECHA_PUB_FORMATO = 1 << 7
+    FECHA_PUB_FUTURA = 1 << 8
+    FECHA_SCRAP_FUTURA = 1 << 9
+    SALARIO_INVERTIDO = 1 << 10
+    URL_VACIA = 1 << 11
+    URL_INVALIDA = 1 << 12
+    # Advertencias
+    EMPRESA_CONFIDENCIAL = 1 << 16
+    FECHA_PUB_ANTIGUA = 1 << 17
+    FECHA_SCRAP_FORMATO = 1 << 18
+    SALARIO_BAJO = 1 << 19
+    SALARIO_ALTO = 1 << 20
+    URL_SIN_PLATAFORMA = 1 << 21
+
+
+ERROR_MASK = 0xFFFF
+
+
+def describe_codes(codes: int) -> List[str]:
+    return [code.name for code in ValidationCode if codes & code]
+
+
+@dataclass
+class ColumnarValidation:
+    codes: "np.ndarray"
+    is_valid: "np.ndarray"
+    counts: Dict[str, int]
+
+    def split(self, jobs: list) -> Tuple[list, list]:
+        valid_jobs = [job for job, ok in zip(jobs, self.is_valid) if ok]
+        invalid_jobs = [job for job, ok in zip(jobs, self.is_valid) if not ok]
+        return valid_jobs, invalid_jobs
+
 
 class JobValidator:
-    def __init__(self):
+    def __init__(self, today: Optional[datetime] = None):
         self.errors = []
         self.warnings = []
+        self.codes = 0
+        self.today = today
+        self._cities_lower = tuple(city.lower() for city in settings.CITIES_ANTIOQUIA)
+    
+    def _error(self, code: ValidationCode, message: str):
+        self.codes |= code
+        self.errors.append(message)
+    
+    def _warning(self, code: ValidationCode, message: str):
+        self.codes |= code
+        self.warnings.append(message)
     
     def validate(self, job: dict) -> Tuple[bool, List[str], List[str]]:
         self.errors = []
         self.warnings = []
+        self.codes = 0
         
         self._validate_company(job)
         self._validate_cargo(job)
@@ -28,67 +94,61 @@ class JobValidator:
         empresa_nombre = job.get("empresa_nombre", "")
         
         if not empresa_nombre:
-            self.errors.append("empresa_nombre está vacío")
+            self._error(ValidationCode.EMPRESA_VACIA, "empresa_nombre está vacío")
         elif len(empresa_nombre) < 2:
-            self.errors.append(f"empresa_nombre demasiado corto: {empresa_nombre}")
+            self._error(ValidationCode.EMPRESA_CORTA, f"empresa_nombre demasiado corto: {empresa_nombre}")
         
-        if empresa_nombre and empresa_nombre.lower() in ["confidencial", "confidential", "anonimo"]:
-            self.warnings.append("Empresa confidencial - verificar manualmente")
+        if empresa_nombre and empresa_nombre.lower() in CONFIDENTIAL_NAMES:
+            self._warning(ValidationCode.EMPRESA_CONFIDENCIAL, "Empresa confidencial - verificar manualmente")
     
     def _validate_cargo(self, job: dict):
         cargo_titulo = job.get("cargo_titulo", "")
         
         if not cargo_titulo:
-            self.errors.append("cargo_titulo está vacío")
+            self._error(ValidationCode.CARGO_VACIO, "cargo_titulo está vacío")
         elif len(cargo_titulo) < 5:
-            self.errors.append(f"cargo_titulo demasiado corto: {cargo_titulo}")
+            self._error(ValidationCode.CARGO_CORTO, f"cargo_titulo demasiado corto: {cargo_titulo}")
     
     def _validate_location(self, job: dict):
         location = job.get("empresa_ubicacion_exacta", "")
         
         if not location:
-            self.errors.append("empresa_ubicacion_exacta está vacío")
+            self._error(ValidationCode.UBICACION_VACIA, "empresa_ubicacion_exacta está vacío")
             return
         
-        is_valid_location = False
-        for city in settings.CITIES_ANTIOQUIA:
-            if city.lower() in location.lower():
-                is_valid_location = True
-                break
-        
-        if not is_valid_location:
-            self.errors.append(f"Ubicación no es de Antioquia: {location}")
+        location_lower = location.lower()
+        if not any(city in location_lower for city in self._cities_lower):
+            self._error(ValidationCode.UBICACION_FUERA, f"Ubicación no es de Antioquia: {location}")
     
     def _validate_dates(self, job: dict):
         fecha_publicacion = job.get("fecha_publicacion", "")
         fecha_scraping = job.get("fecha_scraping", "")
         
         if not fecha_publicacion:
-            self.errors.append("fecha_publicacion está vacío")
+            self._error(ValidationCode.FECHA_PUB_VACIA, "fecha_publicacion está vacío")
             return
         
         try:
             pub_date = datetime.strptime(fecha_publicacion, "%Y-%m-%d")
-            today = datetime.now()
+            today = self.today or datetime.now()
             
             if pub_date > today:
-                self.errors.append(f"fecha_publicacion es futura: {fecha_publicacion}")
+                self._error(ValidationCode.FECHA_PUB_FUTURA, f"fecha_publicacion es futura: {fecha_publicacion}")
             
-            max_days = timedelta(days=90)
-            if today - pub_date > max_days:
-                self.warnings.append(f"fecha_publicacion > 90 días: {fecha_publicacion}")
+            if today - pub_date > MAX_PUBLICATION_AGE:
+                self._warning(ValidationCode.FECHA_PUB_ANTIGUA, f"fecha_publicacion > 90 días: {fecha_publicacion}")
         
         except ValueError:
-            self.errors.append(f"fecha_publicacion formato inválido: {fecha_publicacion}")
+            self._error(ValidationCode.FECHA_PUB_FORMATO, f"fecha_publicacion formato inválido: {fecha_publicacion}")
         
         if fecha_scraping:
             try:
                 scrap_date = datetime.strptime(fecha_scraping, "%Y-%m-%d")
-                today = datetime.now()
+                today = self.today or datetime.now()
                 if scrap_date > today:
-                    self.errors.append(f"fecha_scraping es futura: {fecha_scraping}")
+                    self._error(ValidationCode.FECHA_SCRAP_FUTURA, f"fecha_scraping es futura: {fecha_scraping}")
             except ValueError:
-                self.warnings.append(f"fecha_scraping formato inválido: {fecha_scraping}")
+                self._warning(ValidationCode.FECHA_SCRAP_FORMATO, f"fecha_scraping formato inválido: {fecha_scraping}")
     
     def _validate_salary(self, job: dict):
         salario_min = job.get("salario_min")
@@ -96,26 +156,27 @@ class JobValidator:
         
         if salario_min is not None and salario_max is not None:
             if salario_min > salario_max:
-                self.errors.append(f"salario_min ({salario_min}) > salario_max ({salario_max})")
+                self._error(ValidationCode.SALARIO_INVERTIDO, f"salario_min ({salario_min}) > salario_max ({salario_max})")
             
             if salario_min < settings.SMMLV_2024 * 0.5:
-                self.warnings.append(f"salario_min suspiciously bajo: {salario_min}")
+                self._warning(ValidationCode.SALARIO_BAJO, f"salario_min suspiciously bajo: {salario_min}")
             
             if salario_max > settings.SMMLV_2024 * 100:
-                self.warnings.append(f"salario_max suspiciously alto: {salario_max}")
+                self._warning(ValidationCode.SALARIO_ALTO, f"salario_max suspiciously alto: {salario_max}")
     
     def _validate_url(self, job: dict):
         url = job.get("url_oferta", "")
         
         if not url:
-            self.errors.append("url_oferta está vacío")
+            self._error(ValidationCode.URL_VACIA, "url_oferta está vacío")
             return
         
         if not url.startswith("http"):
-            self.errors.append(f"url_oferta no es URL válida: {url}")
+            self._error(ValidationCode.URL_INVALIDA, f"url_oferta no es URL válida: {url}")
         
-        if not any(platform in url.lower() for platform in ["linkedin", "computrabajo", "indeed", "magneto", "elempleo", "masempleo"]):
-            self.warnings.append(f"url_oferta no contiene plataforma conocida: {url}")
+        url_lower = url.lower()
+        if not any(platform in url_lower for platform in KNOWN_PLATFORMS):
+            self._warning(ValidationCode.URL_SIN_PLATAFORMA, f"url_oferta no contiene plataforma conocida: {url}")
     
     def validate_batch(self, jobs: list) -> Tuple[list, list, list]:
         valid_jobs = []
@@ -138,6 +199,107 @@ class JobValidator:
                 invalid_jobs.append(job)
         
         return valid_jobs, invalid_jobs, validation_results
+    
+    def validate_columnar(self, jobs) -> ColumnarValidation:
+        """Evalúa las mismas reglas que ``validate`` como expresiones por columna.
+        
+        Acepta una lista de dicts o un DataFrame y devuelve una máscara de
+        ``ValidationCode`` por fila (uint32), la validez por fila y el conteo
+        por regla. Los resultados coinciden con ``validate`` fila a fila.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        columns = [
+            "empresa_nombre", "cargo_titulo", "empresa_ubicacion_exacta",
+            "fecha_publicacion", "fecha_scraping", "salario_min", "salario_max", "url_oferta",
+        ]
+        if isinstance(jobs, pd.DataFrame):
+            df = jobs.reindex(columns=columns)
+        else:
+            # dtype object conserva la diferencia entre None y NaN en los salarios
+            df = pd.DataFrame({
+                column: pd.Series([job.get(column) for job in jobs], dtype=object)
+                for column in columns
+            })
+        
+        today = pd.Timestamp(self.today or datetime.now())
+        masks = {}
+        
+        empresa = _text_column(df["empresa_nombre"])
+        empresa_vacia = empresa.eq("")
+        masks[ValidationCode.EMPRESA_VACIA] = empresa_vacia
+        masks[ValidationCode.EMPRESA_CORTA] = ~empresa_vacia & (empresa.str.len() < 2)
+        masks[ValidationCode.EMPRESA_CONFIDENCIAL] = ~empresa_vacia & empresa.str.lower().isin(CONFIDENTIAL_NAMES)
+        
+        cargo = _text_column(df["cargo_titulo"])
+        cargo_vacio = cargo.eq("")
+        masks[ValidationCode.CARGO_VACIO] = cargo_vacio
+        masks[ValidationCode.CARGO_CORTO] = ~cargo_vacio & (cargo.str.len() < 5)
+        
+        ubicacion = _text_column(df["empresa_ubicacion_exacta"])
+        ubicacion_vacia = ubicacion.eq("")
+        cities_re = "|".join(re.escape(city) for city in self._cities_lower)
+        masks[ValidationCode.UBICACION_VACIA] = ubicacion_vacia
+        masks[ValidationCode.UBICACION_FUERA] = ~ubicacion_vacia & ~ubicacion.str.lower().str.contains(cities_re, regex=True)
+        
+        publicacion = _text_column(df["fecha_publicacion"])
+        pub_vacia = publicacion.eq("")
+        pub_date = _parse_dates(publicacion, ~pub_vacia)
+        pub_ok = pub_date.notna()
+        masks[ValidationCode.FECHA_PUB_VACIA] = pub_vacia
+        masks[ValidationCode.FECHA_PUB_FORMATO] = ~pub_vacia & ~pub_ok
+        masks[ValidationCode.FECHA_PUB_FUTURA] = pub_ok & (pub_date > today)
+        masks[ValidationCode.FECHA_PUB_ANTIGUA] = pub_ok & ((today - pub_date) > MAX_PUBLICATION_AGE)
+        
+        scraping = _text_column(df["fecha_scraping"])
+        scrap_presente = ~pub_vacia & scraping.ne("")
+        scrap_date = _parse_dates(scraping, scrap_presente)
+        masks[ValidationCode.FECHA_SCRAP_FUTURA] = scrap_date.notna() & (scrap_date > today)
+        masks[ValidationCode.FECHA_SCRAP_FORMATO] = scrap_presente & scrap_date.isna()
+        
+        # validate() compara con "is not None": un NaN cuenta como presente
+        ambos = (df["salario_min"].to_numpy(dtype=object) != None) & (df["salario_max"].to_numpy(dtype=object) != None)  # noqa: E711
+        salario_min = pd.to_numeric(df["salario_min"], errors="coerce")
+        salario_max = pd.to_numeric(df["salario_max"], errors="coerce")
+        masks[ValidationCode.SALARIO_INVERTIDO] = ambos & (salario_min > salario_max)
+        masks[ValidationCode.SALARIO_BAJO] = ambos & (salario_min < settings.SMMLV_2024 * 0.5)
+        masks[ValidationCode.SALARIO_ALTO] = ambos & (salario_max > settings.SMMLV_2024 * 100)
+        
+        url = _text_column(df["url_oferta"])
+        url_vacia = url.eq("")
+        platforms_re = "|".join(re.escape(platform) for platform in KNOWN_PLATFORMS)
+        masks[ValidationCode.URL_VACIA] = url_vacia
+        masks[ValidationCode.URL_INVALIDA] = ~url_vacia & ~url.str.startswith("http")
+        masks[ValidationCode.URL_SIN_PLATAFORMA] = ~url_vacia & ~url.str.lower().str.contains(platforms_re, regex=True)
+        
+        codes = np.zeros(len(df), dtype=np.uint32)
+        counts = {}
+        for code, mask in masks.items():
+            mask = mask.to_numpy(dtype=bool)
+            codes |= np.where(mask, np.uint32(code), np.uint32(0))
+            counts[code.name] = int(mask.sum())
+        
+        return ColumnarValidation(codes=codes, is_valid=(codes & ERROR_MASK) == 0, counts=counts)
+
+
+def _text_column(col):
+    col = col.astype(object)
+    return col.where(col.notna(), "")
+
+
+def _parse_dates(col, present):
+    """strptime sobre los valores distintos presentes; NaT para los inválidos."""
+    import pandas as pd
+    
+    parsed = {}
+    for value in pd.unique(col[present]):
+        try:
+            parsed[value] = datetime.strptime(value, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            parsed[value] = None
+    dates = col.where(present, None).map(parsed)
+    return pd.to_datetime(dates)
 
 
 def filter_antioquia_jobs(jobs: list) -> list:
@@ -152,16 +314,20 @@ def filter_antioquia_jobs(jobs: list) -> list:
     return filtered
 
 
+def job_key(job: dict):
+    """Identidad de una oferta: (plataforma, id) si hay id, si no la URL."""
+    job_id = job.get("id_oferta_plataforma", "")
+    if job_id:
+        return (job.get("plataforma_origen", ""), job_id)
+    return job.get("url_oferta", "")
+
+
 def deduplicate_jobs(jobs: list) -> list:
     seen = set()
     unique_jobs = []
     
     for job in jobs:
-        url = job.get("url_oferta", "")
-        job_id = job.get("id_oferta_plataforma", "")
-        plataforma = job.get("plataforma_origen", "")
-        
-        key = (plataforma, job_id) if job_id else url
+        key = job_key(job)
         
         if key and key not in seen:
             seen.add(key)